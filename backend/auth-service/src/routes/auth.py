@@ -173,7 +173,7 @@ def login():
     })
 
 @auth_bp.route('/google/login', methods=['POST'])
-@validate_schema(GoogleLogin)
+@validate_schema(GoogleLogin, transactional=False)
 def google_login(data: GoogleLogin):
     """Handle Google OAuth login"""
     try:
@@ -238,7 +238,7 @@ def google_login(data: GoogleLogin):
 
 @auth_bp.route('/reset-password', methods=['POST'])
 @custom_rate_limit(limit=3, window=3600)  # 3 reset attempts per hour
-@validate_schema(PasswordReset)
+@validate_schema(PasswordReset, transactional=False)
 def reset_password(data: PasswordReset):
     """Initiate password reset"""
     try:
@@ -273,7 +273,7 @@ def reset_password(data: PasswordReset):
         ).model_dump()), 500
 
 @auth_bp.route('/reset-password/confirm', methods=['POST'])
-@validate_schema(PasswordResetConfirm)
+@validate_schema(PasswordResetConfirm, transactional=False)
 def confirm_reset_password(data: PasswordResetConfirm):
     """Confirm password reset"""
     try:
@@ -316,7 +316,7 @@ def confirm_reset_password(data: PasswordResetConfirm):
         ).model_dump()), 500
 
 @auth_bp.route('/refresh-token', methods=['POST'])
-@validate_schema(TokenRefresh)
+@validate_schema(TokenRefresh, transactional=False)
 def refresh_token(data: TokenRefresh):
     """Refresh access token using refresh token"""
     try:
@@ -379,7 +379,7 @@ def list_sessions():
 
 @auth_bp.route('/sessions/<int:session_id>/revoke', methods=['POST'])
 @jwt_required
-@validate_schema(SessionRevoke)
+@validate_schema(SessionRevoke, transactional=False)
 def revoke_session(session_id: int, data: SessionRevoke):
     """Revoke a specific session"""
     try:
@@ -27,7 +27,8 @@ logger.info("Using shared database utilities")
 def transaction_context():
     """
     Context manager for database transactions.
-    Automatically handles commit and rollback.
+    Automatically handles commit and rollback. The scoped session is left
+    open; Flask-SQLAlchemy removes it at the end of the request.
     
     Usage:
         with transaction_context() as session:
@@ -40,8 +41,6 @@ def transaction_context():
         db.session.rollback()
         logger.error(f"Transaction error: {str(e)}")
         raise
-    finally:
-        db.session.close()
 
 def with_transaction(f: Callable[..., T]) -> Callable[..., T]:
     """
@@ -65,8 +64,6 @@ def with_transaction(f: Callable[..., T]) -> Callable[..., T]:
             db.session.rollback()
             logger.error(f"Database error in {f.__name__}: {str(e)}")
             raise
-        finally:
-            db.session.close()
     return decorated
 
 # Common database utility functions (these should work with either implementation)
@@ -1,7 +1,9 @@
 from typing import Optional, Dict, Any
 from flask import current_app
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
+import time
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from circuitbreaker import circuit
 import logging
@@ -13,6 +15,12 @@ from .database import transaction_context
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so calls to the main service reuse pooled connections
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+
 class ServiceIntegrationError(Exception):
     """Base exception for service integration errors"""
     pass
@@ -71,7 +79,7 @@ class ServiceIntegration:
 
     def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """Make HTTP request with error handling"""
-        start_time = datetime.utcnow()
+        start_time = time.perf_counter()
         success = False
         
         try:
@@ -82,7 +90,7 @@ class ServiceIntegration:
             elif service_key and 'headers' in kwargs:
                 kwargs['headers'].update({'X-Service-Key': service_key})
                 
-            response = requests.request(
+            response = _session.request(
                 method,
                 f"{self.flask_service_url}{endpoint}",
                 timeout=self.timeout,
@@ -101,8 +109,8 @@ class ServiceIntegration:
             raise ServiceIntegrationError(f"Unexpected error in service request: {str(e)}")
         finally:
             # Record metrics
-            duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
-            endpoint_name = endpoint.split('/')[-1]
+            duration_ms = (time.perf_counter() - start_time) * 1000
+            endpoint_name = endpoint.rpartition('/')[2]
             self._record_metric(f"{method}_{endpoint_name}", success, duration_ms)
 
     @retry(
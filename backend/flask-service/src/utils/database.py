@@ -33,10 +33,10 @@ def safe_delete(obj, auto_commit=True):
     """Safely delete an object from the database"""
     return get_db_manager().safe_delete(obj, auto_commit)
 
-def safe_bulk_add(objects, auto_commit=True):
-    """Safely add multiple objects to the database"""
-    return get_db_manager().safe_bulk_add(objects, auto_commit)
+def safe_bulk_add(objects, auto_commit=True, model=None):
+    """Safely add multiple objects (or row dicts for model) to the database"""
+    return get_db_manager().bulk_add(objects, auto_commit, model=model)
 
 def safe_bulk_delete(objects, auto_commit=True):
     """Safely delete multiple objects from the database"""
-    return get_db_manager().safe_bulk_delete(objects, auto_commit) 
\ No newline at end of file
+    return get_db_manager().bulk_delete(objects, auto_commit) 
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Unit tests for the shared database utilities.
+"""
+
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import Column, ForeignKey, Integer, String, create_engine, event, select
+from sqlalchemy.orm import Session, declarative_base, relationship
+from meeting_shared.utils.database import DatabaseManager, _delete_order, _needs_orm_delete
+
+# Add pytest mark for test categories
+pytestmark = [pytest.mark.unit]
+
+Base = declarative_base()
+
+class Team(Base):
+    __tablename__ = 'teams'
+    id = Column(Integer, primary_key=True)
+    members = relationship('Member', backref='team')
+
+class Member(Base):
+    __tablename__ = 'members'
+    id = Column(Integer, primary_key=True)
+    team_id = Column(Integer, ForeignKey('teams.id'))
+
+class Tag(Base):
+    __tablename__ = 'tags'
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
+
+class Room(Base):
+    __tablename__ = 'rooms'
+    id = Column(Integer, primary_key=True)
+    bookings = relationship('Booking', passive_deletes=True)
+
+class Booking(Base):
+    __tablename__ = 'bookings'
+    id = Column(Integer, primary_key=True)
+    room_id = Column(Integer, ForeignKey('rooms.id', ondelete='CASCADE'))
+
+@pytest.fixture
+def session():
+    """In-memory SQLite session with foreign keys enforced."""
+    engine = create_engine('sqlite://')
+    
+    @event.listens_for(engine, 'connect')
+    def enable_foreign_keys(connection, record):
+        connection.execute('PRAGMA foreign_keys=ON')
+    
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+@pytest.fixture
+def manager(session):
+    return DatabaseManager(SimpleNamespace(session=session))
+
+def test_needs_orm_delete():
+    """Test which models fall back to per-object deletes."""
+    assert _needs_orm_delete(Team.__mapper__)
+    assert not _needs_orm_delete(Member.__mapper__)
+    assert not _needs_orm_delete(Tag.__mapper__)
+    assert not _needs_orm_delete(Room.__mapper__)
+
+def test_delete_order_puts_dependents_first():
+    """Test that referencing models are deleted before the models they reference."""
+    assert _delete_order({Team: [], Member: []}) == [Member, Team]
+    assert _delete_order({Member: [], Team: []}) == [Member, Team]
+
+def test_bulk_delete_parent_and_children(manager, session):
+    """Test deleting parents and children together, in either order."""
+    team = Team(id=1, members=[Member(id=1), Member(id=2)])
+    session.add(team)
+    session.commit()
+    
+    assert manager.bulk_delete([team, *team.members])
+    assert session.execute(select(Team)).all() == []
+    assert session.execute(select(Member)).all() == []
+
+def test_bulk_delete_parent_keeps_orm_collection_cleanup(manager, session):
+    """Test that deleting a parent still detaches its children through the ORM."""
+    session.add(Team(id=1, members=[Member(id=1)]))
+    session.commit()
+    
+    assert manager.bulk_delete([session.get(Team, 1)])
+    assert session.get(Member, 1).team_id is None
+
+def test_bulk_delete_uses_single_statement(manager, session):
+    """Test that models without relationships are deleted in one statement."""
+    tags = [Tag(id=i, name=f'tag{i}') for i in range(3)]
+    session.add_all(tags)
+    session.commit()
+    
+    statements = []
+    event.listen(session.bind, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    
+    assert manager.bulk_delete(tags)
+    assert [s for s in statements if s.startswith('DELETE')] == ['DELETE FROM tags WHERE tags.id IN (?, ?, ?)']
+    assert all(tag not in session for tag in tags)
+
+def test_bulk_delete_passive_deletes_relies_on_database(manager, session):
+    """Test that passive_deletes relationships use the bulk path and the database cascade."""
+    session.add(Room(id=1, bookings=[Booking(id=1)]))
+    session.commit()
+    
+    assert manager.bulk_delete([session.get(Room, 1)])
+    assert session.execute(select(Booking)).all() == []
@@ -253,4 +253,27 @@ class TestErrorHandling:
                 'name': 'Name is required',
                 'email': 'Email must be valid'
             }
-            # ... existing code ... 
\ No newline at end of file
+            # ... existing code ... 
+
+def test_api_error_timestamp_is_captured_when_raised():
+    """Test that the timestamp reflects creation time, not first serialization."""
+    from meeting_shared.errors import APIError
+    
+    with patch('meeting_shared.errors.time.time', return_value=1700000000.25):
+        error = APIError("Test error")
+    
+    assert error.created_at == 1700000000.25
+    assert error.timestamp == "2023-11-14T22:13:20.250000Z"
+    assert error.to_dict()["timestamp"] == error.timestamp
+
+
+def test_api_error_details_are_not_shared():
+    """Test that errors raised without details get their own mutable dict."""
+    from meeting_shared.errors import APIError
+    
+    first = APIError("First")
+    second = APIError("Second")
+    first.details['field'] = 'value'
+    
+    assert second.details == {}
+    assert first.to_dict()['details'] == {'field': 'value'}
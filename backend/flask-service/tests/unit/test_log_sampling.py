@@ -5,11 +5,14 @@ Unit tests for log sampling functionality.
 import pytest
 import logging
 import random
+import time
 from meeting_shared.shared_logging.sampling import (
+    NEVER_MASK,
     SamplingConfig, 
     LogSampler, 
     SamplingLogFilter,
     configure_sampling,
+    rate_to_mask,
     should_log
 )
 
@@ -114,6 +117,55 @@ class TestSamplingConfig:
         assert config.get_rate_for_level('INFO') == 0.5
         assert config.get_rate_for_level(logging.ERROR) == 1.0
         assert config.get_rate_for_level('WARNING') == 0.5
+    
+    @pytest.mark.parametrize('path', [
+        '/a.b', '/a\nb', '/x/a-b', '/api/users/42', '/api/users/42/edit',
+        '/api/health\n', '/static/app.js', '/', '',
+    ])
+    def test_combined_pattern_matches_sequential_search(self, path):
+        """Test that the combined path regex picks the same pattern as searching each in turn."""
+        config = SamplingConfig(path_rates={
+            r'^/a.b$': 0.1,
+            r'^/api/health$': 0.2,
+            r'^/api/users/\d+$': 0.3,
+            r'/api/users/': 0.4,
+            r'a.b': 0.5,
+            r'\.js$': 0.6,
+        })
+        assert config._combined_path_pattern is not None
+        
+        match = config._combined_path_pattern.match(path)
+        combined = int(match.lastgroup[1:]) if match else None
+        sequential = next(
+            (index for index, pattern in enumerate(config.path_patterns) if pattern.search(path)),
+            None
+        )
+        assert combined == sequential
+    
+    def test_combined_pattern_dispatch(self):
+        """Test that path rates are looked up through the combined regex, first pattern winning."""
+        config = SamplingConfig(path_rates={
+            r'^/api/users/\d+': 0.2,
+            r'^/api/users': 0.4,
+        })
+        
+        assert config._combined_path_pattern is not None
+        assert config.get_rate_for_path('/api/users/7') == 0.2
+        assert config.get_rate_for_path('/api/users') == 0.4
+        assert config.get_mask_for_path('/api/users/7') == rate_to_mask(0.2)
+        assert config.get_rate_for_path('/api/meetings') == 1.0
+    
+    def test_uncombinable_patterns_fall_back_to_sequential_search(self):
+        """Test that backreferences and inline flags are matched one pattern at a time."""
+        config = SamplingConfig(path_rates={
+            r'^/(\w+)/\1$': 0.2,
+            r'(?i)^/API/': 0.4,
+        })
+        
+        assert config._combined_path_pattern is None
+        assert config.get_rate_for_path('/echo/echo') == 0.2
+        assert config.get_rate_for_path('/api/meetings') == 0.4
+        assert config.get_rate_for_path('/echo/other') == 1.0
 
 
 class TestLogSampler:
@@ -137,31 +189,112 @@ class TestLogSampler:
         )
         sampler = LogSampler(config)
         
-        # Test with path
-        assert sampler.should_log(path='/api/other') != sampler.should_log(path='/api/health')
+        # 0.5 logs every 2nd record; 0.1 is rounded to every 16th
+        other = [sampler.should_log(path='/api/other') for _ in range(32)]
+        health = [sampler.should_log(path='/api/health') for _ in range(32)]
+        assert sum(other) == 16
+        assert sum(health) == 2
     
     def test_deterministic_sampling(self):
         """Test that sampling is deterministic for the same inputs."""
-        sampler = LogSampler(SamplingConfig(default_rate=0.5))
-        
-        # Same inputs should give same results
         path = '/api/test'
         method = 'GET'
         level = logging.INFO
         
-        result1 = sampler.should_log(path, method, level)
-        result2 = sampler.should_log(path, method, level)
+        first = LogSampler(SamplingConfig(default_rate=0.5))
+        second = LogSampler(SamplingConfig(default_rate=0.5))
+        results = [first.should_log(path, method, level) for _ in range(8)]
+        
+        # Every 2nd record for the same key is logged, in the same order every time
+        assert results == [False, True] * 4
+        assert [second.should_log(path, method, level) for _ in range(8)] == results
+        
+        # Different inputs are counted separately
+        assert first.should_log('/api/other', method, level) is False
+        assert first.should_log('/api/other', method, level) is True
+    
+    @pytest.mark.parametrize('rate, mask', [
+        (1.0, 0),
+        (0.5, 1),
+        (0.3, 3),
+        (0.25, 3),
+        (0.1, 15),
+        (0.01, 127),
+    ])
+    def test_rate_to_mask(self, rate, mask):
+        """Test that sampling periods are rounded up to a power of two."""
+        assert rate_to_mask(rate) == mask
+        assert rate_to_mask(0.0) == NEVER_MASK
+    
+    def test_most_restrictive_mask_wins(self):
+        """Test that the lowest rate across path, method and level is applied."""
+        sampler = LogSampler(SamplingConfig(
+            default_rate=1.0,
+            path_rates={r'^/api/health': 0.5},
+            method_rates={'GET': 0.25}
+        ))
+        
+        assert sum(sampler.should_log('/api/health', 'GET') for _ in range(16)) == 4
+        assert sum(sampler.should_log('/api/health', 'POST') for _ in range(16)) == 8
+        assert all(sampler.should_log('/api/other', 'POST') for _ in range(16))
+    
+    def test_counters_reset_after_cleanup_interval(self, monkeypatch):
+        """Test that per-key counters restart after the cleanup interval."""
+        sampler = LogSampler(SamplingConfig(default_rate=0.5))
+        assert sampler.should_log('/api/test') is False
+        assert sampler.should_log('/api/test') is True
+        
+        clock = sampler.last_cleanup + sampler.cleanup_interval + 1
+        monkeypatch.setattr(time, 'monotonic', lambda: clock)
+        
+        assert sampler.should_log('/api/test') is False
+        assert list(sampler.request_counts) == [('/api/test', None, None)]
+        assert sampler.last_cleanup == clock
+    
+    def test_random_sampling_uses_exact_rate(self, monkeypatch):
+        """Test that random mode compares against the configured rate, not the rounded mask."""
+        sampler = LogSampler(SamplingConfig(default_rate=0.3, deterministic=False))
         
-        # First two calls with same parameters should have same result
-        # (because count is 1, then 2, and both 1 and 2 have same result with rate=0.5)
-        assert result1 == result2
+        monkeypatch.setattr(random, 'random', lambda: 0.29)
+        assert sampler.should_log(path='/api/test')
+        monkeypatch.setattr(random, 'random', lambda: 0.3)
+        assert not sampler.should_log(path='/api/test')
+        assert sampler.request_counts == {}
+    
+    @pytest.mark.parametrize('config', [
+        SamplingConfig(default_rate=0.7, deterministic=False),
+        SamplingConfig(path_rates={'/x': 0.7}, deterministic=False),
+    ])
+    def test_random_sampling_above_half(self, config):
+        """Test that random mode samples rates between 0.5 and 1, which round to mask 0."""
+        assert not config.always_log
+        sampler = LogSampler(config)
+        random.seed(1234)
         
-        # Third call might be different because count is now 3
-        result3 = sampler.should_log(path, method, level)
+        logged = sum(sampler.should_log(path='/x') for _ in range(10000))
         
-        # Different inputs should potentially give different results
-        different_path = '/api/other'
-        assert sampler.should_log(different_path, method, level) != sampler.should_log(path, method, level)
+        assert 6700 < logged < 7300
+    
+    def test_always_and_never_log_flags(self):
+        """Test that the shortcut flags only fire for rates of exactly 1 and 0."""
+        assert SamplingConfig().always_log
+        assert not SamplingConfig(default_rate=0.9).always_log
+        assert SamplingConfig(default_rate=0.0).never_log
+        assert not SamplingConfig(default_rate=0.0, path_rates={'/x': 0.01}).never_log
+    
+    def test_random_sampling_uses_most_restrictive_rate(self, monkeypatch):
+        """Test that random mode takes the lowest rate across path, method and level."""
+        sampler = LogSampler(SamplingConfig(
+            default_rate=0.9,
+            path_rates={r'^/api/health': 0.6},
+            method_rates={'GET': 0.3},
+            deterministic=False
+        ))
+        monkeypatch.setattr(random, 'random', lambda: 0.5)
+        
+        assert sampler.should_log(path='/api/health')
+        assert not sampler.should_log(path='/api/health', method='GET')
+        assert sampler.should_log(path='/api/other', method='POST', level=logging.INFO)
 
 
 class TestSamplingLogFilter:
@@ -170,46 +303,52 @@ class TestSamplingLogFilter:
     def test_filter(self):
         """Test filtering log records."""
         config = SamplingConfig(
-            default_rate=0.5,
+            default_rate=1.0,
             path_rates={
-                r'^/api/health': 0.1
+                r'^/api/health': 0.25
             },
             level_rates={
-                'DEBUG': 0.1,
-                'ERROR': 1.0
+                'DEBUG': 0.5
             }
         )
-        sampler = LogSampler(config)
-        filter = SamplingLogFilter(sampler)
-        
-        # Create a record with path
-        record = logging.LogRecord(
-            name='test',
-            level=logging.INFO,
-            pathname='test.py',
-            lineno=1,
-            msg='Test message',
-            args=(),
-            exc_info=None
-        )
-        record.path = '/api/health'
-        
-        # Filter should use the sampler
-        assert filter.filter(record) == sampler.should_log(path='/api/health', level=logging.INFO)
-        
-        # Error records should always be logged
-        error_record = logging.LogRecord(
-            name='test',
-            level=logging.ERROR,
-            pathname='test.py',
-            lineno=1,
-            msg='Error message',
-            args=(),
-            exc_info=None
-        )
-        error_record.path = '/api/health'
+        filter = SamplingLogFilter(LogSampler(config))
+        expected = LogSampler(config)
+        
+        def make_record(level, path=None, method=None):
+            record = logging.LogRecord(
+                name='test',
+                level=level,
+                pathname='test.py',
+                lineno=1,
+                msg='Test message',
+                args=(),
+                exc_info=None
+            )
+            if path is not None:
+                record.path = path
+            if method is not None:
+                record.method = method
+            return record
+        
+        # Filter should use the sampler with the record's path, method and level
+        results = [filter.filter(make_record(logging.INFO, '/api/health', 'GET')) for _ in range(8)]
+        assert results == [expected.should_log('/api/health', 'GET', logging.INFO) for _ in range(8)]
+        assert sum(results) == 2
+        
+        # Records outside sampled paths and levels are always logged
+        assert all(filter.filter(make_record(logging.ERROR, '/api/meetings')) for _ in range(8))
+        assert all(filter.filter(make_record(logging.ERROR)) for _ in range(8))
+        
+        # Level rates apply to records without a path
+        assert sum(filter.filter(make_record(logging.DEBUG)) for _ in range(8)) == 4
+    
+    def test_filter_skips_lookups_when_logging_everything(self):
+        """Test that records pass untouched when nothing is sampled."""
+        filter = SamplingLogFilter(LogSampler(SamplingConfig()))
+        record = logging.LogRecord('test', logging.DEBUG, 'test.py', 1, 'msg', (), None)
         
-        assert filter.filter(error_record) == True
+        assert filter.filter(record)
+        assert filter.sampler.request_counts == {}
 
 
 class TestGlobalFunctions:
@@ -0,0 +1,158 @@
+"""
+Unit tests for the shared logging configuration module.
+"""
+
+import os
+import json
+import logging
+import pytest
+from flask import Flask, g
+from meeting_shared.shared_logging.config import (
+    BufferedRotatingFileHandler, JSONFormatter, RequestIDLogFilter, get_log_config
+)
+
+# Add pytest mark for test categories
+pytestmark = [pytest.mark.unit, pytest.mark.logging]
+
+def _record(msg, level=logging.INFO):
+    return logging.LogRecord('test', level, __file__, 1, msg, (), None)
+
+class TestBufferedRotatingFileHandler:
+    """Tests for the BufferedRotatingFileHandler class."""
+    
+    def test_tracks_encoded_size(self, tmp_path):
+        """Test that the tracked size counts bytes, not characters."""
+        handler = BufferedRotatingFileHandler(str(tmp_path / 'app.log'), encoding='utf-8')
+        try:
+            handler.emit(_record('héllo wörld ✓'))
+            handler.emit(_record('plain ascii'))
+            handler.flush()
+            assert handler._size == os.path.getsize(tmp_path / 'app.log')
+        finally:
+            handler.close()
+    
+    def test_rollover_respects_max_bytes(self, tmp_path):
+        """Test that no file grows past maxBytes with multi-byte messages."""
+        log_file = tmp_path / 'app.log'
+        handler = BufferedRotatingFileHandler(str(log_file), maxBytes=100, backupCount=5, encoding='utf-8')
+        try:
+            for _ in range(10):
+                # 20 characters, 59 bytes with the newline
+                handler.emit(_record('✓' * 19 + 'x'))
+            handler.flush()
+        finally:
+            handler.close()
+        
+        files = sorted(tmp_path.iterdir())
+        assert len(files) > 1
+        assert all(os.path.getsize(path) <= 100 for path in files)
+    
+    def test_flushes_at_flush_level(self, tmp_path):
+        """Test that warnings are written to disk immediately."""
+        log_file = tmp_path / 'app.log'
+        handler = BufferedRotatingFileHandler(str(log_file))
+        try:
+            handler.emit(_record('buffered'))
+            assert os.path.getsize(log_file) == 0
+            handler.emit(_record('urgent', logging.WARNING))
+            assert log_file.read_text().splitlines() == ['buffered', 'urgent']
+        finally:
+            handler.close()
+
+class TestRequestIDLogFilter:
+    """Tests for the RequestIDLogFilter class."""
+    
+    def test_defaults_outside_requests(self):
+        """Test that records logged outside a request get the default context."""
+        record = _record('msg')
+        
+        assert RequestIDLogFilter().filter(record)
+        assert record.request_id == 'no_request_id'
+        assert record.correlation_id == 'no_correlation_id'
+        assert record.user_id == 'no_user'
+        assert record.path == '/'
+        assert record.method == 'NONE'
+        assert 'taskName' in record.__dict__
+    
+    def test_request_context(self):
+        """Test that IDs come from g first and from the request headers otherwise."""
+        app = Flask(__name__)
+        log_filter = RequestIDLogFilter()
+        
+        with app.test_request_context('/api/meetings', method='POST', headers={
+            'X-Request-ID': 'header-req', 'X-Correlation-ID': 'header-corr'
+        }):
+            record = _record('msg')
+            log_filter.filter(record)
+            assert (record.request_id, record.correlation_id) == ('header-req', 'header-corr')
+            assert record.user_id == 'anonymous'
+            assert (record.path, record.method) == ('/api/meetings', 'POST')
+            
+            g.request_id = 'g-req'
+            g.user_id = 42
+            record = _record('msg')
+            log_filter.filter(record)
+            assert (record.request_id, record.correlation_id) == ('g-req', 'header-corr')
+            assert record.user_id == 42
+
+class TestJSONFormatter:
+    """Tests for the JSONFormatter class."""
+    
+    def test_format(self):
+        """Test the fields, timestamp and extra attributes of formatted records."""
+        record = _record('hello %s')
+        record.args = ('world',)
+        record.created = 1700000000.123456
+        record.meeting_id = 7
+        record._private = 'hidden'
+        
+        data = json.loads(JSONFormatter(service_name='meetings').format(record))
+        
+        assert data['service'] == 'meetings'
+        assert data['message'] == 'hello world'
+        assert data['level'] == 'INFO'
+        assert data['timestamp'] == '2023-11-14T22:13:20.123456'
+        assert data['meeting_id'] == 7
+        assert '_private' not in data
+        assert 'request_id' not in data
+    
+    def test_format_with_request_context(self):
+        """Test that filtered records carry the request context in the output."""
+        record = _record('msg')
+        RequestIDLogFilter().filter(record)
+        
+        data = json.loads(JSONFormatter(service_name='meetings').format(record))
+        
+        assert data['request_id'] == 'no_request_id'
+        assert data['path'] == '/'
+    
+    def test_timestamp_cache_tracks_seconds(self):
+        """Test that the per-second timestamp prefix is refreshed when the second changes."""
+        formatter = JSONFormatter()
+        
+        assert formatter._timestamp(1700000000.5) == '2023-11-14T22:13:20.500000'
+        assert formatter._timestamp(1700000001.25) == '2023-11-14T22:13:21.250000'
+        assert formatter._timestamp(1700000000.0) == '2023-11-14T22:13:20.000000'
+
+class TestGetLogConfig:
+    """Tests for the get_log_config function."""
+    
+    def test_returns_independent_copies(self):
+        """Test that modifying a returned config does not affect later calls."""
+        first = get_log_config(service_name='svc', log_level='INFO')
+        first['loggers']['svc']['handlers'].append('extra')
+        first['handlers']['console']['level'] = 'DEBUG'
+        
+        second = get_log_config(service_name='svc', log_level='INFO')
+        assert second['loggers']['svc']['handlers'] == ['console']
+        assert second['handlers']['console']['level'] == 'INFO'
+    
+    def test_file_and_sampling_options(self, tmp_path):
+        """Test that the file handler and sampling filter are added when enabled."""
+        log_file = str(tmp_path / 'svc.log')
+        config = get_log_config(service_name='svc', log_level='INFO', log_to_file=True,
+                                log_file=log_file, enable_sampling=True)
+        
+        assert config['handlers']['file']['filename'] == log_file
+        assert config['loggers']['svc']['handlers'] == ['console', 'file']
+        assert 'sampling' in config['loggers']['svc']['filters']
@@ -0,0 +1,341 @@
+"""
+Unit tests for the shared secret managers.
+"""
+
+import os
+import json
+import time
+import pytest
+from meeting_shared.secrets import vault
+from meeting_shared.secrets.base import SecretManager, _MISSING
+from meeting_shared.secrets.file import FileSecretManager
+
+# Add pytest mark for test categories
+pytestmark = [pytest.mark.unit]
+
+class FakeSharedCache:
+    """Dictionary-backed stand-in for SharedSecretCache."""
+    
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+    
+    def get(self, key):
+        return self.values.get(key)
+    
+    def set(self, key, value, ttl):
+        self.values[key] = value
+    
+    def delete(self, key):
+        self.values.pop(key, None)
+    
+    def clear(self):
+        self.values.clear()
+
+class DictSecretManager(SecretManager):
+    """Secret manager over a dict that caches values like the real backends."""
+    
+    def __init__(self, values, **kwargs):
+        super().__init__(**kwargs)
+        self.values = values
+        self.lookups = 0
+    
+    def get_secret(self, key, default=None):
+        value = self._get_cached(key)
+        if value is _MISSING:
+            return default
+        if value is not None:
+            return value
+        self.lookups += 1
+        value = self.values.get(key, _MISSING)
+        self._set_cached(key, value)
+        return default if value is _MISSING else value
+    
+    def has_secret(self, key):
+        return self.get_secret(key, _MISSING) is not _MISSING
+
+class TestSecretManagerCache:
+    """Tests for the value cache shared by all secret managers."""
+    
+    def test_values_and_misses_are_cached(self):
+        """Test that hits and misses are served from the cache."""
+        manager = DictSecretManager({'db': 'pass'})
+        
+        assert manager.get_secret('db') == 'pass'
+        assert manager.get_secret('nope', 'dflt') == 'dflt'
+        manager.values['nope'] = 'created'
+        assert manager.get_secret('db') == 'pass'
+        assert manager.get_secret('nope') is None
+        assert manager.lookups == 2
+    
+    def test_misses_expire_sooner(self, monkeypatch):
+        """Test that cached misses expire after miss_cache_ttl, values after value_cache_ttl."""
+        manager = DictSecretManager({'db': 'pass'}, value_cache_ttl=300, miss_cache_ttl=10)
+        clock = [100.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: clock[0])
+        
+        manager.get_secret('db')
+        manager.get_secret('nope')
+        manager.values['nope'] = 'created'
+        clock[0] += 11
+        
+        assert manager.get_secret('nope') == 'created'
+        assert manager.get_secret('db') == 'pass'
+        assert manager.lookups == 3
+    
+    def test_zero_ttl_disables_cache(self):
+        """Test that value_cache_ttl=0 looks up every key every time."""
+        manager = DictSecretManager({'db': 'pass'}, value_cache_ttl=0)
+        for _ in range(3):
+            manager.get_secret('db')
+            manager.get_secret('nope')
+        
+        assert manager.lookups == 6
+        assert manager._value_cache == {}
+    
+    def test_invalidate(self):
+        """Test that invalidated keys are looked up again."""
+        manager = DictSecretManager({'db': 'pass'})
+        manager.get_secret('db')
+        manager.values['db'] = 'rotated'
+        
+        manager.invalidate('db')
+        assert manager.get_secret('db') == 'rotated'
+        manager.values['db'] = 'rotated-again'
+        manager.clear_cache()
+        assert manager.get_secret('db') == 'rotated-again'
+    
+    def test_entries_expire(self, monkeypatch):
+        """Test that cached values expire after value_cache_ttl."""
+        manager = DictSecretManager({'db': 'pass'}, value_cache_ttl=10)
+        clock = [100.0]
+        monkeypatch.setattr(time, 'monotonic', lambda: clock[0])
+        
+        manager.get_secret('db')
+        clock[0] += 11
+        manager.get_secret('db')
+        assert manager.lookups == 2
+    
+    def test_cache_size_is_bounded(self):
+        """Test that the oldest entry is evicted when the cache is full."""
+        manager = DictSecretManager({}, value_cache_size=2)
+        for key in ('a', 'b', 'c'):
+            manager.get_secret(key)
+        
+        assert list(manager._value_cache) == ['b', 'c']
+    
+    def test_shared_cache(self):
+        """Test that values come from, and go to, the shared cache but misses stay local."""
+        shared = FakeSharedCache({'db': 'shared-pass'})
+        manager = DictSecretManager({'api': 'key'}, shared_cache=shared)
+        
+        assert manager.get_secret('db') == 'shared-pass'
+        assert manager.get_secret('api') == 'key'
+        assert manager.get_secret('nope') is None
+        assert shared.values == {'db': 'shared-pass', 'api': 'key'}
+        assert manager.lookups == 2
+        
+        manager.invalidate('api')
+        assert 'api' not in shared.values
+    
+    def test_get_secrets_uses_batch_get(self):
+        """Test that get_secrets returns every key, None for missing ones."""
+        manager = DictSecretManager({'a': '1'})
+        
+        assert manager.get_secrets(['a', 'b']) == {'a': '1', 'b': None}
+
+class TestFileSecretManager:
+    """Tests for the file-based secret manager."""
+    
+    @pytest.fixture
+    def secrets_dir(self, tmp_path):
+        (tmp_path / 'db').mkdir()
+        (tmp_path / 'db' / 'password').write_text('s3cret\n')
+        (tmp_path / 'api_key').write_text('key')
+        (tmp_path / '..data').mkdir()
+        (tmp_path / '..data' / 'ignored').write_text('x')
+        (tmp_path / '.hidden').write_text('x')
+        return tmp_path
+    
+    def test_directory_secrets(self, secrets_dir):
+        """Test that files are loaded under dotted keys, stripped of whitespace."""
+        manager = FileSecretManager(str(secrets_dir))
+        
+        assert manager.get_secret('db.password') == 's3cret'
+        assert manager.get_secret('db/password') == 's3cret'
+        assert manager.get_secret('api_key') == 'key'
+        assert manager.get_secret('..data.ignored', 'dflt') == 'dflt'
+        assert manager.has_secret('db.password')
+        assert not manager.has_secret('.hidden')
+    
+    def test_directory_batch_get(self, secrets_dir):
+        """Test that batch_get serves every key from the loaded files."""
+        manager = FileSecretManager(str(secrets_dir))
+        
+        assert manager.batch_get(['db.password', 'api_key', 'nope']) == {
+            'db.password': 's3cret', 'api_key': 'key', 'nope': None
+        }
+    
+    def test_directory_refresh(self, secrets_dir):
+        """Test that new files are picked up on the next check."""
+        manager = FileSecretManager(str(secrets_dir), refresh_interval=0)
+        assert manager.get_secret('new') is None
+        
+        (secrets_dir / 'new').write_text('value')
+        
+        assert manager.get_secret('new') == 'value'
+    
+    def test_in_place_rewrite_is_reloaded(self, secrets_dir):
+        """Test that rewriting a file in a subdirectory is picked up."""
+        manager = FileSecretManager(str(secrets_dir), refresh_interval=0)
+        assert manager.get_secret('db.password') == 's3cret'
+        
+        (secrets_dir / 'db' / 'password').write_text('rotated-password\n')
+        
+        assert manager.get_secret('db.password') == 'rotated-password'
+        assert manager.batch_get(['db.password']) == {'db.password': 'rotated-password'}
+    
+    def test_refresh_interval_limits_checks(self, secrets_dir):
+        """Test that changes are only looked for once per refresh_interval."""
+        manager = FileSecretManager(str(secrets_dir), refresh_interval=3600)
+        manager.get_secret('api_key')
+        
+        (secrets_dir / 'api_key').write_text('rotated-key')
+        
+        assert manager.get_secret('api_key') == 'key'
+    
+    def test_kubernetes_symlink_layout(self, tmp_path):
+        """Test that symlinked keys are read and follow an atomic '..data' swap."""
+        first = tmp_path / '..2024_01_01'
+        (first / 'db').mkdir(parents=True)
+        (first / 'db' / 'password').write_text('first')
+        (first / 'api_key').write_text('key-1')
+        (tmp_path / '..data').symlink_to(first.name)
+        (tmp_path / 'db').symlink_to('..data/db')
+        (tmp_path / 'api_key').symlink_to('..data/api_key')
+        manager = FileSecretManager(str(tmp_path), refresh_interval=0)
+        
+        assert manager.get_secret('db.password') == 'first'
+        assert manager.get_secret('api_key') == 'key-1'
+        
+        second = tmp_path / '..2024_01_02'
+        (second / 'db').mkdir(parents=True)
+        (second / 'db' / 'password').write_text('second')
+        (second / 'api_key').write_text('key-2')
+        (tmp_path / '..data_tmp').symlink_to(second.name)
+        os.replace(tmp_path / '..data_tmp', tmp_path / '..data')
+        
+        assert manager.get_secret('db.password') == 'second'
+        assert manager.get_secret('api_key') == 'key-2'
+    
+    def test_symlink_loop_is_walked_once(self, secrets_dir):
+        """Test that a directory linking back to its parent does not loop forever."""
+        (secrets_dir / 'db' / 'again').symlink_to('..')
+        manager = FileSecretManager(str(secrets_dir))
+        
+        assert manager.get_secret('db.password') == 's3cret'
+        assert manager.get_secret('db.again.api_key') is None
+    
+    def test_json_file(self, tmp_path):
+        """Test that a JSON file is loaded as a flat mapping of secrets."""
+        secrets_file = tmp_path / 'secrets.json'
+        secrets_file.write_text(json.dumps({'db.password': 's3cret', 'port': 5432}))
+        manager = FileSecretManager(str(secrets_file))
+        
+        assert manager.get_secret('db.password') == 's3cret'
+        assert manager.get_secret('port') == 5432
+        assert manager.batch_get(['port', 'nope']) == {'port': 5432, 'nope': None}
+        assert not manager.has_secret('nope')
+    
+    def test_empty_json_file(self, tmp_path):
+        """Test that an empty JSON file leaves the manager empty instead of failing."""
+        secrets_file = tmp_path / 'secrets.json'
+        secrets_file.write_text('')
+        manager = FileSecretManager(str(secrets_file))
+        
+        assert manager.get_secret('anything') is None
+
+def _vault_manager(monkeypatch, cache_ttl):
+    """Vault manager whose reads come from a dict instead of a Vault server."""
+    if not vault.HAS_HVAC:
+        pytest.skip("hvac is not installed")
+    manager = vault.VaultSecretManager(url='http://vault', token='token', cache_ttl=cache_ttl)
+    manager.stored = {'secret/db': {'value': 'db-pass'}, 'secret/api': {'value': 'api-key'}}
+    manager.reads = []
+    
+    def read_path(path):
+        manager.reads.append(path)
+        if path == 'secret/broken':
+            raise ConnectionError('vault down')
+        return manager.stored.get(path)
+    
+    monkeypatch.setattr(manager, '_read_path', read_path)
+    return manager
+
+@pytest.fixture
+def vault_manager(monkeypatch):
+    return _vault_manager(monkeypatch, cache_ttl=300)
+
+def test_vault_batch_get_reads_each_path_once(vault_manager):
+    """Test that batch_get reads every missing path once."""
+    result = vault_manager.batch_get(['db', 'api', 'db', 'nope'])
+    
+    assert result == {'db': 'db-pass', 'api': 'api-key', 'nope': None}
+    assert sorted(vault_manager.reads) == ['secret/api', 'secret/db', 'secret/nope']
+
+def test_vault_batch_get_populates_value_cache(vault_manager):
+    """Test that batch_get results, including misses, are served from the cache afterwards."""
+    vault_manager.batch_get(['db', 'nope'])
+    vault_manager.reads.clear()
+    
+    assert vault_manager.batch_get(['db', 'nope']) == {'db': 'db-pass', 'nope': None}
+    assert vault_manager.get_secret('db') == 'db-pass'
+    assert not vault_manager.has_secret('nope')
+    assert vault_manager.reads == []
+
+def test_vault_batch_get_only_fetches_misses(vault_manager):
+    """Test that keys cached by get_secret are not read again by batch_get."""
+    vault_manager.get_secret('db')
+    vault_manager.reads.clear()
+    
+    assert vault_manager.batch_get(['db', 'api']) == {'db': 'db-pass', 'api': 'api-key'}
+    assert vault_manager.reads == ['secret/api']
+
+def test_vault_batch_get_uses_shared_cache(vault_manager):
+    """Test that batch_get serves keys from the shared cache and fills it with new values."""
+    vault_manager.shared_cache = FakeSharedCache({'db': 'shared-pass'})
+    
+    assert vault_manager.batch_get(['db', 'api']) == {'db': 'shared-pass', 'api': 'api-key'}
+    assert vault_manager.reads == ['secret/api']
+    assert vault_manager.shared_cache.values['api'] == 'api-key'
+
+def test_vault_batch_get_does_not_cache_errors(vault_manager):
+    """Test that failed reads return None and are retried on the next call."""
+    assert vault_manager.batch_get(['broken', 'db']) == {'broken': None, 'db': 'db-pass'}
+    vault_manager.reads.clear()
+    
+    vault_manager.batch_get(['broken', 'db'])
+    assert vault_manager.reads == ['secret/broken']
+
+def test_vault_zero_cache_ttl_reads_every_time(monkeypatch):
+    """Test that cache_ttl=0 disables both the path and the value cache."""
+    manager = _vault_manager(monkeypatch, cache_ttl=0)
+    
+    for _ in range(2):
+        assert manager.get_secret('db') == 'db-pass'
+        assert manager.get_secret('nope') is None
+        assert manager.batch_get(['api']) == {'api': 'api-key'}
+    
+    assert manager.reads == ['secret/db', 'secret/nope', 'secret/api'] * 2
+
+def test_vault_misses_expire_before_values(vault_manager, monkeypatch):
+    """Test that a missing secret is read again once the miss TTL has passed."""
+    clock = [100.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: clock[0])
+    vault_manager.get_secret('db')
+    vault_manager.get_secret('nope')
+    vault_manager.stored['secret/nope'] = {'value': 'created'}
+    
+    clock[0] += vault_manager.miss_cache_ttl + 1
+    assert vault_manager.get_secret('nope') == 'created'
+    assert vault_manager.get_secret('db') == 'db-pass'
+    assert vault_manager.reads == ['secret/db', 'secret/nope', 'secret/nope']
@@ -0,0 +1,383 @@
+"""
+Tests for service discovery providers.
+"""
+
+import json
+import threading
+import pytest
+import requests
+from meeting_shared.discovery import static
+from meeting_shared.discovery.static import StaticServiceDiscovery
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis calls used by cached_get."""
+    
+    def __init__(self):
+        self.hashes = {}
+    
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+    
+    def hset(self, key, mapping):
+        self.hashes[key] = {
+            k.encode(): v if isinstance(v, bytes) else str(v).encode()
+            for k, v in mapping.items()
+        }
+        return self
+    
+    def expire(self, key, ttl):
+        return self
+    
+    def pipeline(self):
+        return self
+    
+    def execute(self):
+        return []
+
+class FakeResponse:
+    def __init__(self, body, headers):
+        self.status_code = 200
+        self.headers = headers
+        self.content = body
+
+@pytest.fixture
+def discovery(monkeypatch):
+    """Static discovery with one service, a fake response cache and a fake upstream."""
+    monkeypatch.setenv('SERVICE_HEALTH_CHECK_INTERVAL', '3600')
+    provider = StaticServiceDiscovery()
+    provider.register_service('meetings', 'http://meetings')
+    provider._response_cache = FakeRedis()
+    provider.upstream_headers = {}
+    provider.calls = 0
+    
+    def fake_get(url, params=None, headers=None, timeout=None):
+        provider.calls += 1
+        token = (headers or {}).get('Authorization', 'anonymous')
+        return FakeResponse(f"{token}:{provider.calls}".encode(), dict(provider.upstream_headers))
+    
+    monkeypatch.setattr(provider._session, 'get', fake_get)
+    yield provider
+    provider.close()
+
+def test_cached_get_does_not_share_responses_between_tokens(discovery):
+    """Test that requests with different credentials never see each other's responses."""
+    discovery.upstream_headers = {'Cache-Control': 'public, max-age=60'}
+    
+    alice = discovery.cached_get('meetings', '/me', headers={'Authorization': 'Bearer alice'})
+    bob = discovery.cached_get('meetings', '/me', headers={'Authorization': 'Bearer bob'})
+    
+    assert alice['body'].startswith(b'Bearer alice')
+    assert bob['body'].startswith(b'Bearer bob')
+    assert discovery._response_cache.hashes == {}
+
+def test_cached_get_bypasses_cache_with_cookie(discovery):
+    """Test that cookie-authenticated requests are not cached."""
+    discovery.upstream_headers = {'Cache-Control': 'max-age=60'}
+    
+    discovery.cached_get('meetings', '/me', headers={'cookie': 'session=1'})
+    discovery.cached_get('meetings', '/me', headers={'cookie': 'session=1'})
+    
+    assert discovery.calls == 2
+
+def test_cached_get_requires_explicit_cache_control(discovery):
+    """Test that responses without Cache-Control are not cached."""
+    first = discovery.cached_get('meetings', '/meetings')
+    second = discovery.cached_get('meetings', '/meetings')
+    
+    assert first['body'] != second['body']
+    assert discovery.calls == 2
+
+@pytest.mark.parametrize('cache_control', ['public, max-age=60', 'public', 'max-age=30'])
+def test_cached_get_caches_public_responses(discovery, cache_control):
+    """Test that explicitly cacheable responses are served from the cache."""
+    discovery.upstream_headers = {'Cache-Control': cache_control}
+    
+    first = discovery.cached_get('meetings', '/meetings')
+    second = discovery.cached_get('meetings', '/meetings')
+    
+    assert first['body'] == second['body']
+    assert discovery.calls == 1
+
+@pytest.mark.parametrize('headers', [
+    {'Cache-Control': 'private, max-age=60'},
+    {'Cache-Control': 'no-store'},
+    {'Cache-Control': 'public, max-age=60', 'Vary': 'Authorization'},
+    {'Cache-Control': 'public, max-age=60', 'Vary': '*'},
+])
+def test_cached_get_skips_uncacheable_responses(discovery, headers):
+    """Test that private, no-store and Vary responses are not cached."""
+    discovery.upstream_headers = headers
+    
+    discovery.cached_get('meetings', '/meetings')
+    discovery.cached_get('meetings', '/meetings')
+    
+    assert discovery.calls == 2
+
+def test_response_ttl_ignores_accept_encoding_vary(discovery):
+    """Test that Vary: Accept-Encoding does not prevent caching."""
+    response = FakeResponse(b'', {'Cache-Control': 'max-age=45', 'Vary': 'Accept-Encoding'})
+    
+    assert discovery._response_ttl(response) == 45
+    assert static._IGNORABLE_VARY == {'accept-encoding'}
+
+class FakeBatchResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+    
+    def json(self):
+        return self.body
+
+def test_batch_request_returns_sub_responses(discovery, monkeypatch):
+    """Test that the pipeline is posted once and the sub-responses come back in order."""
+    posts = []
+    sub_responses = [{'status': 200, 'body': {'id': 1}}, {'status': 404, 'body': None}]
+    
+    def fake_post(url, json=None, headers=None, timeout=None):
+        posts.append({'url': url, 'json': json, 'headers': headers, 'timeout': timeout})
+        return FakeBatchResponse(200, sub_responses)
+    
+    monkeypatch.setattr(discovery._session, 'post', fake_post)
+    pipeline = [{'method': 'GET', 'path': '/meetings/1'}, {'method': 'GET', 'path': '/meetings/2'}]
+    
+    result = discovery.batch_request('meetings', pipeline, headers={'X-Request-ID': 'req-1'}, timeout=5)
+    
+    assert result == sub_responses
+    assert posts == [{
+        'url': 'http://meetings/_batch',
+        'json': {'pipeline': pipeline},
+        'headers': {'X-Request-ID': 'req-1'},
+        'timeout': 5,
+    }]
+
+def test_batch_request_errors(discovery, monkeypatch):
+    """Test that unknown services and failed batches raise."""
+    monkeypatch.setattr(discovery._session, 'post',
+                        lambda url, **kwargs: FakeBatchResponse(404, {'error': 'Not Found'}))
+    
+    with pytest.raises(LookupError):
+        discovery.batch_request('billing', [])
+    with pytest.raises(requests.HTTPError):
+        discovery.batch_request('meetings', [{'method': 'GET', 'path': '/'}])
+
+def test_health_thread_starts_on_first_lookup(discovery, monkeypatch):
+    """Test that constructing a provider does not start the health thread."""
+    monkeypatch.setattr(discovery, '_check_all_services_health', lambda: None)
+    assert discovery._health_thread is None
+    
+    discovery.get_service('meetings')
+    thread = discovery._health_thread
+    discovery.get_services()
+    
+    assert thread.is_alive()
+    assert discovery._health_thread is thread
+    
+    discovery.close(timeout=1)
+    assert not thread.is_alive()
+
+def test_health_check_errors_are_logged(discovery, monkeypatch, caplog):
+    """Test that an exception in one health check is logged, not discarded."""
+    discovery.services = {'meetings': discovery.services['meetings']}
+    
+    def crash(service_name, service):
+        raise ValueError('boom')
+    
+    monkeypatch.setattr(discovery, '_check_service_health', crash)
+    with caplog.at_level('ERROR', logger=static.__name__):
+        discovery._check_all_services_health()
+    
+    assert 'meetings' in caplog.text
+    assert 'boom' in caplog.text
+
+def test_kubernetes_health_check_errors_are_logged(monkeypatch, caplog):
+    """Test that the Kubernetes provider logs exceptions from health checks."""
+    from meeting_shared.discovery import kubernetes
+    # Skip __init__, which talks to the Kubernetes API
+    provider = kubernetes.KubernetesServiceDiscovery.__new__(kubernetes.KubernetesServiceDiscovery)
+    provider.services = {'meetings': {'name': 'meetings'}}
+    
+    def crash(service_name, service):
+        raise ValueError('boom')
+    
+    monkeypatch.setattr(provider, '_check_service_health', crash)
+    with caplog.at_level('ERROR', logger=kubernetes.__name__):
+        provider._check_all_services_health()
+    
+    assert 'meetings' in caplog.text
+    assert 'boom' in caplog.text
+
+def _k8s_service(name, port=80):
+    return {'metadata': {'name': name, 'resourceVersion': '1'}, 'spec': {'ports': [{'port': port}]}}
+
+def _build_k8s_url(name):
+    from meeting_shared.discovery.kubernetes import _build_service_url
+    return _build_service_url(name, 'default', 80)
+
+class FakeK8sResponse:
+    """Kubernetes API response for either a list or a watch request."""
+    
+    def __init__(self, status_code=200, body=None, events=()):
+        self.status_code = status_code
+        self.body = body
+        self.text = ''
+        self.events = events
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def json(self):
+        return self.body
+    
+    def iter_lines(self):
+        return (json.dumps(event).encode() for event in self.events)
+
+class FakeK8sSession:
+    """Session that replays queued responses and stops the watch when they run out."""
+    
+    def __init__(self, provider, responses):
+        self.provider = provider
+        self.responses = list(responses)
+        self.requests = []
+    
+    def get(self, url, params=None, **kwargs):
+        self.requests.append(dict(params or {}))
+        if not self.responses:
+            self.provider._stopped.set()
+            return FakeK8sResponse()
+        return self.responses.pop(0)
+
+@pytest.fixture
+def k8s_discovery(monkeypatch):
+    """Kubernetes discovery without the API connection made by __init__."""
+    from meeting_shared.discovery import kubernetes
+    monkeypatch.setattr(kubernetes, 'HAS_IJSON', False)
+    provider = kubernetes.KubernetesServiceDiscovery.__new__(kubernetes.KubernetesServiceDiscovery)
+    provider.services = {}
+    provider.namespace = 'default'
+    provider.label_selector = None
+    provider.health_check_interval = 0
+    provider.api_host, provider.api_port = 'k8s', '443'
+    provider.ca_cert_path = None
+    provider._resource_version = None
+    provider._stopped = threading.Event()
+    provider._health_lock = threading.Lock()
+    monkeypatch.setattr(provider, '_get_token', lambda: 'token')
+    
+    def replay(*responses):
+        provider._session = FakeK8sSession(provider, responses)
+        return provider._session
+    
+    provider.replay = replay
+    return provider
+
+def _list_response(resource_version, *names):
+    return FakeK8sResponse(body={
+        'metadata': {'resourceVersion': resource_version},
+        'items': [_k8s_service(name) for name in names]
+    })
+
+def test_kubernetes_watch_starts_from_list_version(k8s_discovery):
+    """Test that the watch continues from the list and keeps health on MODIFIED."""
+    session = k8s_discovery.replay(_list_response('100', 'meetings', 'auth'))
+    k8s_discovery._resource_version = k8s_discovery._load_services_from_kubernetes()
+    k8s_discovery.services['meetings']['status'] = 'healthy'
+    
+    session.responses.append(FakeK8sResponse(events=[
+        {'type': 'MODIFIED', 'object': _k8s_service('meetings')},
+        {'type': 'MODIFIED', 'object': _k8s_service('auth', port=8080)},
+    ]))
+    k8s_discovery._watch_services()
+    
+    assert k8s_discovery._resource_version == '100'
+    assert session.requests[1]['resourceVersion'] == '100'
+    assert k8s_discovery.services['meetings']['status'] == 'healthy'
+    assert k8s_discovery.services['auth']['status'] == 'unknown'
+    assert k8s_discovery.services['auth']['url'].endswith(':8080')
+
+@pytest.mark.parametrize('expired', [
+    FakeK8sResponse(events=[{'type': 'ERROR', 'object': {'code': 410, 'message': 'too old'}}]),
+    FakeK8sResponse(status_code=410),
+])
+def test_kubernetes_watch_relists_after_expiry(k8s_discovery, expired):
+    """Test that an expired watch lists again, dropping services deleted in the gap."""
+    k8s_discovery.services = {
+        'meetings': {'name': 'meetings', 'url': _build_k8s_url('meetings'), 'status': 'healthy'},
+        'auth': {'name': 'auth', 'url': _build_k8s_url('auth'), 'status': 'healthy'},
+    }
+    k8s_discovery._resource_version = '100'
+    session = k8s_discovery.replay(expired, _list_response('200', 'meetings'))
+    
+    k8s_discovery._watch_services()
+    
+    assert list(k8s_discovery.services) == ['meetings']
+    assert k8s_discovery.services['meetings']['status'] == 'healthy'
+    assert [r.get('resourceVersion') for r in session.requests] == ['100', None, '200']
+
+def test_kubernetes_streamed_list_keeps_resource_version():
+    """Test that the incremental list parser yields items and the list resourceVersion."""
+    pytest.importorskip('ijson')
+    import io
+    from meeting_shared.discovery.kubernetes import _iter_list_items
+    body = {'metadata': {'resourceVersion': '42'}, 'items': [_k8s_service('a'), _k8s_service('b')]}
+    list_metadata = {}
+    
+    items = list(_iter_list_items(io.BytesIO(json.dumps(body).encode()), list_metadata))
+    
+    assert items == body['items']
+    assert list_metadata == {'resourceVersion': '42'}
+
+class FakeProvider:
+    """Provider whose services can be changed between lookups."""
+    
+    def __init__(self, services):
+        self.services = services
+    
+    def get_service(self, service_name, default=None):
+        return self.services.get(service_name, default)
+    
+    def register_service(self, name, url, metadata=None):
+        self.services[name] = {'name': name, 'url': url}
+
+@pytest.fixture
+def discovery_module(monkeypatch):
+    """The discovery module, with its provider and URL cache restored afterwards."""
+    import meeting_shared.discovery as module
+    monkeypatch.setattr(module, '_discovery_provider', None)
+    monkeypatch.setattr(module, '_provider_resolved', True)
+    monkeypatch.setattr(module, '_service_url_cache', {})
+    return module
+
+def test_get_service_url_cache_expires(discovery_module, monkeypatch):
+    """Test that cached service URLs are refreshed after the TTL."""
+    provider = FakeProvider({'auth': {'url': 'http://auth-1'}})
+    discovery_module.set_discovery_provider(provider)
+    clock = [100.0]
+    monkeypatch.setattr(discovery_module.time, 'monotonic', lambda: clock[0])
+    
+    assert discovery_module.get_service_url('auth') == 'http://auth-1'
+    provider.services['auth'] = {'url': 'http://auth-2'}
+    assert discovery_module.get_service_url('auth') == 'http://auth-1'
+    
+    clock[0] += discovery_module._SERVICE_URL_CACHE_TTL + 1
+    assert discovery_module.get_service_url('auth') == 'http://auth-2'
+
+def test_register_service_invalidates_cached_url(discovery_module):
+    """Test that re-registering a service replaces its cached URL."""
+    discovery_module.set_discovery_provider(FakeProvider({'auth': {'url': 'http://auth-1'}}))
+    
+    assert discovery_module.get_service_url('auth') == 'http://auth-1'
+    discovery_module.register_service('auth', 'http://auth-2')
+    assert discovery_module.get_service_url('auth') == 'http://auth-2'
+
+def test_get_service_url_reads_environment_lazily(discovery_module, monkeypatch):
+    """Test that the environment fallback sees variables set after import."""
+    assert discovery_module.get_service_url('billing', 'missing') == 'missing'
+    monkeypatch.setenv('BILLING_URL', 'http://billing')
+    assert discovery_module.get_service_url('billing') == 'http://billing'
@@ -0,0 +1,250 @@
+"""
+Unit tests for the shared middleware: request IDs, rate limiting and validation.
+"""
+
+import re
+import json
+import pytest
+from flask import Flask, jsonify, g
+from pydantic import BaseModel
+from meeting_shared.middleware import rate_limiter
+from meeting_shared.middleware.request_id import (
+    RequestIdMiddleware, _gen_id, get_request_id, get_correlation_id, with_request_id
+)
+from meeting_shared.middleware.validation import (
+    validate_schema, validate_nested_schema, validate_query_params
+)
+
+# Add pytest mark for test categories
+pytestmark = [pytest.mark.unit, pytest.mark.middleware]
+
+UUID_RE = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$')
+
+class Item(BaseModel):
+    name: str
+    quantity: int = 1
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.config['REDIS_URL'] = 'redis://localhost:6379/15'
+    return app
+
+class TestRequestId:
+    """Tests for the request ID middleware and helpers."""
+    
+    @pytest.fixture(autouse=True)
+    def clear_ids(self):
+        """Reset the context-local IDs so tests do not see each other's."""
+        yield
+        RequestIdMiddleware().cleanup_request()
+    
+    def test_gen_id_is_uuid_formatted(self):
+        """Test that generated IDs look like UUIDs and are unique."""
+        ids = {_gen_id() for _ in range(100)}
+        assert len(ids) == 100
+        assert all(UUID_RE.match(request_id) for request_id in ids)
+    
+    def test_ids_are_generated_and_returned(self, app):
+        """Test that a request without IDs gets one, echoed in the response headers."""
+        RequestIdMiddleware(app)
+        
+        @app.route('/ids')
+        def ids():
+            return jsonify(request_id=g.request_id, correlation_id=g.correlation_id)
+        
+        response = app.test_client().get('/ids')
+        body = response.get_json()
+        
+        assert UUID_RE.match(body['request_id'])
+        assert body['correlation_id'] == body['request_id']
+        assert response.headers['X-Request-ID'] == body['request_id']
+        assert response.headers['X-Correlation-ID'] == body['request_id']
+    
+    def test_incoming_ids_are_preserved(self, app):
+        """Test that IDs sent by the caller are propagated unchanged."""
+        RequestIdMiddleware(app)
+        
+        @app.route('/ids')
+        def ids():
+            return jsonify(request_id=get_request_id(), correlation_id=get_correlation_id())
+        
+        response = app.test_client().get('/ids', headers={
+            'X-Request-ID': 'req-1', 'X-Correlation-ID': 'corr-1'
+        })
+        
+        assert response.get_json() == {'request_id': 'req-1', 'correlation_id': 'corr-1'}
+        assert response.headers.getlist('X-Request-ID') == ['req-1']
+        assert response.headers.getlist('X-Correlation-ID') == ['corr-1']
+    
+    def test_custom_headers(self, app):
+        """Test that configured header names are used for reading and writing IDs."""
+        RequestIdMiddleware(app, request_id_header='X-Trace', correlation_id_header='X-Flow')
+        
+        @app.route('/ids')
+        def ids():
+            return jsonify(request_id=g.request_id)
+        
+        response = app.test_client().get('/ids', headers={'X-Trace': 'trace-1'})
+        
+        assert response.get_json() == {'request_id': 'trace-1'}
+        assert response.headers['X-Trace'] == 'trace-1'
+        assert response.headers['X-Flow'] == 'trace-1'
+    
+    def test_with_request_id_outside_requests(self):
+        """Test that with_request_id provides an ID to code running outside requests."""
+        assert get_request_id() is None
+        
+        @with_request_id
+        def job():
+            return get_request_id(), get_correlation_id()
+        
+        request_id, correlation_id = job()
+        assert UUID_RE.match(request_id)
+        assert correlation_id == request_id
+
+class FakeLimiter:
+    """Rate limiter that counts calls per key in memory."""
+    
+    def __init__(self):
+        self.counts = {}
+    
+    def is_rate_limited(self, key, limit, window):
+        count = self.counts[key] = self.counts.get(key, 0) + 1
+        return count > limit, max(0, limit - count)
+
+class TestRateLimit:
+    """Tests for the rate limiting decorator."""
+    
+    def test_limit_and_headers(self, app, monkeypatch):
+        """Test that requests over the limit get a 429 and others get rate limit headers."""
+        limiter = FakeLimiter()
+        monkeypatch.setattr(rate_limiter, '_get_limiter', lambda redis_url: limiter)
+        
+        @app.route('/limited')
+        @rate_limiter.rate_limit(limit=2, window=60)
+        def limited():
+            return jsonify(ok=True)
+        
+        client = app.test_client()
+        first = client.get('/limited')
+        second = client.get('/limited')
+        third = client.get('/limited')
+        
+        assert first.status_code == 200
+        assert first.headers['X-RateLimit-Limit'] == '2'
+        assert first.headers['X-RateLimit-Remaining'] == '1'
+        assert second.headers['X-RateLimit-Remaining'] == '0'
+        assert third.status_code == 429
+        assert third.get_json()['details'] == {'limit': 2, 'window': 60, 'retry_after': 60}
+        assert list(limiter.counts) == ['rate_limit:fw:limited:127.0.0.1']
+    
+    def test_key_func(self, app, monkeypatch):
+        """Test that key_func separates the counters."""
+        limiter = FakeLimiter()
+        monkeypatch.setattr(rate_limiter, '_get_limiter', lambda redis_url: limiter)
+        
+        @app.route('/limited')
+        @rate_limiter.rate_limit(limit=1, window=60, key_func=lambda request: request.args['user'])
+        def limited():
+            return jsonify(ok=True)
+        
+        client = app.test_client()
+        assert client.get('/limited?user=a').status_code == 200
+        assert client.get('/limited?user=b').status_code == 200
+        assert client.get('/limited?user=a').status_code == 429
+    
+    def test_limiters_share_connection_pool(self, app, monkeypatch):
+        """Test that limiters for the same Redis URL share one connection pool."""
+        monkeypatch.setattr(rate_limiter, '_POOLS', {})
+        with app.app_context():
+            first = rate_limiter.RateLimiter()
+            second = rate_limiter.RateLimiter()
+            other = rate_limiter.RateLimiter('redis://localhost:6379/14')
+        
+        assert first.redis.connection_pool is second.redis.connection_pool
+        assert other.redis.connection_pool is not first.redis.connection_pool
+    
+    def test_is_rate_limited_uses_counter_script(self, app, monkeypatch):
+        """Test that the fixed-window count decides the limit and remaining requests."""
+        with app.app_context():
+            limiter = rate_limiter.RateLimiter()
+        counts = iter([1, 3, 4])
+        monkeypatch.setattr(limiter, '_incr_window', lambda keys, args: next(counts))
+        
+        assert limiter.is_rate_limited('key', 3, 60) == (False, 2)
+        assert limiter.is_rate_limited('key', 3, 60) == (False, 0)
+        assert limiter.is_rate_limited('key', 3, 60) == (True, 0)
+
+class TestValidation:
+    """Tests for the request validation decorators."""
+    
+    def test_validate_schema(self, app):
+        """Test that valid JSON bodies reach the view as validated models."""
+        @app.route('/items', methods=['POST'])
+        @validate_schema(Item, transactional=False)
+        def create_item(data):
+            return jsonify(name=data.name, quantity=data.quantity)
+        
+        client = app.test_client()
+        response = client.post('/items', json={'name': 'chair', 'quantity': '3'})
+        
+        assert response.status_code == 200
+        assert response.get_json() == {'name': 'chair', 'quantity': 3}
+    
+    def test_validate_schema_errors(self, app):
+        """Test that invalid bodies get a 400 with the validation errors."""
+        @app.route('/items', methods=['POST'])
+        @validate_schema(Item, transactional=False)
+        def create_item(data):
+            return jsonify(ok=True)
+        
+        client = app.test_client()
+        invalid = client.post('/items', json={'quantity': 'many'})
+        malformed = client.post('/items', data='{not json', content_type='application/json')
+        
+        assert invalid.status_code == 400
+        assert invalid.get_json()['message'] == 'Invalid request data'
+        assert {error['loc'][0] for error in invalid.get_json()['details']['errors']} == {'name', 'quantity'}
+        assert malformed.status_code == 400
+        assert json.loads(malformed.data)['message'] == 'Error processing request data'
+    
+    def test_validate_schema_bulk(self, app):
+        """Test that lists are validated item by item when allow_bulk is set."""
+        @app.route('/items', methods=['POST'])
+        @validate_schema(Item, allow_bulk=True, transactional=False)
+        def create_items(data):
+            return jsonify(names=[item.name for item in data])
+        
+        response = app.test_client().post('/items', json=[{'name': 'a'}, {'name': 'b'}])
+        
+        assert response.get_json() == {'names': ['a', 'b']}
+    
+    def test_validate_nested_schema(self, app):
+        """Test that nested data is validated and passed under the flattened path."""
+        @app.route('/orders', methods=['POST'])
+        @validate_nested_schema(Item, 'order.item', transactional=False)
+        def create_order(order_item):
+            return jsonify(name=order_item.name)
+        
+        client = app.test_client()
+        valid = client.post('/orders', json={'order': {'item': {'name': 'desk'}}})
+        invalid = client.post('/orders', json={'order': {}})
+        
+        assert valid.get_json() == {'name': 'desk'}
+        assert invalid.status_code == 400
+        assert invalid.get_json()['message'] == 'Invalid data in order.item'
+    
+    def test_validate_query_params(self, app):
+        """Test that missing query parameters are reported in declaration order."""
+        @app.route('/search')
+        @validate_query_params('q', 'page', 'size')
+        def search():
+            return jsonify(ok=True)
+        
+        client = app.test_client()
+        assert client.get('/search?q=x&page=1&size=10').status_code == 200
+        
+        response = client.get('/search?page=1')
+        assert response.status_code == 400
+        assert response.get_json()['details'] == {'missing_params': ['q', 'size']}
@@ -6,8 +6,11 @@ import os
 import json
 import pytest
 import requests
+from requests.adapters import HTTPAdapter
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
 import jwt
 
 # Test configuration
@@ -24,6 +27,24 @@ DEFAULT_CONFIG = {
     'TIMEOUT': 10  # seconds
 }
 
+# Signing key and lifetime for locally generated test tokens
+_JWT_KEY = DEFAULT_CONFIG['JWT_SECRET_KEY'].encode()
+_TOKEN_LIFETIME = int(timedelta(hours=1).total_seconds())
+
+# Login responses for test users, reused across test classes in a session
+_LOGIN_CACHE_TTL = 300  # seconds
+_login_cache = {}
+
+# Shared HTTP session so tests reuse keep-alive connections to the services
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=0)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+
+def close_session():
+    """Close pooled connections held by the shared HTTP session"""
+    _SESSION.close()
+
 class IntegrationTestBase:
     """
     Base class for all integration tests providing common functionality
@@ -39,6 +60,9 @@ class IntegrationTestBase:
         cls.service_key = cls.config['SERVICE_KEY']
         cls.timeout = cls.config['TIMEOUT']
         
+        # Pooled keep-alive session shared by all integration tests
+        cls.session = _SESSION
+        
         # Ensure services are available
         cls._wait_for_services()
         
@@ -47,28 +71,44 @@ class IntegrationTestBase:
     
     @classmethod
     def _wait_for_services(cls):
-        """Wait for all services to be available"""
+        """Wait for all services to be available, checking them concurrently"""
         services = [
             ('auth', f"{cls.auth_url}/health"),
             ('backend', f"{cls.api_url}/health"),
         ]
         
-        for name, url in services:
-            start_time = time.time()
-            while time.time() - start_time < cls.timeout:
-                try:
-                    response = requests.get(url, timeout=5)
-                    if response.status_code == 200:
-                        print(f"Service {name} is available")
-                        break
-                except requests.RequestException:
-                    pass
-                
-                print(f"Waiting for {name} service to be available...")
-                time.sleep(1)
-            else:
+        deadline = time.monotonic() + cls.timeout
+        with ThreadPoolExecutor(max_workers=len(services)) as executor:
+            futures = {
+                name: executor.submit(cls._poll_until_healthy, name, url, deadline)
+                for name, url in services
+            }
+        
+        for name, future in futures.items():
+            if not future.result():
                 pytest.fail(f"Service {name} not available after {cls.timeout} seconds")
     
+    @staticmethod
+    def _poll_until_healthy(name, url, deadline):
+        """Poll a health endpoint with exponential backoff until it succeeds or the deadline passes"""
+        backoff = 0.05
+        while True:
+            try:
+                response = _SESSION.get(url, timeout=5)
+                if response.status_code == 200:
+                    print(f"Service {name} is available")
+                    return True
+            except requests.RequestException:
+                pass
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            
+            print(f"Waiting for {name} service to be available...")
+            time.sleep(min(backoff, remaining))
+            backoff = min(backoff * 2, 0.5)
+    
     @classmethod
     def _ensure_test_users(cls):
         """Create test users if they don't exist"""
@@ -89,10 +129,16 @@ class IntegrationTestBase:
     @classmethod
     def _create_or_get_user(cls, email, password, roles=None):
         """Create a user or get existing user"""
-        # Check if user exists
+        # Reuse a recent login for this user
+        cached = _login_cache.get(email)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        
+        # Check if user exists (the auth service has no lookup endpoint,
+        # so a login doubles as the existence probe)
         login_response = cls.login(email, password)
         if login_response.status_code == 200:
-            return login_response.json()
+            return cls._cache_login(email, login_response.json())
         
         # User doesn't exist, create it
         url = f"{cls.auth_url}/api/auth/register"
@@ -103,7 +149,7 @@ class IntegrationTestBase:
         }
         
         # Create user
-        response = requests.post(url, json=data, timeout=cls.timeout)
+        response = _SESSION.post(url, json=data, timeout=cls.timeout)
         if response.status_code != 201:
             pytest.fail(f"Failed to create test user: {response.text}")
         
@@ -112,7 +158,13 @@ class IntegrationTestBase:
             cls._update_user_roles(email, roles)
         
         # Login to get tokens
-        return cls.login(email, password).json()
+        return cls._cache_login(email, cls.login(email, password).json())
+    
+    @staticmethod
+    def _cache_login(email, data):
+        """Remember a user's login response for reuse"""
+        _login_cache[email] = (data, time.monotonic() + _LOGIN_CACHE_TTL)
+        return data
     
     @classmethod
     def _update_user_roles(cls, email, roles):
@@ -121,7 +173,7 @@ class IntegrationTestBase:
         headers = {'X-Service-Key': cls.service_key}
         data = {'email': email, 'roles': roles}
         
-        response = requests.put(url, headers=headers, json=data, timeout=cls.timeout)
+        response = _SESSION.put(url, headers=headers, json=data, timeout=cls.timeout)
         if response.status_code != 200:
             pytest.fail(f"Failed to update user roles: {response.text}")
     
@@ -131,7 +183,7 @@ class IntegrationTestBase:
         url = f"{DEFAULT_CONFIG['AUTH_SERVICE_URL']}/api/auth/login"
         data = {'email': email, 'password': password}
         
-        return requests.post(url, json=data, timeout=DEFAULT_CONFIG['TIMEOUT'])
+        return _SESSION.post(url, json=data, timeout=DEFAULT_CONFIG['TIMEOUT'])
     
     @staticmethod
     def get_headers(access_token):
@@ -153,15 +205,18 @@ class IntegrationTestBase:
     def generate_test_token(user_id, email, roles=None):
         """Generate a test JWT token for a user"""
         roles = roles or ['user']
+        now = int(time.time())
         payload = {
             'sub': str(user_id),
             'email': email,
             'roles': roles,
-            'iat': datetime.utcnow(),
-            'exp': datetime.utcnow() + timedelta(hours=1)
+            'iat': now,
+            'exp': now + _TOKEN_LIFETIME
         }
-        return jwt.encode(
-            payload, 
-            DEFAULT_CONFIG['JWT_SECRET_KEY'], 
-            algorithm='HS256'
-        ) 
\ No newline at end of file
+        return jwt.encode(payload, _JWT_KEY, algorithm='HS256') 
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def decode_jwt(token):
+        """Decode a JWT without verifying its signature, caching by token"""
+        return jwt.decode(token, options={"verify_signature": False})
@@ -0,0 +1,29 @@
+"""
+Test configuration for the cross-service integration tests.
+
+The tests are network-bound and can run in parallel with pytest-xdist:
+
+    pytest -n auto --dist=loadfile backend/tests/integration
+
+Each test file's tests stay on a single worker so per-class login state
+is shared as before.
+"""
+
+import pytest
+from .base import close_session
+
+
+@pytest.fixture(scope="session", autouse=True)
+def shared_http_session():
+    """Close the pooled connections of the shared HTTP session after the run"""
+    yield
+    close_session()
+
+
+def pytest_collection_modifyitems(config, items):
+    """Group tests by file so --dist=loadgroup behaves like --dist=loadfile"""
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    
+    for item in items:
+        item.add_marker(pytest.mark.xdist_group(item.module.__name__))
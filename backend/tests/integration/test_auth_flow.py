@@ -2,33 +2,42 @@
 Integration tests for authentication flow between services
 """
 
+import os
 import pytest
-import requests
 import time
-import jwt
 from .base import IntegrationTestBase
 
 class TestAuthFlow(IntegrationTestBase):
     """Test the entire authentication flow across services"""
     
+    @classmethod
+    def setup_class(cls):
+        """Build the endpoint URLs used by the tests once"""
+        super().setup_class()
+        cls.REGISTER_URL = f"{cls.auth_url}/api/auth/register"
+        cls.LOGIN_URL = f"{cls.auth_url}/api/auth/login"
+        cls.REFRESH_URL = f"{cls.auth_url}/api/auth/refresh"
+        cls.ROLES_URL = f"{cls.auth_url}/api/internal/users/roles"
+        cls.MEETINGS_URL = f"{cls.api_url}/api/meetings"
+        cls.ADMIN_STATS_URL = f"{cls.api_url}/api/meetings/admin/stats"
+    
     def test_register_login_access_api(self):
         """Test full user lifecycle: registration, login, and API access"""
-        # Generate unique test user
-        timestamp = int(time.time())
+        # Generate unique test user (the pid keeps parallel workers apart)
+        timestamp = f"{int(time.time())}_{os.getpid()}"
         email = f"test_user_{timestamp}@example.com"
         password = "Test123!"
         name = f"Test User {timestamp}"
         
         # 1. Register a new user
-        register_url = f"{self.auth_url}/api/auth/register"
         register_data = {
             'email': email,
             'password': password,
             'name': name
         }
         
-        register_response = requests.post(
-            register_url, 
+        register_response = self.session.post(
+            self.REGISTER_URL, 
             json=register_data,
             timeout=self.timeout
         )
@@ -39,14 +48,13 @@ class TestAuthFlow(IntegrationTestBase):
         assert 'id' in user_data
         
         # 2. Login with the new user
-        login_url = f"{self.auth_url}/api/auth/login"
         login_data = {
             'email': email,
             'password': password
         }
         
-        login_response = requests.post(
-            login_url,
+        login_response = self.session.post(
+            self.LOGIN_URL,
             json=login_data,
             timeout=self.timeout
         )
@@ -59,22 +67,18 @@ class TestAuthFlow(IntegrationTestBase):
         access_token = tokens['access_token']
         
         # Verify token is valid JWT with expected claims
-        decoded = jwt.decode(
-            access_token, 
-            options={"verify_signature": False}
-        )
+        decoded = self.decode_jwt(access_token)
         assert decoded['email'] == email
         assert 'sub' in decoded
         assert 'roles' in decoded
         assert 'user' in decoded['roles']
         
         # 3. Access an API endpoint that requires authentication
-        meetings_url = f"{self.api_url}/api/meetings"
         headers = self.get_headers(access_token)
         
         # Attempt to access meetings endpoint (which requires auth)
-        meetings_response = requests.get(
-            meetings_url,
+        meetings_response = self.session.get(
+            self.MEETINGS_URL,
             headers=headers,
             timeout=self.timeout
         )
@@ -85,8 +89,8 @@ class TestAuthFlow(IntegrationTestBase):
         
         # 4. Test accessing API with invalid token
         invalid_headers = self.get_headers("invalid.token.here")
-        invalid_response = requests.get(
-            meetings_url,
+        invalid_response = self.session.get(
+            self.MEETINGS_URL,
             headers=invalid_headers,
             timeout=self.timeout
         )
@@ -97,21 +101,21 @@ class TestAuthFlow(IntegrationTestBase):
     def test_service_to_service_communication(self):
         """Test service-to-service communication using service keys"""
         # 1. Generate unique test user through normal registration
-        timestamp = int(time.time())
+        #    (the pid keeps parallel workers apart)
+        timestamp = f"{int(time.time())}_{os.getpid()}"
         email = f"test_service_{timestamp}@example.com"
         password = "Test123!"
         name = f"Service Test {timestamp}"
         
         # Register user
-        register_url = f"{self.auth_url}/api/auth/register"
         register_data = {
             'email': email,
             'password': password,
             'name': name
         }
         
-        register_response = requests.post(
-            register_url, 
+        register_response = self.session.post(
+            self.REGISTER_URL, 
             json=register_data,
             timeout=self.timeout
         )
@@ -120,15 +124,14 @@ class TestAuthFlow(IntegrationTestBase):
         user_id = register_response.json()['id']
         
         # 2. Use service-to-service endpoint to modify user (requires service key)
-        roles_url = f"{self.auth_url}/api/internal/users/roles"
         roles_data = {
             'email': email,
             'roles': ['user', 'admin']  # Add admin role
         }
         
         # First try without service key (should fail)
-        no_key_response = requests.put(
-            roles_url,
+        no_key_response = self.session.put(
+            self.ROLES_URL,
             json=roles_data,
             timeout=self.timeout
         )
@@ -137,8 +140,8 @@ class TestAuthFlow(IntegrationTestBase):
         
         # Now try with service key (should succeed)
         service_headers = self.get_service_headers()
-        service_response = requests.put(
-            roles_url,
+        service_response = self.session.put(
+            self.ROLES_URL,
             headers=service_headers,
             json=roles_data,
             timeout=self.timeout
@@ -150,21 +153,17 @@ class TestAuthFlow(IntegrationTestBase):
         login_response = self.login(email, password)
         access_token = login_response.json()['access_token']
         
-        decoded = jwt.decode(
-            access_token, 
-            options={"verify_signature": False}
-        )
+        decoded = self.decode_jwt(access_token)
         
         assert 'admin' in decoded['roles']
         
         # 4. Test accessing admin-only endpoint with the new admin user
         # This assumes there's an admin-only endpoint in your API
         # Replace with an actual admin endpoint in your system
-        admin_url = f"{self.api_url}/api/meetings/admin/stats"
         admin_headers = self.get_headers(access_token)
         
-        admin_response = requests.get(
-            admin_url,
+        admin_response = self.session.get(
+            self.ADMIN_STATS_URL,
             headers=admin_headers,
             timeout=self.timeout
         )
@@ -191,13 +190,12 @@ class TestAuthFlow(IntegrationTestBase):
         refresh_token = tokens['refresh_token']
         
         # 2. Use refresh token to get new access token
-        refresh_url = f"{self.auth_url}/api/auth/refresh"
         refresh_data = {
             'refresh_token': refresh_token
         }
         
-        refresh_response = requests.post(
-            refresh_url,
+        refresh_response = self.session.post(
+            self.REFRESH_URL,
             json=refresh_data,
             timeout=self.timeout
         )
@@ -208,11 +206,10 @@ class TestAuthFlow(IntegrationTestBase):
         
         # 3. Verify new access token works
         new_access_token = new_tokens['access_token']
-        meetings_url = f"{self.api_url}/api/meetings"
         headers = self.get_headers(new_access_token)
         
-        meetings_response = requests.get(
-            meetings_url,
+        meetings_response = self.session.get(
+            self.MEETINGS_URL,
             headers=headers,
             timeout=self.timeout
         )
@@ -92,6 +92,7 @@ class TestingConfig(BaseConfig):
     
     # Use in-memory database for testing
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    AUTO_CREATE_TABLES = True
     
     # Disable CSRF protection for testing
     WTF_CSRF_ENABLED = False
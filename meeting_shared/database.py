@@ -1,5 +1,5 @@
+import os
 from contextlib import contextmanager
-from sqlalchemy.exc import SQLAlchemyError
 from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
@@ -18,19 +18,45 @@ def transaction():
     try:
         yield
         db.session.commit()
-    except SQLAlchemyError as e:
+    except BaseException:
         db.session.rollback()
-        raise e
-    except Exception as e:
-        db.session.rollback()
-        raise e
+        raise
 
 # Alias for backward compatibility
 transaction_context = transaction
 
+# Connection pool tuning for server databases; explicit app config wins
+_ENGINE_OPTIONS = {
+    'pool_recycle': 1800,
+    'pool_pre_ping': False,
+    'pool_use_lifo': True,
+}
+
+# Each worker process holds up to pool_size + max_overflow connections, so the
+# defaults stay small; raise them with DB_POOL_SIZE / DB_MAX_OVERFLOW (app
+# config or environment) once the database's max_connections allows it
+_DEFAULT_POOL_SIZE = 5
+_DEFAULT_MAX_OVERFLOW = 5
+
+def _pool_setting(app, name, default):
+    """Read an integer pool setting from the app config, then the environment"""
+    value = app.config.get(name)
+    if value is None:
+        value = os.environ.get(name, default)
+    return int(value)
+
 def init_db(app):
     """Initialize the database with the app"""
+    # SQLite uses its own pool classes, which reject QueuePool sizing options
+    if not (app.config.get('SQLALCHEMY_DATABASE_URI') or '').startswith('sqlite'):
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', dict(
+            _ENGINE_OPTIONS,
+            pool_size=_pool_setting(app, 'DB_POOL_SIZE', _DEFAULT_POOL_SIZE),
+            max_overflow=_pool_setting(app, 'DB_MAX_OVERFLOW', _DEFAULT_MAX_OVERFLOW),
+        ))
     db.init_app(app)
     
-    with app.app_context():
-        db.create_all() 
\ No newline at end of file
+    # Migrated (production) schemas don't need the per-table existence checks
+    if app.config.get('AUTO_CREATE_TABLES', app.debug):
+        with app.app_context():
+            db.create_all() 
\ No newline at end of file
@@ -4,8 +4,9 @@ Provides abstractions for discovering and registering services.
 """
 
 import os
+import time
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +17,12 @@ try:
 except ImportError:
     HAS_STATIC = False
 
+try:
+    from .static_async import StaticServiceDiscoveryAsync
+    HAS_STATIC_ASYNC = True
+except ImportError:
+    HAS_STATIC_ASYNC = False
+
 try:
     from .kubernetes import KubernetesServiceDiscovery
     HAS_K8S = True
@@ -24,6 +31,13 @@ except ImportError:
 
 # Global discovery provider instance
 _discovery_provider = None
+_provider_resolved = False
+
+# Seconds a resolved service URL is reused before asking the provider again
+_SERVICE_URL_CACHE_TTL = float(os.environ.get('SERVICE_URL_CACHE_TTL', '30'))
+
+# Service URLs resolved by the current provider, with their expiry times
+_service_url_cache: Dict[str, Tuple[str, float]] = {}
 
 def get_discovery_provider(provider_type=None):
     """
@@ -31,7 +45,7 @@ def get_discovery_provider(provider_type=None):
     
     Args:
         provider_type: The type of provider to use.
-            Options: 'static', 'kubernetes'
+            Options: 'static', 'static-async', 'kubernetes'
             If None, will try to determine from environment variables.
             
     Returns:
@@ -43,12 +57,29 @@ def get_discovery_provider(provider_type=None):
     
     if provider_type == 'static' and HAS_STATIC:
         return StaticServiceDiscovery()
+    elif provider_type == 'static-async' and HAS_STATIC_ASYNC:
+        return StaticServiceDiscoveryAsync()
     elif provider_type == 'kubernetes' and HAS_K8S:
         return KubernetesServiceDiscovery()
     else:
         logger.warning(f"Unsupported or unavailable service discovery provider: {provider_type}")
         return None
 
+def _get_provider():
+    """
+    Get the active discovery provider, resolving it on first use only.
+    
+    Returns:
+        The provider instance, or None if no provider is available.
+    """
+    global _discovery_provider, _provider_resolved
+    
+    if not _provider_resolved:
+        if _discovery_provider is None:
+            _discovery_provider = get_discovery_provider()
+        _provider_resolved = True
+    return _discovery_provider
+
 def get_service_url(service_name, default=None):
     """
     Get the URL for a service by name.
@@ -60,19 +91,26 @@ def get_service_url(service_name, default=None):
     Returns:
         Service URL or default if not found
     """
-    global _discovery_provider
+    now = time.monotonic()
+    cached = _service_url_cache.get(service_name)
+    if cached is not None and cached[1] > now:
+        return cached[0]
     
-    if _discovery_provider is None:
-        _discovery_provider = get_discovery_provider()
-        
-    if _discovery_provider is None:
+    provider = _get_provider()
+    if provider is None:
         # Fallback to environment variables
         env_var = f"{service_name.upper()}_URL"
         return os.environ.get(env_var, default)
         
-    service = _discovery_provider.get_service(service_name)
+    service = provider.get_service(service_name)
     if service:
-        return service.get('url', default)
+        url = service.get('url')
+        if url is None:
+            return default
+        # Only hits are cached so services registered later are still found,
+        # and they expire so moved or removed services are picked up
+        _service_url_cache[service_name] = (url, now + _SERVICE_URL_CACHE_TTL)
+        return url
     return default
 
 def get_service(service_name, default=None):
@@ -86,12 +124,10 @@ def get_service(service_name, default=None):
     Returns:
         Dictionary with service details, or default if not found
     """
-    global _discovery_provider
-    
-    if _discovery_provider is None:
-        _discovery_provider = get_discovery_provider()
-        
-    return _discovery_provider.get_service(service_name, default)
+    provider = _get_provider()
+    if provider is None:
+        return default
+    return provider.get_service(service_name, default)
 
 def get_services():
     """
@@ -100,12 +136,10 @@ def get_services():
     Returns:
         Dictionary of service name to service details
     """
-    global _discovery_provider
-    
-    if _discovery_provider is None:
-        _discovery_provider = get_discovery_provider()
-        
-    return _discovery_provider.get_services()
+    provider = _get_provider()
+    if provider is None:
+        return {}
+    return provider.get_services()
 
 def register_service(name: str, url: str, metadata: Optional[Dict[str, Any]] = None):
     """
@@ -116,13 +150,10 @@ def register_service(name: str, url: str, metadata: Optional[Dict[str, Any]] = N
         url: Service URL
         metadata: Optional service metadata
     """
-    global _discovery_provider
-    
-    if _discovery_provider is None:
-        _discovery_provider = get_discovery_provider()
-        
-    if _discovery_provider:
-        _discovery_provider.register_service(name, url, metadata)
+    provider = _get_provider()
+    if provider:
+        provider.register_service(name, url, metadata)
+        _service_url_cache.pop(name, None)
     else:
         logger.warning(f"No service discovery provider available, cannot register service: {name}")
 
@@ -133,8 +164,10 @@ def set_discovery_provider(provider):
     Args:
         provider: An instance of a ServiceDiscovery class
     """
-    global _discovery_provider
+    global _discovery_provider, _provider_resolved
     _discovery_provider = provider
+    _provider_resolved = True
+    _service_url_cache.clear()
     logger.info(f"Service discovery provider explicitly set to {provider.__class__.__name__}")
 
 # Export public interface
@@ -6,12 +6,51 @@ Uses the Kubernetes API for service discovery.
 import os
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, List
 import time
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=256)
+def _build_service_url(service_name: str, namespace: str, port: int) -> str:
+    """Build the in-cluster URL for a service."""
+    return f"http://{service_name}.{namespace}.svc.cluster.local:{port}"
+
+def _iter_list_items(stream, list_metadata: Dict[str, Any]):
+    """
+    Incrementally parse a Kubernetes list response.
+    
+    Args:
+        stream: File-like object with the response body
+        list_metadata: Dictionary that receives the list's resourceVersion
+        
+    Yields:
+        Each object in the list's items
+    """
+    builder = None
+    for prefix, event, value in ijson.parse(stream):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == 'items.item' and event == 'end_map':
+                yield builder.value
+                builder = None
+        elif prefix == 'items.item' and event == 'start_map':
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == 'metadata.resourceVersion':
+            list_metadata['resourceVersion'] = value
+
 class KubernetesServiceDiscovery:
     """
     Kubernetes service discovery provider.
@@ -22,74 +61,262 @@ class KubernetesServiceDiscovery:
         """Initialize Kubernetes service discovery."""
         self.services = {}
         self.namespace = os.environ.get('KUBERNETES_NAMESPACE', 'default')
+        self.label_selector = os.environ.get('K8S_SERVICE_LABEL_SELECTOR')
         self.health_check_interval = int(os.environ.get('SERVICE_HEALTH_CHECK_INTERVAL', '60'))
         self.health_check_timeout = int(os.environ.get('SERVICE_HEALTH_CHECK_TIMEOUT', '5'))
-        self.last_health_check = {}
+        self._stopped = threading.Event()
+        self._health_lock = threading.Lock()
+        
+        # Pooled session shared by Kubernetes API calls and health checks
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=32)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
         
         # Kubernetes API details
         self.api_host = os.environ.get('KUBERNETES_SERVICE_HOST')
         self.api_port = os.environ.get('KUBERNETES_SERVICE_PORT')
         self.token_path = '/var/run/secrets/kubernetes.io/serviceaccount/token'
         self.ca_cert_path = '/var/run/secrets/kubernetes.io/serviceaccount/ca.crt'
+        self._token = None
+        self._token_mtime = None
+        self._resource_version = None
         
         # Check if we're running in Kubernetes
         if not self.api_host or not self.api_port:
             logger.warning("Not running in Kubernetes, or Kubernetes API environment variables not set")
             return
         
-        # Load services from Kubernetes API
-        self._load_services_from_kubernetes()
+        # Load services from Kubernetes API; the watch continues from this list
+        self._resource_version = self._load_services_from_kubernetes()
+        
+        # Keep the service list and service health up to date in the background
+        self._start_background_thread(self._watch_services, 'kubernetes-service-watch')
+        self._start_background_thread(self._health_check_loop, 'kubernetes-service-health')
         
         logger.info(f"Initialized Kubernetes service discovery with {len(self.services)} services")
     
-    def _load_services_from_kubernetes(self):
-        """Load services from Kubernetes API."""
-        try:
-            # Read the service account token
+    def _start_background_thread(self, target, name):
+        """Start a daemon thread running one of the refresh loops."""
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+    
+    def _health_check_loop(self):
+        """Check every service's health once per health check interval."""
+        while True:
+            self._check_all_services_health()
+            if self._stopped.wait(self.health_check_interval):
+                break
+    
+    def _check_all_services_health(self):
+        """Check the health of all registered services concurrently."""
+        services = list(self.services.items())
+        if not services:
+            return
+        
+        # Capped at the connection pool size to avoid exhausting sockets
+        with ThreadPoolExecutor(max_workers=min(32, len(services))) as executor:
+            futures = {
+                executor.submit(self._check_service_health, service_name, service): service_name
+                for service_name, service in services
+            }
+            for future in as_completed(futures):
+                error = future.exception()
+                if error is not None:
+                    logger.error(f"Health check crashed for service {futures[future]}: {str(error)}")
+    
+    def close(self):
+        """Stop the background refresh threads and release pooled connections."""
+        self._stopped.set()
+        self._session.close()
+    
+    def _get_token(self) -> str:
+        """
+        Get the service account token, re-reading it only when the file changes.
+        
+        Returns:
+            The service account token
+        """
+        mtime = os.stat(self.token_path).st_mtime
+        if mtime != self._token_mtime:
             with open(self.token_path, 'r') as f:
-                token = f.read().strip()
+                self._token = f.read().strip()
+            self._token_mtime = mtime
+        return self._token
+    
+    def _services_api_url(self) -> str:
+        """Build the Kubernetes API URL for services in this namespace."""
+        return f"https://{self.api_host}:{self.api_port}/api/v1/namespaces/{self.namespace}/services"
+    
+    def _service_from_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Build service details from a Kubernetes Service object.
+        
+        The health status of an already registered service with the same URL
+        is kept, so updates to a service do not reset it to 'unknown'.
+        
+        Args:
+            item: Service object returned by the Kubernetes API
+            
+        Returns:
+            Service details, or None if the object has no name or ports
+        """
+        service_name = item.get('metadata', {}).get('name')
+        if not service_name:
+            return None
+        
+        # Get service ports
+        ports = item.get('spec', {}).get('ports', [])
+        if not ports:
+            return None
+        
+        # Use the first port for the service URL
+        port = ports[0].get('port')
+        
+        # Build the service URL
+        service_url = _build_service_url(service_name, self.namespace, port)
+        service = self._build_service(service_name, service_url)
+        
+        previous = self.services.get(service_name)
+        if previous and previous['url'] == service_url:
+            with self._health_lock:
+                service['status'] = previous['status']
+                if 'last_health_check' in previous:
+                    service['last_health_check'] = previous['last_health_check']
+        return service
+    
+    def _register_service_item(self, item: Dict[str, Any]) -> None:
+        """
+        Register a service from a Kubernetes Service object.
+        
+        Args:
+            item: Service object returned by the Kubernetes API
+        """
+        service = self._service_from_item(item)
+        if service:
+            self.services[service['name']] = service
+            logger.info(f"Registered service: {service['name']} at {service['url']}")
+    
+    def _watch_services(self):
+        """
+        Keep the registered services current using the Kubernetes watch API.
+        
+        A single streaming connection delivers ADDED/MODIFIED/DELETED events,
+        so only changes are transferred. The watch starts from the resource
+        version of the last full list and resumes from the last seen version
+        when the server closes the stream. If that version has expired, the
+        services are listed again, so no deletions are missed.
+        """
+        resource_version = self._resource_version
+        while not self._stopped.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._load_services_from_kubernetes()
+                    if resource_version is None:
+                        self._stopped.wait(self.health_check_interval)
+                        continue
+                
+                params = {'watch': '1', 'timeoutSeconds': '300'}
+                if self.label_selector:
+                    params['labelSelector'] = self.label_selector
+                params['resourceVersion'] = resource_version
+                
+                with self._session.get(
+                    self._services_api_url(),
+                    params=params,
+                    headers={'Authorization': f'Bearer {self._get_token()}'},
+                    verify=self.ca_cert_path,
+                    timeout=(10, None),
+                    stream=True
+                ) as response:
+                    if response.status_code == 410:
+                        # Resource version expired; list again before watching
+                        resource_version = None
+                        continue
+                    if response.status_code != 200:
+                        logger.error(f"Failed to watch services in Kubernetes API: {response.status_code}")
+                        self._stopped.wait(self.health_check_interval)
+                        continue
+                    
+                    for line in response.iter_lines():
+                        if self._stopped.is_set():
+                            return
+                        if not line:
+                            continue
+                        
+                        event = json.loads(line)
+                        event_type = event.get('type')
+                        item = event.get('object', {})
+                        
+                        if event_type == 'ERROR':
+                            # Most likely an expired resource version; list again
+                            logger.warning(f"Kubernetes service watch error: {item.get('message')}")
+                            resource_version = None
+                            break
+                        
+                        resource_version = item.get('metadata', {}).get('resourceVersion', resource_version)
+                        if event_type in ('ADDED', 'MODIFIED'):
+                            self._register_service_item(item)
+                        elif event_type == 'DELETED':
+                            service_name = item.get('metadata', {}).get('name')
+                            self.services.pop(service_name, None)
+                            logger.info(f"Removed service: {service_name}")
+            except Exception as e:
+                logger.error(f"Error watching services in Kubernetes: {str(e)}")
+                self._stopped.wait(self.health_check_interval)
+    
+    def _load_services_from_kubernetes(self) -> Optional[str]:
+        """
+        Load services from Kubernetes API, replacing the registered services.
+        
+        Returns:
+            The resource version of the list to start watching from, or None
+            if the services could not be loaded
+        """
+        try:
+            token = self._get_token()
             
             # Build the API URL
-            api_url = f"https://{self.api_host}:{self.api_port}/api/v1/namespaces/{self.namespace}/services"
+            api_url = self._services_api_url()
             
-            # Make the API request
+            # Make the API request, streaming the body when it can be parsed incrementally
             headers = {'Authorization': f'Bearer {token}'}
-            response = requests.get(
+            params = {'labelSelector': self.label_selector} if self.label_selector else None
+            with self._session.get(
                 api_url,
+                params=params,
                 headers=headers,
                 verify=self.ca_cert_path,
-                timeout=10
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to get services from Kubernetes API: {response.status_code} {response.text}")
-                return
-            
-            # Parse the response
-            services_data = response.json()
-            
-            # Register each service
-            for item in services_data.get('items', []):
-                service_name = item.get('metadata', {}).get('name')
-                if not service_name:
-                    continue
-                
-                # Get service ports
-                ports = item.get('spec', {}).get('ports', [])
-                if not ports:
-                    continue
-                
-                # Use the first port for the service URL
-                port = ports[0].get('port')
+                timeout=10,
+                stream=HAS_IJSON
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to get services from Kubernetes API: {response.status_code} {response.text}")
+                    return None
                 
-                # Build the service URL
-                service_url = f"http://{service_name}.{self.namespace}.svc.cluster.local:{port}"
+                # Parse the response
+                list_metadata = {}
+                if HAS_IJSON:
+                    response.raw.decode_content = True
+                    items = _iter_list_items(response.raw, list_metadata)
+                else:
+                    body = response.json()
+                    list_metadata = body.get('metadata', {})
+                    items = body.get('items', [])
                 
-                # Register the service
-                self.register_service(service_name, service_url)
+                # Build the new service map, then swap it in so deleted services disappear
+                services = {}
+                for item in items:
+                    service = self._service_from_item(item)
+                    if service:
+                        services[service['name']] = service
+                self.services = services
                 
+            logger.info(f"Loaded {len(services)} services from Kubernetes")
+            return list_metadata.get('resourceVersion')
         except Exception as e:
             logger.error(f"Error loading services from Kubernetes: {str(e)}")
+            return None
     
     def get_service(self, service_name: str, default: Any = None) -> Optional[Dict[str, Any]]:
         """
@@ -102,18 +329,11 @@ class KubernetesServiceDiscovery:
         Returns:
             Service details or default if not found
         """
+        # Health is refreshed in the background, so lookups never block on it
         service = self.services.get(service_name)
         if not service:
             return default
         
-        # Check if we need to perform a health check
-        current_time = time.time()
-        last_check = self.last_health_check.get(service_name, 0)
-        
-        if current_time - last_check > self.health_check_interval:
-            self._check_service_health(service_name, service)
-            self.last_health_check[service_name] = current_time
-        
         return service
     
     def get_services(self) -> Dict[str, Dict[str, Any]]:
@@ -134,6 +354,22 @@ class KubernetesServiceDiscovery:
             url: Service URL
             metadata: Optional service metadata
         """
+        self.services[name] = self._build_service(name, url, metadata)
+        
+        logger.info(f"Registered service: {name} at {url}")
+    
+    def _build_service(self, name: str, url: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Build the details of a service whose health is not yet known.
+        
+        Args:
+            name: Service name
+            url: Service URL
+            metadata: Optional service metadata
+            
+        Returns:
+            Service details
+        """
         if not metadata:
             metadata = {}
         
@@ -146,14 +382,13 @@ class KubernetesServiceDiscovery:
                 health_url = f"{url}/health"
             metadata['health_check_url'] = health_url
         
-        self.services[name] = {
+        return {
             'name': name,
             'url': url,
             'metadata': metadata,
+            'health_check_url': metadata['health_check_url'],
             'status': 'unknown'
         }
-        
-        logger.info(f"Registered service: {name} at {url}")
     
     def _check_service_health(self, service_name: str, service: Dict[str, Any]) -> None:
         """
@@ -163,34 +398,39 @@ class KubernetesServiceDiscovery:
             service_name: Service name
             service: Service details
         """
-        health_url = service.get('metadata', {}).get('health_check_url')
+        health_url = service.get('health_check_url')
         if not health_url:
             logger.warning(f"No health check URL for service: {service_name}")
             return
         
         try:
-            response = requests.get(health_url, timeout=self.health_check_timeout)
+            response = self._session.get(health_url, timeout=self.health_check_timeout)
             
             if response.status_code == 200:
-                service['status'] = 'healthy'
+                status = 'healthy'
                 logger.debug(f"Service {service_name} is healthy")
             else:
-                service['status'] = 'unhealthy'
+                status = 'unhealthy'
                 logger.warning(f"Service {service_name} health check failed with status: {response.status_code}")
                 
             # Store the last health check response
-            service['last_health_check'] = {
+            last_health_check = {
                 'timestamp': time.time(),
                 'status_code': response.status_code,
-                'response': response.text[:200]  # Store first 200 chars of response
+                'response': response.content[:200].decode('utf-8', errors='replace')  # Store first 200 bytes of response
             }
             
         except requests.RequestException as e:
-            service['status'] = 'unavailable'
+            status = 'unavailable'
             logger.error(f"Health check failed for service {service_name}: {str(e)}")
             
             # Store the error
-            service['last_health_check'] = {
+            last_health_check = {
                 'timestamp': time.time(),
                 'error': str(e)
-            } 
\ No newline at end of file
+            }
+        
+        # Checks run concurrently, so apply the results under the lock
+        with self._health_lock:
+            service['status'] = status
+            service['last_health_check'] = last_health_check 
\ No newline at end of file
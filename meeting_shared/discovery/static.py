@@ -6,11 +6,35 @@ Uses a static configuration for service discovery.
 import os
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any, Optional, List
 import time
+import re
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlencode
+
+try:
+    from redis import Redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
 
 logger = logging.getLogger(__name__)
 
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+# Request headers that make a response specific to one user
+_PRIVATE_REQUEST_HEADERS = frozenset({'authorization', 'cookie', 'proxy-authorization'})
+
+# Vary headers the response cache can ignore (requests always decodes the body)
+_IGNORABLE_VARY = frozenset({'accept-encoding'})
+
+# SERVICE_NAME_URL environment variables, excluding database and Redis URLs
+_SERVICE_URL_ENV_RE = re.compile(r'(?!DATABASE|REDIS)(.+)_URL')
+_KEBAB_CASE = str.maketrans('_ABCDEFGHIJKLMNOPQRSTUVWXYZ', '-abcdefghijklmnopqrstuvwxyz')
+
 class StaticServiceDiscovery:
     """
     Static service discovery provider.
@@ -22,20 +46,85 @@ class StaticServiceDiscovery:
         self.services = {}
         self.health_check_interval = int(os.environ.get('SERVICE_HEALTH_CHECK_INTERVAL', '60'))
         self.health_check_timeout = int(os.environ.get('SERVICE_HEALTH_CHECK_TIMEOUT', '5'))
-        self.last_health_check = {}
+        self._stopped = threading.Event()
+        self._health_lock = threading.Lock()
+        self._health_thread = None
+        
+        # Pooled session so health checks reuse keep-alive connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+        # Optional Redis cache for upstream GET responses; the TTL applies to
+        # responses marked public without a max-age
+        self.response_cache_ttl = int(os.environ.get('SERVICE_RESPONSE_CACHE_TTL', '60'))
+        cache_url = os.environ.get('REDIS_RESPONSE_CACHE_URL')
+        self._response_cache = Redis.from_url(cache_url) if cache_url and HAS_REDIS else None
         
         # Load services from environment variables
         self._load_services_from_env()
         
         logger.info(f"Initialized static service discovery with {len(self.services)} services")
     
+    def _ensure_health_checks(self):
+        """Start the background health check thread on first lookup."""
+        if self._health_thread is not None or self._stopped.is_set():
+            return
+        with self._health_lock:
+            if self._health_thread is None:
+                self._health_thread = threading.Thread(
+                    target=self._health_check_loop,
+                    name='static-service-health',
+                    daemon=True
+                )
+                self._health_thread.start()
+    
+    def _health_check_loop(self):
+        """Check every service's health once per health check interval."""
+        while True:
+            self._check_all_services_health()
+            if self._stopped.wait(self.health_check_interval):
+                break
+    
+    def _check_all_services_health(self):
+        """Check the health of all registered services concurrently."""
+        services = list(self.services.items())
+        if not services:
+            return
+        
+        # Capped at the connection pool size to avoid exhausting sockets
+        with ThreadPoolExecutor(max_workers=min(32, len(services))) as executor:
+            futures = {
+                executor.submit(self._check_service_health, service_name, service): service_name
+                for service_name, service in services
+            }
+            for future in as_completed(futures):
+                error = future.exception()
+                if error is not None:
+                    logger.error(f"Health check crashed for service {futures[future]}: {str(error)}")
+    
+    def close(self, timeout: Optional[float] = None):
+        """
+        Stop the background health checks and release pooled connections.
+        
+        Args:
+            timeout: Seconds to wait for a running health check round to finish
+        """
+        self._stopped.set()
+        thread = self._health_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        self._session.close()
+    
     def _load_services_from_env(self):
         """Load services from environment variables."""
         # Look for environment variables in the format SERVICE_NAME_URL
+        match = _SERVICE_URL_ENV_RE.fullmatch
         for key, value in os.environ.items():
-            if key.endswith('_URL') and not key.startswith('DATABASE') and not key.startswith('REDIS'):
-                service_name = key[:-4].lower().replace('_', '-')
-                self.register_service(service_name, value)
+            m = match(key)
+            if m:
+                self.register_service(m.group(1).translate(_KEBAB_CASE), value)
     
     def get_service(self, service_name: str, default: Any = None) -> Optional[Dict[str, Any]]:
         """
@@ -48,19 +137,160 @@ class StaticServiceDiscovery:
         Returns:
             Service details or default if not found
         """
+        # Health is refreshed by the background thread, so this is a plain read
+        self._ensure_health_checks()
+        return self.services.get(service_name) or default
+    
+    def batch_request(self, service_name: str, pipeline: List[Dict[str, Any]],
+                      headers: Optional[Dict[str, str]] = None, timeout: float = 30) -> List[Dict[str, Any]]:
+        """
+        Send several requests to a service in one round trip.
+        
+        The sub-requests are posted together to the service's ``/_batch``
+        endpoint, which executes them and returns one result per entry. The
+        target service must implement that endpoint; none does by default.
+        
+        Args:
+            service_name: The service to call
+            pipeline: Sub-requests as dicts with 'method', 'path' and optional 'body'
+            headers: Outer request headers (e.g. X-Request-ID), inherited by all sub-requests
+            timeout: Timeout in seconds for the whole batch
+            
+        Returns:
+            List of sub-responses, in the same order as the pipeline
+            
+        Raises:
+            LookupError: If the service is not registered
+            requests.RequestException: If the batch request itself fails
+        """
         service = self.services.get(service_name)
         if not service:
-            return default
+            raise LookupError(f"Unknown service: {service_name}")
         
-        # Check if we need to perform a health check
-        current_time = time.time()
-        last_check = self.last_health_check.get(service_name, 0)
+        response = self._session.post(
+            f"{service['url'].rstrip('/')}/_batch",
+            json={'pipeline': pipeline},
+            headers=headers,
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def cached_get(self, service_name: str, path: str, params: Optional[Dict[str, Any]] = None,
+                   headers: Optional[Dict[str, str]] = None, timeout: float = 30,
+                   cache_fallback: bool = False) -> Dict[str, Any]:
+        """
+        GET a path on a service, serving repeated requests from the response cache.
+        
+        Successful responses are stored in a Redis hash per URL, but only when
+        the upstream explicitly allows it: Cache-Control max-age sets the
+        lifetime, and a bare 'public' uses SERVICE_RESPONSE_CACHE_TTL. Responses
+        without Cache-Control, or marked no-store/no-cache/private, or that
+        Vary on request headers, are not cached. Requests carrying credentials
+        (Authorization or Cookie) always bypass the cache. Without
+        REDIS_RESPONSE_CACHE_URL every call goes to the service.
+        
+        Args:
+            service_name: The service to call
+            path: Request path on the service
+            params: Optional query parameters
+            headers: Optional request headers
+            timeout: Request timeout in seconds
+            cache_fallback: Serve a stale cached response if the service fails
+            
+        Returns:
+            Dict with 'status', 'headers' and 'body' (bytes)
+            
+        Raises:
+            LookupError: If the service is not registered
+            requests.RequestException: If the request fails and no fallback is available
+        """
+        service = self.services.get(service_name)
+        if not service:
+            raise LookupError(f"Unknown service: {service_name}")
         
-        if current_time - last_check > self.health_check_interval:
-            self._check_service_health(service_name, service)
-            self.last_health_check[service_name] = current_time
+        cache = self._response_cache
+        if cache is not None and headers and any(name.lower() in _PRIVATE_REQUEST_HEADERS for name in headers):
+            # Never share a response fetched with someone's credentials
+            cache = None
+        query = urlencode(sorted(params.items())) if params else ''
+        key = f"service_response:{service_name}:{path}?{query}"
+        now = time.time()
+        
+        cached = cache.hgetall(key) if cache is not None else None
+        if cached and float(cached[b'stale_at']) > now:
+            return self._cached_response(cached)
+        
+        try:
+            response = self._session.get(
+                f"{service['url'].rstrip('/')}{path}",
+                params=params,
+                headers=headers,
+                timeout=timeout
+            )
+            if response.status_code >= 500:
+                response.raise_for_status()
+        except requests.RequestException:
+            if cache_fallback and cached:
+                logger.warning(f"Serving stale cached response for {service_name}{path}")
+                return self._cached_response(cached)
+            raise
         
-        return service
+        result = {
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'body': response.content
+        }
+        
+        ttl = self._response_ttl(response)
+        if cache is not None and response.status_code == 200 and ttl:
+            pipe = cache.pipeline()
+            pipe.hset(key, mapping={
+                'generated_at': now,
+                'stale_at': now + ttl,
+                'status': response.status_code,
+                'headers': json.dumps(result['headers']),
+                'body': response.content
+            })
+            # Keep entries past stale_at so they can back cache_fallback
+            pipe.expire(key, ttl * 10)
+            pipe.execute()
+        
+        return result
+    
+    def _response_ttl(self, response: requests.Response) -> int:
+        """
+        Infer how long a response may be shared from the cache, in seconds.
+        
+        Returns:
+            0 unless the response is explicitly cacheable (public or max-age)
+            and does not vary on request headers
+        """
+        vary = response.headers.get('Vary')
+        if vary:
+            varied = {name.strip().lower() for name in vary.split(',')} - {''}
+            if varied - _IGNORABLE_VARY:
+                return 0
+        
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        directives = {directive.strip().split('=', 1)[0] for directive in cache_control.split(',')}
+        if directives & {'no-store', 'no-cache', 'private'}:
+            return 0
+        match = _MAX_AGE_RE.search(cache_control)
+        if match:
+            return int(match.group(1))
+        if 'public' in directives:
+            return self.response_cache_ttl
+        return 0
+    
+    @staticmethod
+    def _cached_response(cached: Dict[bytes, bytes]) -> Dict[str, Any]:
+        """Convert a cached Redis hash back into a response dict."""
+        return {
+            'status': int(cached[b'status']),
+            'headers': json.loads(cached[b'headers']),
+            'body': cached[b'body']
+        }
     
     def get_services(self) -> Dict[str, Dict[str, Any]]:
         """
@@ -69,6 +299,7 @@ class StaticServiceDiscovery:
         Returns:
             Dictionary of service name to service details
         """
+        self._ensure_health_checks()
         return self.services
     
     def register_service(self, name: str, url: str, metadata: Optional[Dict[str, Any]] = None) -> None:
@@ -96,6 +327,7 @@ class StaticServiceDiscovery:
             'name': name,
             'url': url,
             'metadata': metadata,
+            'health_check_url': metadata['health_check_url'],
             'status': 'unknown'
         }
         
@@ -109,34 +341,39 @@ class StaticServiceDiscovery:
             service_name: Service name
             service: Service details
         """
-        health_url = service.get('metadata', {}).get('health_check_url')
+        health_url = service.get('health_check_url')
         if not health_url:
             logger.warning(f"No health check URL for service: {service_name}")
             return
         
         try:
-            response = requests.get(health_url, timeout=self.health_check_timeout)
+            response = self._session.get(health_url, timeout=self.health_check_timeout)
             
             if response.status_code == 200:
-                service['status'] = 'healthy'
+                status = 'healthy'
                 logger.debug(f"Service {service_name} is healthy")
             else:
-                service['status'] = 'unhealthy'
+                status = 'unhealthy'
                 logger.warning(f"Service {service_name} health check failed with status: {response.status_code}")
                 
             # Store the last health check response
-            service['last_health_check'] = {
+            last_health_check = {
                 'timestamp': time.time(),
                 'status_code': response.status_code,
-                'response': response.text[:200]  # Store first 200 chars of response
+                'response': response.content[:200].decode('utf-8', errors='replace')  # Store first 200 bytes of response
             }
             
         except requests.RequestException as e:
-            service['status'] = 'unavailable'
+            status = 'unavailable'
             logger.error(f"Health check failed for service {service_name}: {str(e)}")
             
             # Store the error
-            service['last_health_check'] = {
+            last_health_check = {
                 'timestamp': time.time(),
                 'error': str(e)
-            } 
\ No newline at end of file
+            }
+        
+        # Checks run concurrently, so apply the results under the lock
+        with self._health_lock:
+            service['status'] = status
+            service['last_health_check'] = last_health_check 
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Static service discovery provider with asyncio health checks.
+Probes all services concurrently from a single event loop thread.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any
+
+import aiohttp
+
+from .static import StaticServiceDiscovery
+
+logger = logging.getLogger(__name__)
+
+class StaticServiceDiscoveryAsync(StaticServiceDiscovery):
+    """
+    Static service discovery provider using aiohttp for health checks.
+    Service lookups are unchanged and read the status cached by the event loop.
+    """
+    
+    def _health_check_loop(self):
+        """Run the asyncio health check loop on this background thread."""
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._run_health_checks())
+        finally:
+            loop.close()
+    
+    async def _run_health_checks(self):
+        """Check every service's health once per health check interval."""
+        connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=60)
+        timeout = aiohttp.ClientTimeout(total=self.health_check_timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            while not self._stopped.is_set():
+                await asyncio.gather(*[
+                    self._check(session, service_name, service)
+                    for service_name, service in list(self.services.items())
+                ])
+                # Wait for the next interval without blocking the loop on the event
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._stopped.wait, self.health_check_interval
+                )
+    
+    async def _check(self, session: aiohttp.ClientSession, service_name: str, service: Dict[str, Any]) -> None:
+        """
+        Check the health of a service.
+        
+        Args:
+            session: Shared aiohttp session
+            service_name: Service name
+            service: Service details
+        """
+        health_url = service.get('health_check_url')
+        if not health_url:
+            logger.warning(f"No health check URL for service: {service_name}")
+            return
+        
+        try:
+            async with session.get(health_url) as response:
+                content = await response.content.read(200)
+            
+            if response.status == 200:
+                status = 'healthy'
+                logger.debug(f"Service {service_name} is healthy")
+            else:
+                status = 'unhealthy'
+                logger.warning(f"Service {service_name} health check failed with status: {response.status}")
+            
+            # Store the last health check response
+            last_health_check = {
+                'timestamp': time.time(),
+                'status_code': response.status,
+                'response': content.decode('utf-8', errors='replace')  # Store first 200 bytes of response
+            }
+        
+        except Exception as e:
+            # Caught per service so one failure cannot abort the whole gather
+            status = 'unavailable'
+            logger.error(f"Health check failed for service {service_name}: {str(e)}")
+            
+            # Store the error
+            last_health_check = {
+                'timestamp': time.time(),
+                'error': str(e)
+            }
+        
+        with self._health_lock:
+            service['status'] = status
+            service['last_health_check'] = last_health_check
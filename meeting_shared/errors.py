@@ -5,7 +5,8 @@ Provides common error classes and utilities for consistent error responses.
 
 import logging
 import traceback
-from datetime import datetime
+import time
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
@@ -20,19 +21,25 @@ except ImportError:
 class APIError(Exception):
     """Base exception class for API errors with status code and message"""
     
-    def __init__(self, message: str, status_code: int = 400, details: Optional[Dict[str, Any]] = None):
+    status_code = 400
+    default_message = "API error"
+    
+    def __init__(self, message: Optional[str] = None, status_code: Optional[int] = None,
+                 details: Optional[Dict[str, Any]] = None):
         """
         Initialize API error.
         
         Args:
-            message: Error message
-            status_code: HTTP status code
+            message: Error message (defaults to the class's default message)
+            status_code: HTTP status code (defaults to the class's status code)
             details: Additional error details
         """
-        self.message = message
-        self.status_code = status_code
-        self.details = details or {}
-        self.timestamp = datetime.utcnow().isoformat() + 'Z'
+        self.message = message or self.default_message
+        if status_code is not None:
+            self.status_code = status_code
+        self.details = details if details is not None else {}
+        # When the error was raised; formatted only if it is serialized
+        self.created_at = time.time()
         
         # Add request ID if available
         if HAS_REQUEST_ID:
@@ -40,6 +47,12 @@ class APIError(Exception):
         else:
             self.request_id = None
     
+    @property
+    def timestamp(self) -> str:
+        """ISO-8601 UTC timestamp of when the error was raised"""
+        created_at = self.created_at
+        return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(created_at)) + f".{int(created_at % 1 * 1e6):06d}Z"
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert exception to dictionary representation.
@@ -55,7 +68,7 @@ class APIError(Exception):
         }
         
         # Include request ID if available
-        if hasattr(self, 'request_id') and self.request_id:
+        if self.request_id:
             error_dict['request_id'] = self.request_id
         
         # Include additional details if provided
@@ -64,89 +77,113 @@ class APIError(Exception):
         
         return error_dict
 
+class _FixedStatusError(APIError):
+    """Base for errors whose status code is fixed by the class"""
+    
+    def __init__(self, message: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
+        super().__init__(message, details=details)
+
 # --- User and Authentication Errors ---
 
-class ValidationError(APIError):
+class ValidationError(_FixedStatusError):
     """Exception for data validation errors"""
-    
-    def __init__(self, message: str = "Validation error", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=422, details=details)
+    status_code = 422
+    default_message = "Validation error"
 
-class AuthenticationError(APIError):
+class AuthenticationError(_FixedStatusError):
     """Exception for authentication failures"""
-    
-    def __init__(self, message: str = "Authentication required", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=401, details=details)
+    status_code = 401
+    default_message = "Authentication required"
 
-class AuthorizationError(APIError):
+class AuthorizationError(_FixedStatusError):
     """Exception for authorization failures"""
-    
-    def __init__(self, message: str = "Not authorized", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=403, details=details)
+    status_code = 403
+    default_message = "Not authorized"
 
-class UserExistsError(APIError):
+class UserExistsError(_FixedStatusError):
     """Exception for duplicate user registration"""
-    
-    def __init__(self, message: str = "User already exists", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=409, details=details)
+    status_code = 409
+    default_message = "User already exists"
 
-class UserNotFoundError(APIError):
+class UserNotFoundError(_FixedStatusError):
     """Exception for user not found"""
-    
-    def __init__(self, message: str = "User not found", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=404, details=details)
+    status_code = 404
+    default_message = "User not found"
 
-class TokenError(APIError):
+class TokenError(_FixedStatusError):
     """Exception for token validation failures"""
-    
-    def __init__(self, message: str = "Invalid or expired token", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=401, details=details)
+    status_code = 401
+    default_message = "Invalid or expired token"
 
 # --- Resource Errors ---
 
-class ResourceNotFoundError(APIError):
+class ResourceNotFoundError(_FixedStatusError):
     """Exception for resource not found"""
-    
-    def __init__(self, message: str = "Resource not found", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=404, details=details)
+    status_code = 404
+    default_message = "Resource not found"
 
-class ResourceExistsError(APIError):
+class ResourceExistsError(_FixedStatusError):
     """Exception for duplicate resource"""
-    
-    def __init__(self, message: str = "Resource already exists", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=409, details=details)
+    status_code = 409
+    default_message = "Resource already exists"
 
 # --- Service Errors ---
 
-class ServiceError(APIError):
+class ServiceError(_FixedStatusError):
     """Exception for service failures"""
-    
-    def __init__(self, message: str = "Service error", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=500, details=details)
+    status_code = 500
+    default_message = "Service error"
 
-class ConfigurationError(APIError):
+class ConfigurationError(_FixedStatusError):
     """Exception for configuration errors"""
-    
-    def __init__(self, message: str = "Configuration error", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=500, details=details)
+    status_code = 500
+    default_message = "Configuration error"
 
-class DependencyError(APIError):
+class DependencyError(_FixedStatusError):
     """Exception for dependency failures"""
-    
-    def __init__(self, message: str = "Dependency error", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=503, details=details)
+    status_code = 503
+    default_message = "Dependency error"
 
-class RateLimitError(APIError):
+class RateLimitError(_FixedStatusError):
     """Exception for rate limiting"""
-    
-    def __init__(self, message: str = "Rate limit exceeded", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=429, details=details)
+    status_code = 429
+    default_message = "Rate limit exceeded"
 
-class EmailError(APIError):
+class EmailError(_FixedStatusError):
     """Exception for email sending failures"""
+    status_code = 500
+    default_message = "Failed to send email"
+
+# Error classes by code, for make_error
+_ERROR_TYPES = MappingProxyType({
+    'validation': ValidationError,
+    'authentication': AuthenticationError,
+    'authorization': AuthorizationError,
+    'user_exists': UserExistsError,
+    'user_not_found': UserNotFoundError,
+    'token': TokenError,
+    'resource_not_found': ResourceNotFoundError,
+    'resource_exists': ResourceExistsError,
+    'service': ServiceError,
+    'configuration': ConfigurationError,
+    'dependency': DependencyError,
+    'rate_limit': RateLimitError,
+    'email': EmailError,
+})
+
+def make_error(code: str, message: Optional[str] = None, **details) -> APIError:
+    """
+    Build an API error from its code.
     
-    def __init__(self, message: str = "Failed to send email", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=500, details=details)
+    Args:
+        code: Error code, e.g. 'validation' or 'resource_not_found'
+        message: Optional message overriding the default
+        **details: Additional error details
+        
+    Returns:
+        The matching APIError subclass instance
+    """
+    return _ERROR_TYPES[code](message, details or None)
 
 # Export all error classes
 __all__ = [
@@ -164,4 +201,5 @@ __all__ = [
     'DependencyError',
     'RateLimitError',
     'EmailError',
+    'make_error',
 ] 
\ No newline at end of file
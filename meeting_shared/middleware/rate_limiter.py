@@ -1,17 +1,32 @@
-from functools import wraps
-from flask import request, jsonify, current_app
-from redis import Redis
-from datetime import datetime
+from functools import wraps, lru_cache
+from flask import request, current_app
+from redis import Redis, ConnectionPool
+import time
 import logging
 from meeting_shared.schemas.base import ErrorResponse
 
 logger = logging.getLogger(__name__)
 
+# Fixed-window counter: one atomic round trip per request
+_FIXED_WINDOW_LUA = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+# Connection pools shared by every RateLimiter, keyed by Redis URL
+_POOLS: dict[str, ConnectionPool] = {}
+
 class RateLimiter:
     def __init__(self, redis_url=None):
-        self.redis = Redis.from_url(
-            redis_url or current_app.config.get('REDIS_URL', 'redis://localhost:6379/0')
-        )
+        url = redis_url or current_app.config.get('REDIS_URL', 'redis://localhost:6379/0')
+        pool = _POOLS.get(url)
+        if pool is None:
+            pool = _POOLS.setdefault(url, ConnectionPool.from_url(url, max_connections=64))
+        self.redis = Redis(connection_pool=pool)
+        self._incr_window = self.redis.register_script(_FIXED_WINDOW_LUA)
 
     def is_rate_limited(self, key: str, limit: int, window: int) -> tuple[bool, int]:
         """
@@ -25,23 +40,15 @@ class RateLimiter:
         Returns:
             Tuple of (is_limited, remaining_requests)
         """
-        pipe = self.redis.pipeline()
-        now = datetime.utcnow().timestamp()
-        window_start = now - window
-        
-        # Remove old entries
-        pipe.zremrangebyscore(key, '-inf', window_start)
-        # Add current request
-        pipe.zadd(key, {str(now): now})
-        # Count requests in window
-        pipe.zcard(key)
-        # Set expiry
-        pipe.expire(key, window)
-        
-        _, _, count, _ = pipe.execute()
+        count = self._incr_window(keys=[key], args=[window])
         
         return count > limit, max(0, limit - count)
 
+@lru_cache(maxsize=None)
+def _get_limiter(redis_url: str) -> RateLimiter:
+    """Get the shared rate limiter (and its connection pool) for a Redis URL"""
+    return RateLimiter(redis_url)
+
 def rate_limit(limit: int, window: int, key_func=None):
     """
     Rate limiting decorator
@@ -52,29 +59,37 @@ def rate_limit(limit: int, window: int, key_func=None):
         key_func: Optional function to generate rate limit key
     """
     def decorator(f):
+        # Counter keys are strings, so they must not reuse the old sorted-set key names
+        key_prefix = f"rate_limit:fw:{f.__name__}:"
+        
+        # The rejection body only depends on the decorator arguments, so it is
+        # serialized (and encoded) once here
+        rejected_body = ErrorResponse(
+            error="Rate Limit Exceeded",
+            message="Too many requests",
+            details={
+                "limit": limit,
+                "window": window,
+                "retry_after": window
+            }
+        ).model_dump_json().encode()
+        
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            limiter = RateLimiter()
+            limiter = _get_limiter(current_app.config.get('REDIS_URL', 'redis://localhost:6379/0'))
             
             # Get rate limit key
             if key_func:
-                key = f"rate_limit:{f.__name__}:{key_func(request)}"
+                key = key_prefix + str(key_func(request))
             else:
-                key = f"rate_limit:{f.__name__}:{request.remote_addr}"
+                key = key_prefix + str(request.remote_addr)
             
             is_limited, remaining = limiter.is_rate_limited(key, limit, window)
             
             if is_limited:
-                response = ErrorResponse(
-                    error="Rate Limit Exceeded",
-                    message="Too many requests",
-                    details={
-                        "limit": limit,
-                        "window": window,
-                        "retry_after": window
-                    }
+                return current_app.response_class(
+                    rejected_body, status=429, mimetype='application/json'
                 )
-                return jsonify(response.model_dump()), 429
             
             # Add rate limit headers
             response = f(*args, **kwargs)
@@ -85,7 +100,7 @@ def rate_limit(limit: int, window: int, key_func=None):
                 
             response.headers['X-RateLimit-Limit'] = str(limit)
             response.headers['X-RateLimit-Remaining'] = str(remaining)
-            response.headers['X-RateLimit-Reset'] = str(int(datetime.utcnow().timestamp() + window))
+            response.headers['X-RateLimit-Reset'] = str(int(time.time() + window))
             
             return response, status_code
             
@@ -3,9 +3,9 @@ Request ID middleware module for tracking requests across services.
 Generates and propagates request and correlation IDs.
 """
 
+import os
 import logging
-import uuid
-import threading
+from contextvars import ContextVar
 from functools import wraps
 from flask import Flask, request, g, has_request_context, current_app
 from werkzeug.wsgi import ClosingIterator
@@ -26,11 +26,17 @@ except (ImportError, ValueError):
         def init_app(self, app, **kwargs):
             pass
 
-# Thread-local storage for request ID when Flask context is not available
-_request_id_local = threading.local()
+# Context-local request and correlation IDs, readable with or without a Flask context
+_request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
+_correlation_id_var: ContextVar[Optional[str]] = ContextVar('correlation_id', default=None)
 
 logger = logging.getLogger(__name__)
 
+def _gen_id() -> str:
+    """Generate a random ID in UUID string format without building a UUID object"""
+    h = os.urandom(16).hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
 class RequestIdMiddleware(Middleware):
     """
     WSGI middleware that assigns a unique request ID to each incoming request.
@@ -43,6 +49,7 @@ class RequestIdMiddleware(Middleware):
         self.request_id_header = 'X-Request-ID'
         self.correlation_id_header = 'X-Correlation-ID'
         self.include_in_response = True
+        self._set_environ_keys()
         
         if app is not None:
             self.init_app(app, **kwargs)
@@ -56,11 +63,14 @@ class RequestIdMiddleware(Middleware):
             request_id_header: Name of header containing request ID
             correlation_id_header: Name of header containing correlation ID
             include_in_response: Whether to include request/correlation IDs in response
+            expose_debug_endpoint: Register the /_request_id endpoint even when
+                the app is not in debug mode
         """
         # Store configuration
         self.request_id_header = kwargs.get('request_id_header', self.request_id_header)
         self.correlation_id_header = kwargs.get('correlation_id_header', self.correlation_id_header)
         self.include_in_response = kwargs.get('include_in_response', self.include_in_response)
+        self._set_environ_keys()
         
         # Register middleware with Flask
         app.before_request(self.before_request)
@@ -68,7 +78,8 @@ class RequestIdMiddleware(Middleware):
         app.teardown_request(self.teardown_request)
         
         # Add endpoint to get current request ID (useful for testing/debugging)
-        app.add_url_rule('/_request_id', '_request_id', self.request_id_endpoint)
+        if kwargs.get('expose_debug_endpoint', False) or app.debug:
+            app.add_url_rule('/_request_id', '_request_id', self.request_id_endpoint)
         
         # Wrap application with WSGI middleware
         if not hasattr(app, 'wsgi_app_wrapped_by_request_id') or not app.wsgi_app_wrapped_by_request_id:
@@ -79,6 +90,11 @@ class RequestIdMiddleware(Middleware):
             
         logger.info(f"RequestIdMiddleware initialized with headers: {self.request_id_header}, {self.correlation_id_header}")
         
+    def _set_environ_keys(self):
+        """Precompute the WSGI environ keys for the configured headers."""
+        self._request_id_environ_key = 'HTTP_' + self.request_id_header.replace('-', '_').upper()
+        self._correlation_id_environ_key = 'HTTP_' + self.correlation_id_header.replace('-', '_').upper()
+        
     def __call__(self, environ, start_response):
         """
         WSGI middleware implementation.
@@ -91,12 +107,12 @@ class RequestIdMiddleware(Middleware):
             WSGI response
         """
         # Extract request ID from environment or generate new one
-        request_id = environ.get('HTTP_' + self.request_id_header.replace('-', '_').upper())
-        correlation_id = environ.get('HTTP_' + self.correlation_id_header.replace('-', '_').upper())
+        request_id = environ.get(self._request_id_environ_key)
+        correlation_id = environ.get(self._correlation_id_environ_key)
         
         # Generate IDs if not present
         if not request_id:
-            request_id = str(uuid.uuid4())
+            request_id = _gen_id()
         
         if not correlation_id:
             correlation_id = request_id
@@ -105,20 +121,27 @@ class RequestIdMiddleware(Middleware):
         environ['request_id'] = request_id
         environ['correlation_id'] = correlation_id
         
-        # Store in thread-local for access outside request context
-        _request_id_local.request_id = request_id
-        _request_id_local.correlation_id = correlation_id
+        # Store in context variables for access outside request context
+        _request_id_var.set(request_id)
+        _correlation_id_var.set(correlation_id)
         
         # Function to intercept the status and headers
-        def custom_start_response(status, headers, exc_info=None):
-            # Add request ID header to response if configured
-            if self.include_in_response:
-                headers_list = list(headers)
-                headers_list.append((self.request_id_header, request_id))
-                headers_list.append((self.correlation_id_header, correlation_id))
-                headers = headers_list
+        if self.include_in_response:
+            id_headers = (
+                (self.request_id_header, request_id),
+                (self.correlation_id_header, correlation_id)
+            )
             
-            return start_response(status, headers, exc_info)
+            def custom_start_response(status, headers, exc_info=None):
+                # Add request ID headers to the response
+                if isinstance(headers, list):
+                    headers.extend(id_headers)
+                else:
+                    headers = [*headers, *id_headers]
+                
+                return start_response(status, headers, exc_info)
+        else:
+            custom_start_response = start_response
         
         # Process request
         try:
@@ -133,25 +156,32 @@ class RequestIdMiddleware(Middleware):
     
     def before_request(self):
         """Before request handler for Flask."""
-        # Get request ID from headers or generate new one
-        request_id = request.headers.get(self.request_id_header)
-        correlation_id = request.headers.get(self.correlation_id_header)
+        # Reuse the IDs assigned by the WSGI wrapper when it ran for this request
+        environ = request.environ
+        request_id = environ.get('request_id')
         
-        # Generate IDs if not present
-        if not request_id:
-            request_id = str(uuid.uuid4())
-        
-        if not correlation_id:
-            correlation_id = request_id
+        if request_id is not None:
+            correlation_id = environ['correlation_id']
+        else:
+            # Get request ID from headers or generate new one
+            request_id = request.headers.get(self.request_id_header)
+            correlation_id = request.headers.get(self.correlation_id_header)
+            
+            # Generate IDs if not present
+            if not request_id:
+                request_id = _gen_id()
+            
+            if not correlation_id:
+                correlation_id = request_id
+            
+            # Store in context variables for access outside request context
+            _request_id_var.set(request_id)
+            _correlation_id_var.set(correlation_id)
         
         # Store in Flask g for access within request
         g.request_id = request_id
         g.correlation_id = correlation_id
         
-        # Store in thread-local for access outside request context
-        _request_id_local.request_id = request_id
-        _request_id_local.correlation_id = correlation_id
-        
         logger.debug(f"Request {request_id} started: {request.method} {request.path}")
     
     def after_request(self, response):
@@ -164,18 +194,18 @@ class RequestIdMiddleware(Middleware):
         Returns:
             Modified response with request ID headers
         """
-        # Add request ID headers to response if configured
-        if self.include_in_response:
-            response.headers.setdefault(
-                self.request_id_header, 
-                getattr(g, 'request_id', 'unknown')
-            )
-            response.headers.setdefault(
-                self.correlation_id_header, 
-                getattr(g, 'correlation_id', 'unknown')
-            )
+        request_id = g.get('request_id', 'unknown')
+        
+        # Add request ID headers to response if configured; the WSGI wrapper
+        # adds them itself when it handled this request
+        if self.include_in_response and 'request_id' not in request.environ:
+            headers = response.headers
+            if self.request_id_header not in headers:
+                headers[self.request_id_header] = request_id
+            if self.correlation_id_header not in headers:
+                headers[self.correlation_id_header] = g.get('correlation_id', 'unknown')
         
-        logger.debug(f"Request {getattr(g, 'request_id', 'unknown')} completed with status {response.status_code}")
+        logger.debug(f"Request {request_id} completed with status {response.status_code}")
         return response
     
     def teardown_request(self, exception=None):
@@ -190,11 +220,9 @@ class RequestIdMiddleware(Middleware):
     
     def cleanup_request(self):
         """Clean up request resources."""
-        # Clear thread-local storage
-        if hasattr(_request_id_local, 'request_id'):
-            del _request_id_local.request_id
-        if hasattr(_request_id_local, 'correlation_id'):
-            del _request_id_local.correlation_id
+        # Clear the context variables
+        _request_id_var.set(None)
+        _correlation_id_var.set(None)
     
     def request_id_endpoint(self):
         """Endpoint that returns the current request ID."""
@@ -210,12 +238,13 @@ def get_request_id() -> str:
     Get the current request ID.
     
     Returns:
-        str: Request ID from Flask g, or thread-local, or None
+        str: Request ID from the middleware, or Flask g, or None
     """
-    if has_request_context():
+    request_id = _request_id_var.get()
+    if request_id is None and has_request_context():
         return getattr(g, 'request_id', None)
     
-    return getattr(_request_id_local, 'request_id', None)
+    return request_id
 
 
 def get_correlation_id() -> str:
@@ -223,12 +252,13 @@ def get_correlation_id() -> str:
     Get the current correlation ID.
     
     Returns:
-        str: Correlation ID from Flask g, or thread-local, or None
+        str: Correlation ID from the middleware, or Flask g, or None
     """
-    if has_request_context():
+    correlation_id = _correlation_id_var.get()
+    if correlation_id is None and has_request_context():
         return getattr(g, 'correlation_id', None)
     
-    return getattr(_request_id_local, 'correlation_id', None)
+    return correlation_id
 
 
 def with_request_id(func):
@@ -245,9 +275,9 @@ def with_request_id(func):
     def wrapper(*args, **kwargs):
         # Generate request ID if none exists
         if not get_request_id():
-            request_id = str(uuid.uuid4())
-            _request_id_local.request_id = request_id
-            _request_id_local.correlation_id = request_id
+            request_id = _gen_id()
+            _request_id_var.set(request_id)
+            _correlation_id_var.set(request_id)
         
         return func(*args, **kwargs)
     
@@ -1,111 +1,152 @@
+import json
 from functools import wraps
-from flask import request, jsonify
-from pydantic import BaseModel, ValidationError
+from flask import request, jsonify, current_app
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from typing import Type, List, Union, Dict, Any
 from meeting_shared.schemas.base import ErrorResponse
 import logging
 from meeting_shared.database import transaction
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
-def validate_schema(schema_class: Type[BaseModel], allow_bulk: bool = False):
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+def _load_request_json():
+    """Parse the raw request body, treating an empty body as an empty object"""
+    # Keep the body cached so view functions can still call request.get_json()
+    raw = request.get_data()
+    return _json_loads(raw) if raw else {}
+
+# The generic failure payload never changes, so serialize it once
+_GENERIC_ERROR_JSON = json.dumps(ErrorResponse(
+    error="Validation Error",
+    message="Error processing request data"
+).model_dump(), sort_keys=True, separators=(',', ':')) + "\n"
+
+# Template for schema validation failures; copied and filled per request
+_VALIDATION_ERROR_TEMPLATE = ErrorResponse(
+    error="Validation Error",
+    message="Invalid request data"
+).model_dump()
+
+def _generic_error_response():
+    """Build the cached generic validation error response"""
+    return current_app.response_class(_GENERIC_ERROR_JSON, mimetype='application/json'), 400
+
+def validate_schema(schema_class: Type[BaseModel], allow_bulk: bool = False, transactional: bool = True):
     """
     Enhanced decorator to validate request data against a Pydantic schema
     
     Args:
         schema_class: Pydantic model class to validate against
         allow_bulk: Whether to allow bulk validation of a list of items
+        transactional: Whether to wrap the view in a database transaction.
+            Pass False for read-only views or views that manage their own
+            transactions.
     """
+    # Build the validators once rather than on every request
+    single_adapter = TypeAdapter(schema_class)
+    bulk_adapter = TypeAdapter(List[schema_class]) if allow_bulk else None
+    
     def decorator(f):
+        log_error = logger.error
+        
         @wraps(f)
         def decorated_function(*args, **kwargs):
             try:
                 # Get request data based on content type
                 if request.is_json:
-                    data = request.get_json()
+                    data = _load_request_json()
                 elif request.form:
                     data = request.form.to_dict()
                 else:
                     data = request.args.to_dict()
                 
                 # Handle bulk validation if allowed and data is a list
-                if allow_bulk and isinstance(data, list):
-                    validated_data = [schema_class(**item) for item in data]
+                if bulk_adapter is not None and isinstance(data, list):
+                    validated_data = bulk_adapter.validate_python(data)
                 else:
-                    validated_data = schema_class(**data)
+                    validated_data = single_adapter.validate_python(data)
                 
                 # Add validated data to kwargs
                 kwargs['data'] = validated_data
                 
+                if not transactional:
+                    return f(*args, **kwargs)
+                
                 # Wrap the function call in a transaction
                 with transaction():
                     return f(*args, **kwargs)
                 
             except ValidationError as e:
-                logger.error(f"Validation error: {str(e)}")
-                response = ErrorResponse(
-                    error="Validation Error",
-                    message="Invalid request data",
-                    details={"errors": e.errors()}
-                )
-                return jsonify(response.model_dump()), 400
+                log_error("Validation error: %s", e)
+                response = _VALIDATION_ERROR_TEMPLATE.copy()
+                response['details'] = {"errors": e.errors()}
+                return jsonify(response), 400
                 
             except Exception as e:
-                logger.error(f"Error validating request data: {str(e)}")
-                response = ErrorResponse(
-                    error="Validation Error",
-                    message="Error processing request data"
-                )
-                return jsonify(response.model_dump()), 400
+                log_error("Error validating request data: %s", e)
+                return _generic_error_response()
                 
         return decorated_function
     return decorator
 
-def validate_nested_schema(schema_class: Type[BaseModel], field_path: str):
+def validate_nested_schema(schema_class: Type[BaseModel], field_path: str, transactional: bool = True):
     """
     Decorator to validate nested data in request against a Pydantic schema
     
     Args:
         schema_class: Pydantic model class to validate against
         field_path: Dot-notation path to the nested data (e.g. "user.profile")
+        transactional: Whether to wrap the view in a database transaction
     """
+    adapter = TypeAdapter(schema_class)
+    path_parts = tuple(field_path.split('.'))
+    kwarg_key = field_path.replace('.', '_')
+    nested_error_template = _VALIDATION_ERROR_TEMPLATE.copy()
+    nested_error_template['message'] = f"Invalid data in {field_path}"
+    
     def decorator(f):
+        log_error = logger.error
+        
         @wraps(f)
         def decorated_function(*args, **kwargs):
             try:
-                data = request.get_json()
+                data = _load_request_json()
                 
                 # Navigate to nested data using field path
                 nested_data = data
-                for field in field_path.split('.'):
-                    nested_data = nested_data.get(field, {})
+                for field in path_parts:
+                    nested_data = nested_data.get(field, {}) if isinstance(nested_data, dict) else {}
                 
                 # Validate nested data
-                validated_data = schema_class(**nested_data)
+                validated_data = adapter.validate_python(nested_data)
                 
                 # Add validated data to kwargs using field path
-                kwargs[field_path.replace('.', '_')] = validated_data
+                kwargs[kwarg_key] = validated_data
+                
+                if not transactional:
+                    return f(*args, **kwargs)
                 
                 # Wrap the function call in a transaction
                 with transaction():
                     return f(*args, **kwargs)
                 
             except ValidationError as e:
-                logger.error(f"Validation error in nested schema: {str(e)}")
-                response = ErrorResponse(
-                    error="Validation Error",
-                    message=f"Invalid data in {field_path}",
-                    details={"errors": e.errors()}
-                )
-                return jsonify(response.model_dump()), 400
+                log_error("Validation error in nested schema: %s", e)
+                response = nested_error_template.copy()
+                response['details'] = {"errors": e.errors()}
+                return jsonify(response), 400
                 
             except Exception as e:
-                logger.error(f"Error validating nested data: {str(e)}")
-                response = ErrorResponse(
-                    error="Validation Error",
-                    message="Error processing request data"
-                )
-                return jsonify(response.model_dump()), 400
+                log_error("Error validating nested data: %s", e)
+                return _generic_error_response()
                 
         return decorated_function
     return decorator
@@ -117,22 +158,25 @@ def validate_query_params(*required_params):
     Args:
         *required_params: Names of required query parameters
     """
+    required = frozenset(required_params)
+    error_template = ErrorResponse(
+        error="Validation Error",
+        message="Missing required query parameters"
+    ).model_dump()
+    
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
+            if required.issubset(request.args):
+                return f(*args, **kwargs)
+            
+            # Report missing parameters in declaration order
             missing_params = [
                 param for param in required_params 
                 if param not in request.args
             ]
-            
-            if missing_params:
-                response = ErrorResponse(
-                    error="Validation Error",
-                    message="Missing required query parameters",
-                    details={"missing_params": missing_params}
-                )
-                return jsonify(response.model_dump()), 400
-                
-            return f(*args, **kwargs)
+            response = error_template.copy()
+            response['details'] = {"missing_params": missing_params}
+            return jsonify(response), 400
         return decorated_function
     return decorator 
\ No newline at end of file
@@ -5,36 +5,27 @@ Provides a unified interface for accessing secrets from various backends.
 
 import os
 import logging
+import threading
+import importlib.util
 
 logger = logging.getLogger(__name__)
 
-# Import secret managers
-try:
-    from .env import EnvSecretManager
-    HAS_ENV = True
-except ImportError:
-    HAS_ENV = False
-
-try:
-    from .file import FileSecretManager
-    HAS_FILE = True
-except ImportError:
-    HAS_FILE = False
-
-try:
-    from .vault import VaultSecretManager
-    HAS_VAULT = True
-except ImportError:
-    HAS_VAULT = False
-
-try:
-    from .aws import AWSSecretManager
-    HAS_AWS = True
-except ImportError:
-    HAS_AWS = False
+# Detect available secret managers without importing them; backends are
+# imported lazily in get_secret_manager so unused dependencies never load
+HAS_ENV = importlib.util.find_spec('.env', __name__) is not None
+HAS_FILE = importlib.util.find_spec('.file', __name__) is not None
+HAS_VAULT = importlib.util.find_spec('.vault', __name__) is not None
+HAS_AWS = importlib.util.find_spec('.aws', __name__) is not None
 
 # Global secret manager instance
 _secret_manager = None
+_manager_resolved = False
+
+# Secret managers already built by get_secret_manager, by type
+_managers_by_type = {}
+
+# Guards manager construction so concurrent first calls build only one
+_manager_lock = threading.RLock()
 
 def get_secret_manager(manager_type=None):
     """
@@ -46,34 +37,93 @@ def get_secret_manager(manager_type=None):
             If None, will try to determine from environment variables.
             
     Returns:
-        A secret manager instance.
+        A secret manager instance, shared by all callers asking for the same type.
     """
     # Try to determine the manager type from environment variables
     if manager_type is None:
         manager_type = os.environ.get('SECRET_MANAGER_TYPE', 'env').lower()
     
-    if manager_type == 'env' and HAS_ENV:
-        return EnvSecretManager()
-    elif manager_type == 'file' and HAS_FILE:
-        return FileSecretManager()
-    elif manager_type == 'vault' and HAS_VAULT:
-        return VaultSecretManager()
-    elif manager_type == 'aws' and HAS_AWS:
-        return AWSSecretManager()
-    else:
-        logger.warning(f"Unsupported or unavailable secret manager: {manager_type}")
+    manager = _managers_by_type.get(manager_type)
+    if manager is None:
+        with _manager_lock:
+            manager = _managers_by_type.get(manager_type)
+            if manager is None:
+                manager = _create_secret_manager(manager_type)
+                if manager is not None:
+                    _attach_shared_cache(manager, manager_type)
+                    _managers_by_type[manager_type] = manager
+    return manager
+
+def _create_secret_manager(manager_type):
+    """
+    Create a new secret manager instance.
+    
+    Args:
+        manager_type: The type of secret manager to create.
+        
+    Returns:
+        A secret manager instance, or None if the type is unavailable.
+    """
+    try:
+        if manager_type == 'env' and HAS_ENV:
+            from .env import EnvSecretManager
+            return EnvSecretManager()
+        elif manager_type == 'file' and HAS_FILE:
+            from .file import FileSecretManager
+            return FileSecretManager()
+        elif manager_type == 'vault' and HAS_VAULT:
+            from .vault import VaultSecretManager
+            return VaultSecretManager()
+        elif manager_type == 'aws' and HAS_AWS:
+            from .aws import AWSSecretManager
+            return AWSSecretManager()
+    except ImportError as e:
+        logger.warning(f"Secret manager {manager_type} could not be loaded: {str(e)}")
         return None
+    
+    logger.warning(f"Unsupported or unavailable secret manager: {manager_type}")
+    return None
+
+def _attach_shared_cache(manager, manager_type):
+    """
+    Give a remote secret manager a cache shared by all worker processes.
+    
+    Enabled by setting SECRET_SHARED_CACHE=true (and SECRET_CACHE_KEY).
+    Local backends read secrets cheaply and are left alone.
+    
+    Args:
+        manager: The secret manager instance.
+        manager_type: The type of the secret manager.
+    """
+    if manager_type not in ('vault', 'aws'):
+        return
+    if os.environ.get('SECRET_SHARED_CACHE', 'false').lower() != 'true':
+        return
+    
+    try:
+        from .shared_cache import SharedSecretCache
+        manager.shared_cache = SharedSecretCache(namespace=manager_type)
+    except (ImportError, ValueError) as e:
+        logger.warning(f"Shared secret cache could not be enabled: {str(e)}")
 
 def _get_manager():
     """
     Get the global secret manager instance, creating it if necessary.
     
+    Uses double-checked locking so the manager is created exactly once,
+    even when several threads make their first call at the same time.
+    
     Returns:
         The global secret manager instance.
     """
-    global _secret_manager
-    if _secret_manager is None:
-        _secret_manager = get_secret_manager()
+    global _secret_manager, _manager_resolved
+    
+    if not _manager_resolved:
+        with _manager_lock:
+            if not _manager_resolved:
+                if _secret_manager is None:
+                    _secret_manager = get_secret_manager()
+                _manager_resolved = True
     return _secret_manager
 
 def set_secret_manager(manager):
@@ -83,8 +133,10 @@ def set_secret_manager(manager):
     Args:
         manager: A secret manager instance.
     """
-    global _secret_manager
-    _secret_manager = manager
+    global _secret_manager, _manager_resolved
+    with _manager_lock:
+        _secret_manager = manager
+        _manager_resolved = True
 
 def get_secret(key, default=None):
     """
@@ -117,7 +169,7 @@ def get_secrets(keys):
     if manager is None:
         logger.error(f"No secret manager available, cannot get secrets: {keys}")
         return {}
-    return manager.get_secrets(keys)
+    return manager.batch_get(keys)
 
 def has_secret(key):
     """
@@ -0,0 +1,185 @@
+"""
+Base secret manager.
+Defines the interface shared by all secret backends.
+"""
+
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+# Cached in place of a value to remember that a secret does not exist
+_MISSING = object()
+
+class SecretManager(ABC):
+    """
+    Base class for secret managers.
+    
+    Provides a small TTL cache for secret values so repeated lookups of the
+    same key do not go back to the underlying store. Missing secrets are
+    cached as _MISSING. An optional shared cache (see SharedSecretCache) is
+    consulted after the local one, so worker processes share fetched values.
+    """
+    
+    def __init__(self, value_cache_ttl=900, value_cache_size=256, shared_cache=None, miss_cache_ttl=30):
+        """
+        Initialize the secret value cache.
+        
+        Args:
+            value_cache_ttl: Seconds to cache a secret value (0 disables caching)
+            value_cache_size: Maximum number of cached secret values
+            shared_cache: Optional cross-process cache for secret values
+            miss_cache_ttl: Seconds to remember that a secret does not exist
+                 (capped at value_cache_ttl), so newly created secrets show up quickly
+        """
+        self.value_cache_ttl = value_cache_ttl
+        self.miss_cache_ttl = min(miss_cache_ttl, value_cache_ttl)
+        self.value_cache_size = value_cache_size
+        self.shared_cache = shared_cache
+        # {key: (value, expires_at)}
+        self._value_cache = {}
+        self._value_cache_lock = threading.RLock()
+    
+    def _get_cached(self, key):
+        """
+        Get a cached secret value.
+        
+        Args:
+            key: The secret key.
+        
+        Returns:
+            The cached value (_MISSING for a cached miss), or None if it is
+            not cached or has expired.
+        """
+        if self.value_cache_ttl <= 0:
+            return None
+        
+        entry = self._value_cache.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        
+        if self.shared_cache is not None:
+            try:
+                value = self.shared_cache.get(key)
+            except Exception as e:
+                logger.warning(f"Shared secret cache read failed: {str(e)}")
+                return None
+            if value is not None:
+                self._set_local(key, value)
+            return value
+        return None
+    
+    def _set_cached(self, key, value):
+        """
+        Cache a secret value.
+        
+        Args:
+            key: The secret key.
+            value: The secret value.
+        """
+        if self.value_cache_ttl <= 0:
+            return
+        
+        self._set_local(key, value)
+        
+        # Misses stay local so a secret created later is picked up by each worker
+        if self.shared_cache is not None and value is not _MISSING:
+            try:
+                self.shared_cache.set(key, value, self.value_cache_ttl)
+            except Exception as e:
+                logger.warning(f"Shared secret cache write failed: {str(e)}")
+    
+    def _set_local(self, key, value):
+        """
+        Cache a secret value in this process only.
+        
+        Args:
+            key: The secret key.
+            value: The secret value.
+        """
+        with self._value_cache_lock:
+            if key not in self._value_cache and len(self._value_cache) >= self.value_cache_size:
+                # Evict the oldest entry
+                del self._value_cache[next(iter(self._value_cache))]
+            ttl = self.miss_cache_ttl if value is _MISSING else self.value_cache_ttl
+            self._value_cache[key] = (value, time.monotonic() + ttl)
+    
+    def invalidate(self, key=None):
+        """
+        Drop cached secret values.
+        
+        Args:
+            key: The secret key to drop, or None to drop everything.
+        """
+        with self._value_cache_lock:
+            if key is None:
+                self._value_cache.clear()
+            else:
+                self._value_cache.pop(key, None)
+        
+        if self.shared_cache is not None:
+            try:
+                if key is None:
+                    self.shared_cache.clear()
+                else:
+                    self.shared_cache.delete(key)
+            except Exception as e:
+                logger.warning(f"Shared secret cache invalidation failed: {str(e)}")
+    
+    def clear_cache(self):
+        """Drop all cached secret values."""
+        self.invalidate()
+    
+    @abstractmethod
+    def get_secret(self, key, default=None):
+        """
+        Get a secret by key.
+        
+        Args:
+            key: The secret key.
+            default: The default value to return if the secret is not found.
+        
+        Returns:
+            The secret value, or default if not found.
+        """
+    
+    def get_secrets(self, keys):
+        """
+        Get multiple secrets.
+        
+        Args:
+            keys: List of secret keys.
+        
+        Returns:
+            Dictionary of key-value pairs.
+        """
+        return self.batch_get(keys)
+    
+    def batch_get(self, keys):
+        """
+        Get multiple secrets in as few backend calls as possible.
+        
+        Backends with a native batched read override this; the default
+        looks up each key in turn.
+        
+        Args:
+            keys: List of secret keys.
+        
+        Returns:
+            Dictionary of key-value pairs (None for missing secrets).
+        """
+        return {key: self.get_secret(key) for key in keys}
+    
+    @abstractmethod
+    def has_secret(self, key):
+        """
+        Check if a secret exists.
+        
+        Args:
+            key: The secret key.
+        
+        Returns:
+            True if the secret exists, False otherwise.
+        """
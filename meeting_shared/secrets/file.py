@@ -5,12 +5,37 @@ Retrieves secrets from files in a directory.
 
 import os
 import json
+import mmap
+import time
 import logging
-from pathlib import Path
 from .base import SecretManager
 
+# Try to import orjson for faster JSON parsing
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+def _read_file_fast(path):
+    """
+    Read a secret file with one open, fstat and read.
+    
+    Args:
+        path: The file path.
+        
+    Returns:
+        The decoded file contents without surrounding whitespace.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+    return data.decode('utf-8').strip()
+
 class FileSecretManager(SecretManager):
     """
     Secret manager that retrieves secrets from files.
@@ -18,7 +43,7 @@ class FileSecretManager(SecretManager):
     This is useful for Docker and Kubernetes environments that mount secrets as files.
     """
     
-    def __init__(self, path='/app/secrets'):
+    def __init__(self, path='/app/secrets', refresh_interval=30):
         """
         Initialize the file-based secret manager.
         
@@ -26,33 +51,134 @@ class FileSecretManager(SecretManager):
             path: Path to the secrets directory (default: '/app/secrets').
                  Can be a directory containing individual secret files,
                  or a JSON file containing multiple secrets.
+            refresh_interval: Minimum seconds between checks of the secret
+                 files for changes (directories only)
         """
-        self.path = Path(path)
+        super().__init__()
+        self.path = os.fspath(path)
         self._cache = {}
-        self._is_json_file = self.path.is_file() and self.path.suffix.lower() == '.json'
+        self._is_json_file = os.path.isfile(self.path) and self.path.lower().endswith('.json')
+        self.refresh_interval = refresh_interval
+        self._snapshot = None
+        self._next_refresh_check = 0.0
         
         if self._is_json_file:
             logger.info(f"Initialized file-based secret manager with JSON file: {self.path}")
             self._load_json_file()
         else:
             logger.info(f"Initialized file-based secret manager with directory: {self.path}")
+            self._prefetch_directory()
     
     def _load_json_file(self):
         """
         Load secrets from a JSON file.
         """
         try:
-            if not self.path.exists():
+            if not os.path.isfile(self.path):
                 logger.warning(f"Secrets file does not exist: {self.path}")
                 return
             
-            with open(self.path, 'r') as f:
-                self._cache = json.load(f)
+            with open(self.path, 'rb') as f:
+                if HAS_ORJSON and os.fstat(f.fileno()).st_size:
+                    # Parse the mapped bytes directly instead of decoding to str first
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            self._cache = orjson.loads(view)
+                else:
+                    self._cache = json.load(f)
             
-            logger.debug(f"Loaded {len(self._cache)} secrets from JSON file")
+            logger.debug("Loaded %d secrets from JSON file", len(self._cache))
         except Exception as e:
             logger.error(f"Error loading secrets from JSON file: {str(e)}")
     
+    def _walk_files(self):
+        """
+        Yield the dotted key and path of every secret file in the directory.
+        
+        Symlinked directories are followed, as Kubernetes mounts keys such as
+        'db' as links into '..data'. Hidden entries (such as '..data' itself)
+        are skipped, and each real directory is visited only once.
+        """
+        root = self.path
+        st = os.stat(root)
+        seen = {(st.st_dev, st.st_ino)}
+        for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+            visible = []
+            for d in dirnames:
+                if d.startswith('.'):
+                    continue
+                try:
+                    st = os.stat(os.path.join(dirpath, d))
+                except OSError:
+                    continue
+                if (st.st_dev, st.st_ino) not in seen:
+                    seen.add((st.st_dev, st.st_ino))
+                    visible.append(d)
+            dirnames[:] = visible
+            prefix = os.path.relpath(dirpath, root).replace(os.sep, '.')
+            prefix = '' if prefix == '.' else prefix + '.'
+            for name in filenames:
+                if not name.startswith('.'):
+                    yield prefix + name, os.path.join(dirpath, name)
+    
+    def _directory_snapshot(self):
+        """
+        Stat every secret file without reading it.
+        
+        Returns:
+            Mapping of key to (inode, mtime, size), or None if the directory
+            does not exist. Any in-place edit, atomic rename or symlink swap
+            changes at least one of these.
+        """
+        if not os.path.isdir(self.path):
+            return None
+        snapshot = {}
+        for key, file_path in self._walk_files():
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            snapshot[key] = (st.st_ino, st.st_mtime_ns, st.st_size)
+        return snapshot
+    
+    def _prefetch_directory(self):
+        """
+        Read every secret file in the directory into the cache in one pass.
+        
+        Files are stored under their dotted key, e.g. 'db/password' as
+        'db.password'.
+        """
+        secrets = {}
+        if not os.path.isdir(self.path):
+            logger.warning(f"Secrets directory does not exist: {self.path}")
+            self._snapshot = None
+            self._cache = secrets
+            return
+        
+        snapshot = {}
+        for key, file_path in self._walk_files():
+            try:
+                st = os.stat(file_path)
+                snapshot[key] = (st.st_ino, st.st_mtime_ns, st.st_size)
+                secrets[key] = _read_file_fast(file_path)
+            except (OSError, UnicodeDecodeError) as e:
+                logger.error(f"Error reading secret file: {str(e)}")
+        
+        self._snapshot = snapshot
+        self._cache = secrets
+        logger.debug("Loaded %d secrets from directory", len(secrets))
+    
+    def _refresh_if_changed(self):
+        """Re-read the directory if any secret file changed since the last scan."""
+        now = time.monotonic()
+        if now < self._next_refresh_check:
+            return
+        self._next_refresh_check = now + self.refresh_interval
+        
+        if self._directory_snapshot() != self._snapshot:
+            logger.info(f"Secrets directory changed, reloading: {self.path}")
+            self._prefetch_directory()
+    
     def _get_file_path(self, key):
         """
         Get the file path for a secret key.
@@ -63,14 +189,8 @@ class FileSecretManager(SecretManager):
         Returns:
             The file path.
         """
-        # Replace dots with slashes
-        key_path = key.replace('.', '/')
-        
-        # Ensure the key doesn't start with a slash
-        if key_path.startswith('/'):
-            key_path = key_path[1:]
-        
-        return self.path / key_path
+        # Replace dots with path separators, without a leading separator
+        return os.path.join(self.path, key.replace('.', os.sep).lstrip(os.sep))
     
     def get_secret(self, key, default=None):
         """
@@ -87,32 +207,26 @@ class FileSecretManager(SecretManager):
             # For JSON files, use the cache
             value = self._cache.get(key)
             if value is None:
-                logger.debug(f"Secret not found in JSON file: {key}")
+                logger.debug("Secret not found in JSON file: %s", key)
                 return default
             
-            logger.debug(f"Retrieved secret from JSON file: {key}")
+            logger.debug("Retrieved secret from JSON file: %s", key)
             return value
         else:
-            # For directories, read the file
-            file_path = self._get_file_path(key)
-            
-            if not file_path.exists():
-                logger.debug(f"Secret file does not exist: {file_path}")
+            # For directories, serve from the prefetched files
+            self._refresh_if_changed()
+            value = self._cache.get(key.replace('/', '.').lstrip('.'))
+            if value is None:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Secret file does not exist: %s", self._get_file_path(key))
                 return default
             
-            try:
-                with open(file_path, 'r') as f:
-                    value = f.read().strip()
-                
-                logger.debug(f"Retrieved secret from file: {file_path}")
-                return value
-            except Exception as e:
-                logger.error(f"Error reading secret file: {str(e)}")
-                return default
+            logger.debug("Retrieved secret from file: %s", key)
+            return value
     
-    def get_secrets(self, keys):
+    def batch_get(self, keys):
         """
-        Get multiple secrets.
+        Get multiple secrets from the loaded secrets in one pass.
         
         Args:
             keys: List of secret keys.
@@ -120,7 +234,12 @@ class FileSecretManager(SecretManager):
         Returns:
             Dictionary of key-value pairs.
         """
-        return {key: self.get_secret(key) for key in keys}
+        if self._is_json_file:
+            return {key: self._cache.get(key) for key in keys}
+        
+        self._refresh_if_changed()
+        cache = self._cache
+        return {key: cache.get(key.replace('/', '.').lstrip('.')) for key in keys}
     
     def has_secret(self, key):
         """
@@ -132,7 +251,7 @@ class FileSecretManager(SecretManager):
         Returns:
             True if the secret exists, False otherwise.
         """
-        if self._is_json_file:
-            return key in self._cache
-        else:
-            return self._get_file_path(key).exists() 
\ No newline at end of file
+        if not self._is_json_file:
+            self._refresh_if_changed()
+            key = key.replace('/', '.').lstrip('.')
+        return key in self._cache 
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Shared secret cache.
+Caches secret values on tmpfs so every worker process on a host shares them.
+"""
+
+import os
+import json
+import logging
+
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    HAS_FERNET = True
+except ImportError:
+    HAS_FERNET = False
+
+logger = logging.getLogger(__name__)
+
+class SharedSecretCache:
+    """
+    Cross-process cache for secret values.
+    
+    Values are JSON-encoded and encrypted with Fernet before they are written,
+    so the shared directory never holds plaintext secrets.
+    Requires the diskcache and cryptography packages to be installed.
+    """
+    
+    def __init__(self, directory=None, key=None, namespace=''):
+        """
+        Initialize the shared secret cache.
+        
+        Args:
+            directory: Cache directory (defaults to SECRET_SHARED_CACHE_DIR env var
+                 or '/dev/shm/secrets')
+            key: Fernet key used to encrypt values (defaults to SECRET_CACHE_KEY env var)
+            namespace: Prefix for cache keys, so several managers can share a directory
+        """
+        if not HAS_DISKCACHE:
+            raise ImportError("diskcache package is required for SharedSecretCache")
+        if not HAS_FERNET:
+            raise ImportError("cryptography package is required for SharedSecretCache")
+        
+        key = key or os.environ.get('SECRET_CACHE_KEY')
+        if not key:
+            raise ValueError("Encryption key not provided and SECRET_CACHE_KEY environment variable not set")
+        
+        self.directory = directory or os.environ.get('SECRET_SHARED_CACHE_DIR', '/dev/shm/secrets')
+        self.namespace = f"{namespace}:" if namespace else ''
+        self._fernet = Fernet(key)
+        self._cache = diskcache.Cache(self.directory)
+        
+        logger.info(f"Initialized shared secret cache in: {self.directory}")
+    
+    def get(self, key):
+        """
+        Get a cached secret value.
+        
+        Args:
+            key: The secret key.
+        
+        Returns:
+            The cached value, or None if it is not cached, has expired or
+            cannot be decrypted.
+        """
+        token = self._cache.get(self.namespace + key)
+        if token is None:
+            return None
+        
+        try:
+            return json.loads(self._fernet.decrypt(token))
+        except (InvalidToken, ValueError):
+            logger.warning(f"Discarding unreadable shared cache entry: {key}")
+            return None
+    
+    def set(self, key, value, ttl):
+        """
+        Cache a secret value.
+        
+        Args:
+            key: The secret key.
+            value: The secret value (must be JSON serializable).
+            ttl: Seconds until the entry expires.
+        """
+        token = self._fernet.encrypt(json.dumps(value).encode('utf-8'))
+        self._cache.set(self.namespace + key, token, expire=ttl)
+    
+    def delete(self, key):
+        """
+        Drop a cached secret value.
+        
+        Args:
+            key: The secret key.
+        """
+        self._cache.delete(self.namespace + key)
+    
+    def clear(self):
+        """Drop all cached secret values in this namespace."""
+        if not self.namespace:
+            self._cache.clear()
+            return
+        
+        for cache_key in list(self._cache.iterkeys()):
+            if isinstance(cache_key, str) and cache_key.startswith(self.namespace):
+                self._cache.delete(cache_key)
@@ -4,17 +4,32 @@ Retrieves secrets from HashiCorp Vault.
 """
 
 import os
+import time
 import logging
-from .base import SecretManager
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from .base import SecretManager, _MISSING
 
 try:
     import hvac
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     HAS_HVAC = True
 except ImportError:
     HAS_HVAC = False
 
 logger = logging.getLogger(__name__)
 
+# Returned by _safe_read when Vault could not be read
+_READ_FAILED = object()
+
+@functools.lru_cache(maxsize=2048)
+def _path_for(prefix, key):
+    """Build (and memoize) the Vault path for a secret key."""
+    return f"{prefix}{key}"
+
 class VaultSecretManager(SecretManager):
     """
     Secret manager that retrieves secrets from HashiCorp Vault.
@@ -27,7 +42,8 @@ class VaultSecretManager(SecretManager):
                  path_prefix='secret/',
                  auth_method='token',
                  role_id=None,
-                 secret_id=None):
+                 secret_id=None,
+                 cache_ttl=300):
         """
         Initialize HashiCorp Vault secret manager.
         
@@ -38,10 +54,15 @@ class VaultSecretManager(SecretManager):
             auth_method: Authentication method ('token', 'approle', etc.)
             role_id: AppRole role ID (for 'approle' auth method)
             secret_id: AppRole secret ID (for 'approle' auth method)
+            cache_ttl: Seconds to cache data read from Vault, both per path and
+                 per secret value (0 disables caching). Missing secrets are
+                 remembered for at most 30 seconds.
         """
         if not HAS_HVAC:
             raise ImportError("hvac package is required for VaultSecretManager")
         
+        super().__init__(value_cache_ttl=cache_ttl)
+        
         self.url = url or os.environ.get('VAULT_ADDR')
         if not self.url:
             raise ValueError("Vault URL not provided and VAULT_ADDR environment variable not set")
@@ -52,32 +73,73 @@ class VaultSecretManager(SecretManager):
         self.role_id = role_id or os.environ.get('VAULT_ROLE_ID')
         self.secret_id = secret_id or os.environ.get('VAULT_SECRET_ID')
         
-        self.client = None
-        self._initialize_client()
+        # Data read from Vault, keyed by path: {path: (data, expires_at)}
+        self.cache_ttl = cache_ttl
+        self._path_cache = {}
+        self._cache_lock = threading.Lock()
+        
+        # The client is created and authenticated on first use
+        self._client = None
+        self._client_lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """The authenticated Vault client, created on first access."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._initialize_client()
+        return self._client
     
     def _initialize_client(self):
-        """Initialize the Vault client and authenticate."""
+        """
+        Initialize the Vault client and authenticate.
+        
+        Returns:
+            The authenticated hvac client.
+        """
         try:
-            self.client = hvac.Client(url=self.url)
+            client = hvac.Client(url=self.url, session=self._create_session())
             
             if self.auth_method == 'token' and self.token:
-                self.client.token = self.token
+                client.token = self.token
             elif self.auth_method == 'approle' and self.role_id and self.secret_id:
-                self.client.auth.approle.login(
+                client.auth.approle.login(
                     role_id=self.role_id,
                     secret_id=self.secret_id
                 )
             else:
                 raise ValueError(f"Unsupported auth method: {self.auth_method}")
                 
-            if not self.client.is_authenticated():
+            if not client.is_authenticated():
                 raise ValueError("Failed to authenticate with Vault")
                 
             logger.info(f"Successfully authenticated with Vault at {self.url}")
+            return client
         except Exception as e:
             logger.error(f"Failed to initialize Vault client: {str(e)}")
             raise
     
+    def _create_session(self):
+        """
+        Create the HTTP session used by the Vault client.
+        
+        The connection pool is sized for the concurrent reads in batch_get,
+        so parallel reads reuse established TCP/TLS connections.
+        
+        Returns:
+            A requests session.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
     def _get_path(self, key):
         """
         Get the full path for a secret key.
@@ -88,7 +150,57 @@ class VaultSecretManager(SecretManager):
         Returns:
             The full path in Vault.
         """
-        return f"{self.path_prefix}{key}"
+        return _path_for(self.path_prefix, key)
+    
+    def _read_path(self, path):
+        """
+        Read the data stored at a Vault path.
+        
+        Args:
+            path: The full path in Vault.
+            
+        Returns:
+            The secret data dictionary, or None if there is no data at the path.
+        """
+        secret = self.client.secrets.kv.v2.read_secret_version(path=path)
+        if secret and 'data' in secret['data']:
+            return secret['data']['data']
+        return None
+    
+    def _cached_read(self, path):
+        """
+        Read the data at a Vault path, reusing recent reads.
+        
+        Args:
+            path: The full path in Vault.
+            
+        Returns:
+            The secret data dictionary, or None if there is no data at the path.
+        """
+        entry = self._path_cache.get(path)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        
+        data = self._read_path(path)
+        if self.cache_ttl > 0:
+            ttl = self.cache_ttl if data is not None else self.miss_cache_ttl
+            with self._cache_lock:
+                self._path_cache[path] = (data, time.monotonic() + ttl)
+        return data
+    
+    def invalidate(self, key=None):
+        """
+        Drop cached Vault data and secret values.
+        
+        Args:
+            key: The secret key to drop, or None to drop everything.
+        """
+        super().invalidate(key)
+        with self._cache_lock:
+            if key is None:
+                self._path_cache.clear()
+            else:
+                self._path_cache.pop(self._get_path(key), None)
     
     def get_secret(self, key, default=None):
         """
@@ -101,43 +213,100 @@ class VaultSecretManager(SecretManager):
         Returns:
             The secret value, or default if not found.
         """
+        value = self._get_cached(key)
+        if value is _MISSING:
+            return default
+        if value is not None:
+            return value
+        
         try:
-            path = self._get_path(key)
-            secret = self.client.secrets.kv.v2.read_secret_version(path=path)
-            
-            if secret and 'data' in secret['data']:
-                return secret['data']['data'].get('value', default)
+            data = self._cached_read(self._get_path(key))
+            if data is not None and 'value' in data:
+                value = data['value']
+                self._set_cached(key, value)
+                return value
             
+            self._set_cached(key, _MISSING)
             return default
         except Exception as e:
             logger.error(f"Error retrieving secret from Vault: {str(e)}")
             return default
     
-    def get_secrets(self, keys):
+    def batch_get(self, keys):
         """
         Get multiple secrets from Vault.
         
+        Keys held in the value cache (including the shared cache) are served
+        from it. For the rest, each distinct path is read once, however many
+        keys resolve to it, paths are read concurrently, and the results are
+        cached like get_secret does.
+        
         Args:
             keys: List of secret keys.
             
         Returns:
             Dictionary of key-value pairs.
         """
-        return {key: self.get_secret(key) for key in keys}
+        values = {}
+        paths = {}
+        for key in keys:
+            if key in values or key in paths:
+                continue
+            value = self._get_cached(key)
+            if value is None:
+                paths[key] = self._get_path(key)
+            else:
+                values[key] = None if value is _MISSING else value
+        
+        unique_paths = list(set(paths.values()))
+        if len(unique_paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(unique_paths))) as executor:
+                data_by_path = dict(zip(unique_paths, executor.map(self._safe_read, unique_paths)))
+        else:
+            data_by_path = {path: self._safe_read(path) for path in unique_paths}
+        
+        for key, path in paths.items():
+            data = data_by_path[path]
+            if data is _READ_FAILED:
+                # Errors are not cached, so the next call tries again
+                values[key] = None
+            elif data is not None and 'value' in data:
+                values[key] = data['value']
+                self._set_cached(key, values[key])
+            else:
+                values[key] = None
+                self._set_cached(key, _MISSING)
+        
+        return {key: values[key] for key in keys}
+    
+    def _safe_read(self, path):
+        """
+        Read the data at a Vault path, logging errors instead of raising them.
+        
+        Args:
+            path: The full path in Vault.
+            
+        Returns:
+            The secret data dictionary, None if there is no data at the path,
+            or _READ_FAILED if the read failed.
+        """
+        try:
+            return self._cached_read(path)
+        except Exception as e:
+            logger.error(f"Error retrieving secret from Vault: {str(e)}")
+            return _READ_FAILED
     
     def has_secret(self, key):
         """
         Check if a secret exists in Vault.
         
+        The lookup goes through get_secret, so the value (or its absence) is
+        cached for the get_secret call that usually follows.
+        
         Args:
             key: The secret key.
             
         Returns:
             True if the secret exists, False otherwise.
         """
-        try:
-            path = self._get_path(key)
-            self.client.secrets.kv.v2.read_secret_version(path=path)
-            return True
-        except Exception:
-            return False 
\ No newline at end of file
+        return self.get_secret(key, _MISSING) is not _MISSING 
\ No newline at end of file
@@ -22,6 +22,13 @@ setup(
         "PyYAML>=6.0.0",  # For YAML config support
     ],
     extras_require={
+        'async': [
+            'aiohttp>=3.8.0',  # For asyncio service health checks
+        ],
+        'shared-cache': [
+            'diskcache>=5.0.0',  # For the cross-process secret cache
+            'cryptography>=3.0.0',
+        ],
         'dev': [
             'pytest>=7.0.0',
             'pytest-cov>=4.0.0',
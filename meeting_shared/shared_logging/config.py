@@ -6,11 +6,22 @@ Supports structured JSON logging and request ID tracking.
 import os
 import sys
 import json
+import time
+import copy
+import functools
+import queue
+import atexit
 import logging
 import logging.config
-from datetime import datetime
+import logging.handlers
 from functools import partial
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Try to import sampling module
 try:
     from .sampling import SamplingLogFilter, SamplingConfig
@@ -18,58 +29,190 @@ try:
 except ImportError:
     HAS_SAMPLING = False
 
+# Flask is optional; without it records always get the default context
+try:
+    from flask import g, request, has_request_context
+    _HAS_FLASK = True
+except ImportError:
+    g = request = has_request_context = None
+    _HAS_FLASK = False
+
+# Defaults applied when there is no request context, interned so every
+# record shares the same string objects
+_NO_REQUEST_ID = sys.intern("no_request_id")
+_NO_CORRELATION_ID = sys.intern("no_correlation_id")
+_NO_USER = sys.intern("no_user")
+_NO_PATH = sys.intern("/")
+_NO_METHOD = sys.intern("NONE")
+_ANONYMOUS = sys.intern("anonymous")
+_HEADER_REQUEST_ID = sys.intern("X-Request-ID")
+_HEADER_CORRELATION_ID = sys.intern("X-Correlation-ID")
+
+# Record attributes set by RequestIDLogFilter before any request lookup
+_RECORD_DEFAULTS = {
+    'request_id': _NO_REQUEST_ID,
+    'correlation_id': _NO_CORRELATION_ID,
+    'user_id': _NO_USER,
+    'path': _NO_PATH,
+    'method': _NO_METHOD,
+}
+
+# Background listener writing queued records to the file handler
+_queue_listener = None
+
+# Sentinel for optional record attributes
+_MISSING = object()
+
+# Request context fields emitted by JSONFormatter, in output order
+_CONTEXT_KEYS_ORDERED = ('request_id', 'correlation_id', 'user_id', 'path', 'method')
+_CONTEXT_KEYS = frozenset(_CONTEXT_KEYS_ORDERED)
+
+# LogRecord attributes that are either emitted explicitly or not useful in logs
+_RESERVED_LOG_KEYS = frozenset({
+    'args', 'asctime', 'created', 'exc_info', 'exc_text', 'filename',
+    'funcName', 'id', 'levelname', 'levelno', 'lineno', 'module',
+    'msecs', 'message', 'msg', 'name', 'pathname', 'process',
+    'processName', 'relativeCreated', 'stack_info', 'thread', 'threadName',
+    'taskName', 'request_id', 'correlation_id', 'user_id', 'path', 'method'
+})
+
+# Third-party loggers that are limited to WARNING
+_NOISY_LOGGERS = (
+    "werkzeug",
+    "sqlalchemy.engine",
+    "sqlalchemy.pool",
+    "urllib3",
+    "botocore",
+    "boto3",
+    "requests",
+)
+
 # Configure third-party library logging
 def configure_library_loggers():
     """Configure third-party library loggers to reduce noise"""
-    # Set higher log levels for noisy libraries
-    logging.getLogger("werkzeug").setLevel(logging.WARNING)
-    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
-    logging.getLogger("sqlalchemy.pool").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("botocore").setLevel(logging.WARNING)
-    logging.getLogger("boto3").setLevel(logging.WARNING)
-    logging.getLogger("requests").setLevel(logging.WARNING)
+    # Set higher log levels for noisy libraries, leaving loggers already at
+    # WARNING alone so the logging level cache is not cleared needlessly
+    for name in _NOISY_LOGGERS:
+        library_logger = logging.getLogger(name)
+        if library_logger.level != logging.WARNING:
+            library_logger.setLevel(logging.WARNING)
 
 
 class RequestIDLogFilter(logging.Filter):
     """Log filter that adds request and correlation IDs to log records."""
     
-    def filter(self, record):
+    def filter(self, record, _g=g, _request=request, _has_ctx=has_request_context):
         """Add request_id and correlation_id fields to log records."""
-        # Import Flask modules inside the method to avoid circular imports
+        # Default values, plus taskName if missing
+        record_dict = record.__dict__
+        record_dict.update(_RECORD_DEFAULTS)
+        record_dict.setdefault('taskName', None)
+        
+        # Flask is not installed, so there is no request context to read
+        if _has_ctx is None:
+            return True
+        
         try:
-            # Dynamically import Flask to avoid circular imports
-            from flask import g, request, has_request_context
-            
-            # Default values
-            record.request_id = "no_request_id"
-            record.correlation_id = "no_correlation_id"
-            record.user_id = "no_user"
-            record.path = "/"
-            record.method = "NONE"
-            
             # Add request context if available
-            if has_request_context():
-                record.request_id = getattr(g, 'request_id', request.headers.get('X-Request-ID', 'no_request_id'))
-                record.correlation_id = getattr(g, 'correlation_id', request.headers.get('X-Correlation-ID', 'no_correlation_id'))
-                record.user_id = getattr(g, 'user_id', 'anonymous')
-                record.path = request.path
-                record.method = request.method
-        except (ImportError, RuntimeError):
-            # If Flask is not available or not in request context, use default values
-            record.request_id = "no_request_id"
-            record.correlation_id = "no_correlation_id"
-            record.user_id = "no_user"
-            record.path = "/"
-            record.method = "NONE"
-        
-        # Add taskName attribute if missing
-        if not hasattr(record, 'taskName'):
-            record.taskName = None
+            if _has_ctx():
+                headers = _request.headers
+                request_id = getattr(_g, 'request_id', None)
+                correlation_id = getattr(_g, 'correlation_id', None)
+                record.request_id = request_id if request_id is not None else headers.get(_HEADER_REQUEST_ID, _NO_REQUEST_ID)
+                record.correlation_id = correlation_id if correlation_id is not None else headers.get(_HEADER_CORRELATION_ID, _NO_CORRELATION_ID)
+                record.user_id = getattr(_g, 'user_id', _ANONYMOUS)
+                record.path = _request.path
+                record.method = _request.method
+        except RuntimeError:
+            # Outside an application context the defaults above are kept
+            pass
             
         return True
 
 
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that buffers writes.
+    Records are flushed in batches, or immediately at WARNING and above.
+    The file size is tracked locally so rollover checks do not force a flush.
+    """
+    
+    def __init__(self, filename, mode='a', maxBytes=0, backupCount=0, encoding=None,
+                 delay=False, errors=None, buffer_size=1 << 20, flush_interval=500,
+                 flush_level=logging.WARNING):
+        """
+        Initialize the handler.
+        
+        Args:
+            filename: Log file path
+            mode: File open mode
+            maxBytes: Size at which the file is rolled over (0 disables rollover)
+            backupCount: Number of rotated files to keep
+            encoding: File encoding
+            delay: Whether to defer opening the file until the first record
+            errors: Encoding error handling
+            buffer_size: Size of the write buffer in bytes
+            flush_interval: Number of records written between flushes
+            flush_level: Records at or above this level are flushed immediately
+        """
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+        self._pending = 0
+        self._size = 0
+        super().__init__(filename, mode, maxBytes, backupCount, encoding, delay, errors)
+    
+    def _open(self):
+        """Open the log file with a large write buffer."""
+        stream = open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                      encoding=self.encoding, errors=self.errors)
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def emit(self, record):
+        """Write the record to the buffer, rolling over and flushing as needed."""
+        try:
+            msg = self.format(record) + self.terminator
+            # maxBytes is in bytes, so count the encoded size of non-ASCII messages
+            size = len(msg) if msg.isascii() else len(msg.encode(self.encoding or 'utf-8', self.errors or 'strict'))
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._size + size >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._size += size
+            self._pending += 1
+            if record.levelno >= self.flush_level or self._pending >= self.flush_interval:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        """Flush buffered records to disk."""
+        super().flush()
+        self._pending = 0
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler for a listener running in the same process.
+    Records keep their exception info so the target handler's formatter
+    can still render it.
+    """
+    
+    def prepare(self, record):
+        """Merge message arguments into a copy of the record."""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
 class JSONFormatter(logging.Formatter):
     """
     JSON log formatter that outputs logs in a structured format.
@@ -85,6 +228,32 @@ class JSONFormatter(logging.Formatter):
         """
         super().__init__()
         self.service_name = service_name or os.environ.get('SERVICE_NAME', 'unknown')
+        
+        # Fields that never change for this formatter, copied into each record
+        self._static = {'service': self.service_name}
+        
+        # (second, formatted prefix) of the last formatted record, swapped as
+        # one tuple so concurrent handlers never pair mismatched values
+        self._ts_cache = (None, '')
+    
+    def _timestamp(self, created):
+        """
+        Format a record creation time as an ISO 8601 UTC timestamp.
+        
+        The date and time up to the second are formatted once per second.
+        
+        Args:
+            created: Record creation time in seconds since the epoch
+            
+        Returns:
+            Timestamp string with microseconds
+        """
+        sec = int(created)
+        cached_sec, prefix = self._ts_cache
+        if sec != cached_sec:
+            prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))
+            self._ts_cache = (sec, prefix)
+        return f"{prefix}.{int((created - sec) * 1e6):06d}"
     
     def format(self, record):
         """
@@ -96,32 +265,29 @@ class JSONFormatter(logging.Formatter):
         Returns:
             JSON formatted log string
         """
-        log_data = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'service': self.service_name,
-            'level': record.levelname,
-            'message': record.getMessage(),
-            'logger': record.name,
-            'module': record.module,
-            'function': record.funcName,
-            'line': record.lineno,
-        }
+        log_data = self._static.copy()
+        log_data['timestamp'] = self._timestamp(record.created)
+        log_data['level'] = record.levelname
+        log_data['message'] = record.getMessage()
+        log_data['logger'] = record.name
+        log_data['module'] = record.module
+        log_data['function'] = record.funcName
+        log_data['line'] = record.lineno
         
-        # Add request context if available
-        if hasattr(record, 'request_id'):
-            log_data['request_id'] = record.request_id
-        
-        if hasattr(record, 'correlation_id'):
-            log_data['correlation_id'] = record.correlation_id
-            
-        if hasattr(record, 'user_id'):
-            log_data['user_id'] = record.user_id
-            
-        if hasattr(record, 'path'):
-            log_data['path'] = record.path
-            
-        if hasattr(record, 'method'):
-            log_data['method'] = record.method
+        # Add request context; RequestIDLogFilter sets all of these fields, so
+        # records it has seen take the fast path
+        record_dict = record.__dict__
+        if record_dict.keys() >= _CONTEXT_KEYS:
+            log_data['request_id'] = record_dict['request_id']
+            log_data['correlation_id'] = record_dict['correlation_id']
+            log_data['user_id'] = record_dict['user_id']
+            log_data['path'] = record_dict['path']
+            log_data['method'] = record_dict['method']
+        else:
+            for key in _CONTEXT_KEYS_ORDERED:
+                value = record_dict.get(key, _MISSING)
+                if value is not _MISSING:
+                    log_data[key] = value
         
         # Add exception info if available
         if record.exc_info:
@@ -132,132 +298,219 @@ class JSONFormatter(logging.Formatter):
             }
         
         # Add any extra attributes
-        for key, value in record.__dict__.items():
-            if key not in ['args', 'asctime', 'created', 'exc_info', 'exc_text', 'filename',
-                          'funcName', 'id', 'levelname', 'levelno', 'lineno', 'module',
-                          'msecs', 'message', 'msg', 'name', 'pathname', 'process',
-                          'processName', 'relativeCreated', 'stack_info', 'thread', 'threadName',
-                          'request_id', 'correlation_id', 'user_id', 'path', 'method']:
-                log_data[key] = value
+        for key in record_dict.keys() - _RESERVED_LOG_KEYS:
+            if not key.startswith('_'):
+                log_data[key] = record_dict[key]
         
+        if HAS_ORJSON:
+            return orjson.dumps(log_data).decode()
         return json.dumps(log_data)
 
 
-def get_log_config(service_name=None, log_level=None, json_logs=True, log_to_file=False, log_file=None, enable_sampling=False, sampling_config=None):
+# Formatter and filter instances reused across dictConfig calls
+_FORMATTER_CACHE = {}
+_REQUEST_ID_FILTER = None
+
+
+def _json_formatter(service_name=None):
+    """Return the shared JSONFormatter for a service name."""
+    formatter = _FORMATTER_CACHE.get(service_name)
+    if formatter is None:
+        formatter = _FORMATTER_CACHE[service_name] = JSONFormatter(service_name)
+    return formatter
+
+
+def _request_id_filter():
+    """Return the shared RequestIDLogFilter."""
+    global _REQUEST_ID_FILTER
+    if _REQUEST_ID_FILTER is None:
+        _REQUEST_ID_FILTER = RequestIDLogFilter()
+    return _REQUEST_ID_FILTER
+
+
+# Parts of the logging configuration that do not depend on any option
+_BASE_LOG_CONFIG = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'standard': {
+            'format': '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+        }
+    },
+    'filters': {
+        'request_id': {
+            '()': _request_id_filter
+        }
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'stream': 'ext://sys.stdout'
+        }
+    },
+    'loggers': {}
+}
+
+
+def _copy_config(config):
     """
-    Get logging configuration dictionary.
+    Copy a logging configuration down to the individual entries.
+    
+    dictConfig only modifies the section dictionaries, their entries and
+    the lists inside them, so copying those levels is enough and much
+    cheaper than copy.deepcopy.
     
     Args:
-        service_name: Service name for logs
-        log_level: Log level (DEBUG, INFO, etc.)
-        json_logs: Whether to use JSON formatting
-        log_to_file: Whether to log to a file
-        log_file: Log file path
-        enable_sampling: Whether to enable log sampling
-        sampling_config: Sampling configuration
+        config: Logging configuration dictionary
         
     Returns:
-        Logging configuration dictionary
+        Copied configuration dictionary
+    """
+    copied = {}
+    for section, value in config.items():
+        if isinstance(value, dict):
+            value = {
+                name: {key: list(item) if isinstance(item, list) else item for key, item in entry.items()}
+                for name, entry in value.items()
+            }
+        copied[section] = value
+    return copied
+
+
+def _resolve_defaults(service_name=None, log_level=None, json_logs=True, log_to_file=False, log_file=None, enable_sampling=False):
+    """
+    Fill in unset logging options from the environment.
+    
+    Returns:
+        Tuple of (service_name, log_level, json_logs, log_to_file, log_file, enable_sampling)
     """
-    # Set defaults
     service_name = service_name or os.environ.get('SERVICE_NAME', 'app')
     log_level = log_level or os.environ.get('LOG_LEVEL', 'INFO').upper()
     json_logs = json_logs if json_logs is not None else os.environ.get('JSON_LOGS', 'true').lower() == 'true'
     log_to_file = log_to_file if log_to_file is not None else os.environ.get('LOG_TO_FILE', 'false').lower() == 'true'
     log_file = log_file or os.environ.get('LOG_FILE', f'logs/{service_name}.log')
     enable_sampling = enable_sampling if enable_sampling is not None else os.environ.get('ENABLE_LOG_SAMPLING', 'false').lower() == 'true'
+    return service_name, log_level, json_logs, log_to_file, log_file, enable_sampling
+
+
+@functools.lru_cache(maxsize=8)
+def _build_config(service_name, log_level, json_logs, log_to_file, log_file, enable_sampling):
+    """
+    Build (and memoize) the logging configuration for resolved options.
     
-    # Define formatters
-    formatters = {
-        'standard': {
-            'format': '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
-        },
-        'json': {
-            '()': JSONFormatter,
-            'service_name': service_name
-        }
-    }
+    The returned dictionary is shared between calls and must not be modified;
+    get_log_config hands out copies.
+    """
+    log_config = _copy_config(_BASE_LOG_CONFIG)
+    formatter = 'json' if json_logs else 'standard'
+    handler_names = ['console', 'file'] if log_to_file else ['console']
     
-    # Define handlers
-    handlers = {
-        'console': {
-            'class': 'logging.StreamHandler',
-            'level': log_level,
-            'formatter': 'json' if json_logs else 'standard',
-            'stream': 'ext://sys.stdout'
-        }
+    # Formatters
+    log_config['formatters']['json'] = {
+        '()': _json_formatter,
+        'service_name': service_name
     }
     
-    # Add file handler if enabled
+    # Handlers, with a file handler if enabled
+    log_config['handlers']['console'].update(level=log_level, formatter=formatter)
     if log_to_file:
-        handlers['file'] = {
-            'class': 'logging.handlers.RotatingFileHandler',
+        log_config['handlers']['file'] = {
+            'class': 'meeting_shared.shared_logging.config.BufferedRotatingFileHandler',
             'level': log_level,
-            'formatter': 'json' if json_logs else 'standard',
+            'formatter': formatter,
             'filename': log_file,
             'maxBytes': 10485760,  # 10MB
             'backupCount': 5,
             'encoding': 'utf8'
         }
     
-    # Define filters
-    filters = {
-        'request_id': {
-            '()': RequestIDLogFilter
-        }
-    }
-    
-    # Add sampling filter if enabled
+    # Filters, with the sampling filter if enabled
+    filter_list = ['request_id']
     if enable_sampling and HAS_SAMPLING:
-        filters['sampling'] = {
+        log_config['filters']['sampling'] = {
             '()': SamplingLogFilter
         }
-    
-    # Create filter list
-    filter_list = ['request_id']
-    if enable_sampling and HAS_SAMPLING:
         filter_list.append('sampling')
     
-    # Create config dictionary
-    log_config = {
-        'version': 1,
-        'disable_existing_loggers': False,
-        'formatters': formatters,
-        'filters': filters,
-        'handlers': handlers,
-        'loggers': {
-            '': {  # Root logger
-                'level': log_level,
-                'handlers': ['console'] + (['file'] if log_to_file else []),
-                'filters': filter_list,
-                'propagate': False
-            },
-            service_name: {
-                'level': log_level,
-                'handlers': ['console'] + (['file'] if log_to_file else []),
-                'filters': filter_list,
-                'propagate': False
-            },
-            'werkzeug': {
-                'level': 'WARNING',
-                'handlers': ['console'] + (['file'] if log_to_file else []),
-                'propagate': False
-            },
-            'sqlalchemy': {
-                'level': 'WARNING',
-                'handlers': ['console'] + (['file'] if log_to_file else []),
-                'propagate': False
-            }
+    # Loggers
+    loggers = log_config['loggers']
+    for name in ('', service_name):  # Root and service loggers
+        loggers[name] = {
+            'level': log_level,
+            'handlers': list(handler_names),
+            'filters': list(filter_list),
+            'propagate': False
+        }
+    for name in ('werkzeug', 'sqlalchemy'):
+        loggers[name] = {
+            'level': 'WARNING',
+            'handlers': list(handler_names),
+            'propagate': False
         }
-    }
     
     return log_config
 
 
+def get_log_config(service_name=None, log_level=None, json_logs=True, log_to_file=False, log_file=None, enable_sampling=False, sampling_config=None):
+    """
+    Get logging configuration dictionary.
+    
+    Args:
+        service_name: Service name for logs
+        log_level: Log level (DEBUG, INFO, etc.)
+        json_logs: Whether to use JSON formatting
+        log_to_file: Whether to log to a file
+        log_file: Log file path
+        enable_sampling: Whether to enable log sampling
+        sampling_config: Sampling configuration
+        
+    Returns:
+        Logging configuration dictionary
+    """
+    # dictConfig modifies the dictionary it is given, so return a copy
+    return _copy_config(_build_config(*_resolve_defaults(
+        service_name, log_level, json_logs, log_to_file, log_file, enable_sampling
+    )))
+
+
+def _stop_file_queue():
+    """Stop the file logging listener, writing out any queued records."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def _start_file_queue():
+    """
+    Move the configured file handler behind a queue so that request threads
+    never block on disk I/O or rotation.
+    """
+    global _queue_listener
+    file_handler = next(h for h in logging.getLogger().handlers if h.name == 'file')
+    queue_handler = LocalQueueHandler(queue.SimpleQueue())
+    
+    loggers = [logging.getLogger()] + list(logging.root.manager.loggerDict.values())
+    for logger in loggers:
+        handlers = getattr(logger, 'handlers', None)
+        if handlers and file_handler in handlers:
+            logger.removeHandler(file_handler)
+            logger.addHandler(queue_handler)
+    
+    _queue_listener = logging.handlers.QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+    _queue_listener.start()
+
+
+atexit.register(_stop_file_queue)
+
+
 def setup_logging(app=None, service_name=None, log_level=None, json_logs=True, log_to_file=False, log_file=None, enable_sampling=False, sampling_config=None):
     """
     Set up logging configuration.
     
+    Thread, process and multiprocessing details are not captured on log
+    records since none of the formatters emit them.
+    
     Args:
         app: Flask application (optional)
         service_name: Service name for logs
@@ -290,9 +543,14 @@ def setup_logging(app=None, service_name=None, log_level=None, json_logs=True, l
         sampling_config=sampling_config
     )
     
-    # Configure logging
+    # Configure logging, draining any previous file queue first
+    _stop_file_queue()
     logging.config.dictConfig(log_config)
     
+    # Write to the log file from a background thread
+    if 'file' in log_config['handlers']:
+        _start_file_queue()
+    
     # Configure sampling if enabled
     if enable_sampling and HAS_SAMPLING and sampling_config:
         from .sampling import configure_sampling
@@ -304,6 +562,11 @@ def setup_logging(app=None, service_name=None, log_level=None, json_logs=True, l
     # Get logger for service
     logger = logging.getLogger(service_name)
     
+    # Skip per-record work the formatters never use
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
     # Log startup message
     logger.info(f"Logging configured for {service_name} at level {log_level}")
     
@@ -3,15 +3,85 @@ Log sampling module for reducing log volume on high-traffic endpoints.
 Provides configurable sampling rates for different endpoints and log levels.
 """
 
+import sys
 import logging
 import random
 import re
-from typing import Dict, List, Optional, Union, Pattern
-import threading
+import itertools
+import functools
+from typing import Dict, List, Optional, Tuple, Union, Pattern
 import time
 
 logger = logging.getLogger(__name__)
 
+# Sampling mask that never matches a (positive) request count
+NEVER_MASK = sys.maxsize
+
+def rate_to_mask(rate: float) -> int:
+    """
+    Convert a sampling rate to a bitmask for request counts.
+    
+    The sampling period (1/rate) is rounded up to a power of two, so a count
+    is sampled when (count & mask) == 0.
+    
+    Args:
+        rate: Sampling rate (0.0-1.0)
+        
+    Returns:
+        0 to log everything, NEVER_MASK to log nothing, otherwise period - 1
+    """
+    if rate >= 1.0:
+        return 0
+    if rate <= 0.0:
+        return NEVER_MASK
+    period = int(1.0 / rate)
+    return (1 << (period - 1).bit_length()) - 1
+
+@functools.lru_cache(maxsize=16)
+def _level_number(name: str) -> Union[int, str]:
+    """Convert a level name to its number (logging.getLevelName, memoized)."""
+    return logging.getLevelName(name.upper())
+
+# Numbered backreferences or conditionals and global inline flags would
+# change meaning inside a combined pattern
+_UNCOMBINABLE_RE = re.compile(r'\\[1-9]|\(\?\(\d|\(\?[aiLmsux]+\)')
+
+@functools.lru_cache(maxsize=256)
+def _compile(pattern: str) -> Pattern:
+    """Compile a path pattern, sharing compiled patterns between configs."""
+    return re.compile(pattern)
+
+@functools.lru_cache(maxsize=64)
+def _combine_patterns(patterns: Tuple[str, ...]) -> Optional[Pattern]:
+    """
+    Combine path patterns into one regex that reports the first match.
+    
+    Each pattern becomes a named lookahead (p0, p1, ...) tried from the start
+    of the string, so the alternation picks the first pattern in order that
+    matches anywhere, exactly like searching with each pattern in turn.
+    
+    Args:
+        patterns: Path pattern strings, in priority order
+        
+    Returns:
+        Combined pattern (dispatch on match.lastgroup), or None if there are
+        no patterns or they cannot be combined (e.g. they use backreferences
+        or inline flags)
+    """
+    if not patterns or any(_UNCOMBINABLE_RE.search(pattern) for pattern in patterns):
+        return None
+    
+    # Only the skip-ahead '.*?' may cross newlines; '.' inside the patterns
+    # keeps its usual meaning
+    alternatives = '|'.join(
+        f'(?P<p{index}>(?=(?s:.*?)(?:{pattern})))'
+        for index, pattern in enumerate(patterns)
+    )
+    try:
+        return re.compile(f'(?:{alternatives})')
+    except re.error:
+        return None
+
 class SamplingConfig:
     """Configuration for log sampling."""
     
@@ -19,7 +89,8 @@ class SamplingConfig:
                  default_rate: float = 1.0,
                  path_rates: Optional[Dict[str, float]] = None,
                  method_rates: Optional[Dict[str, float]] = None,
-                 level_rates: Optional[Dict[str, float]] = None):
+                 level_rates: Optional[Dict[str, float]] = None,
+                 deterministic: bool = True):
         """
         Initialize sampling configuration.
         
@@ -28,8 +99,13 @@ class SamplingConfig:
             path_rates: Dict mapping path patterns to sampling rates
             method_rates: Dict mapping HTTP methods to sampling rates
             level_rates: Dict mapping log levels to sampling rates
+            deterministic: Whether to log exactly every Nth matching record,
+                 with N rounded up to a power of two; if False, records are
+                 sampled at random at the exact rate and no per-key counters
+                 are kept
         """
         self.default_rate = max(0.0, min(1.0, default_rate))
+        self.deterministic = deterministic
         self.path_rates = path_rates or {}
         self.method_rates = method_rates or {}
         self.level_rates = level_rates or {}
@@ -38,24 +114,53 @@ class SamplingConfig:
         self.path_patterns = {}
         for path, rate in self.path_rates.items():
             try:
-                self.path_patterns[re.compile(path)] = max(0.0, min(1.0, rate))
+                self.path_patterns[_compile(path)] = max(0.0, min(1.0, rate))
             except re.error:
                 logger.warning(f"Invalid path pattern: {path}")
         
         # Normalize method rates
-        for method, rate in self.method_rates.items():
-            self.method_rates[method.upper()] = max(0.0, min(1.0, rate))
+        self.method_rates = {
+            method.upper(): max(0.0, min(1.0, rate))
+            for method, rate in self.method_rates.items()
+        }
         
-        # Normalize level rates
+        # Normalize level rates to {int: float}
+        level_rates = {}
         for level, rate in self.level_rates.items():
             if isinstance(level, str):
-                level_num = logging.getLevelName(level.upper())
+                level_num = _level_number(level)
                 if isinstance(level_num, int):
-                    self.level_rates[level_num] = max(0.0, min(1.0, rate))
+                    level_rates[level_num] = max(0.0, min(1.0, rate))
                 else:
                     logger.warning(f"Invalid log level: {level}")
             else:
-                self.level_rates[level] = max(0.0, min(1.0, rate))
+                level_rates[level] = max(0.0, min(1.0, rate))
+        self.level_rates = level_rates
+        
+        # Precompute sampling masks for every rate
+        self.default_mask = rate_to_mask(self.default_rate)
+        self.path_masks = {pattern: rate_to_mask(rate) for pattern, rate in self.path_patterns.items()}
+        self.method_masks = {method: rate_to_mask(rate) for method, rate in self.method_rates.items()}
+        self.level_masks = {level: rate_to_mask(rate) for level, rate in self.level_rates.items()}
+        
+        # Flags for configurations that log everything or nothing; based on the
+        # rates, since rates above 0.5 also round to mask 0
+        all_rates = [self.default_rate, *self.path_patterns.values(),
+                     *self.method_rates.values(), *self.level_rates.values()]
+        self.always_log = all(rate == 1.0 for rate in all_rates)
+        self.never_log = all(rate == 0.0 for rate in all_rates)
+        
+        # Match all path patterns in one regex pass, in configuration order
+        self._path_rate_list = list(self.path_patterns.values())
+        self._path_mask_list = list(self.path_masks.values())
+        self._combined_path_pattern = _combine_patterns(tuple(pattern.pattern for pattern in self.path_patterns))
+        
+        # Memoize path lookups, since the same paths are logged over and over
+        self._path_rate_cache = functools.lru_cache(maxsize=4096)(self._compute_rate_for_path)
+        self._path_mask_cache = functools.lru_cache(maxsize=4096)(self._compute_mask_for_path)
+        
+        # Methods as seen on requests, mapped to their mask
+        self._method_mask_cache = {}
     
     def get_rate_for_path(self, path: str) -> float:
         """
@@ -67,10 +172,31 @@ class SamplingConfig:
         Returns:
             Sampling rate (0.0-1.0)
         """
-        for pattern, rate in self.path_patterns.items():
+        return self._path_rate_cache(path)
+    
+    def _match_path(self, path: str) -> Optional[int]:
+        """
+        Find the first configured pattern matching a path.
+        
+        Args:
+            path: Request path
+            
+        Returns:
+            Index of the matching pattern, or None if no pattern matches
+        """
+        if self._combined_path_pattern is not None:
+            match = self._combined_path_pattern.match(path)
+            return int(match.lastgroup[1:]) if match else None
+        
+        for index, pattern in enumerate(self.path_patterns):
             if pattern.search(path):
-                return rate
-        return self.default_rate
+                return index
+        return None
+    
+    def _compute_rate_for_path(self, path: str) -> float:
+        """Find the rate of the first pattern matching a path."""
+        index = self._match_path(path)
+        return self.default_rate if index is None else self._path_rate_list[index]
     
     def get_rate_for_method(self, method: str) -> float:
         """
@@ -95,9 +221,59 @@ class SamplingConfig:
             Sampling rate (0.0-1.0)
         """
         if isinstance(level, str):
-            level = logging.getLevelName(level.upper())
+            level = _level_number(level)
         
         return self.level_rates.get(level, self.default_rate)
+    
+    def get_mask_for_path(self, path: str) -> int:
+        """
+        Get sampling mask for a path.
+        
+        Args:
+            path: Request path
+            
+        Returns:
+            Sampling mask (see rate_to_mask)
+        """
+        return self._path_mask_cache(path)
+    
+    def _compute_mask_for_path(self, path: str) -> int:
+        """Find the mask of the first pattern matching a path."""
+        index = self._match_path(path)
+        return self.default_mask if index is None else self._path_mask_list[index]
+    
+    def get_mask_for_method(self, method: str) -> int:
+        """
+        Get sampling mask for an HTTP method.
+        
+        Args:
+            method: HTTP method
+            
+        Returns:
+            Sampling mask (see rate_to_mask)
+        """
+        mask = self._method_mask_cache.get(method)
+        if mask is None:
+            mask = self.method_masks.get(method.upper(), self.default_mask)
+            # Methods are a small set; do not let arbitrary values grow the cache
+            if len(self._method_mask_cache) < 64:
+                self._method_mask_cache[method] = mask
+        return mask
+    
+    def get_mask_for_level(self, level: Union[int, str]) -> int:
+        """
+        Get sampling mask for a log level.
+        
+        Args:
+            level: Log level (int or string)
+            
+        Returns:
+            Sampling mask (see rate_to_mask)
+        """
+        if isinstance(level, str):
+            level = _level_number(level)
+        
+        return self.level_masks.get(level, self.default_mask)
 
 
 class LogSampler:
@@ -111,12 +287,13 @@ class LogSampler:
             config: Sampling configuration
         """
         self.config = config or SamplingConfig()
-        self.request_counts = {}
-        self.request_counts_lock = threading.Lock()
+        # Per-key counters; next() on itertools.count is atomic under the GIL,
+        # so counting needs no lock
+        self.request_counts: Dict[tuple, itertools.count] = {}
         
         # Clean up request counts periodically
         self.cleanup_interval = 300  # 5 minutes
-        self.last_cleanup = time.time()
+        self.last_cleanup = time.monotonic()
     
     def should_log(self, 
                   path: Optional[str] = None, 
@@ -133,47 +310,63 @@ class LogSampler:
         Returns:
             True if the log entry should be included, False otherwise
         """
-        # Clean up request counts if needed
-        current_time = time.time()
-        if current_time - self.last_cleanup > self.cleanup_interval:
-            with self.request_counts_lock:
-                self.request_counts = {}
-                self.last_cleanup = current_time
-        
-        # Get sampling rates
-        path_rate = self.config.default_rate
-        if path:
-            path_rate = self.config.get_rate_for_path(path)
+        config = self.config
+        if config.always_log:
+            return True
+        if config.never_log:
+            return False
         
-        method_rate = self.config.default_rate
-        if method:
-            method_rate = self.config.get_rate_for_method(method)
+        # Random sampling needs no shared state and honours the exact rate,
+        # rather than the power-of-two period the masks are rounded to
+        if not config.deterministic:
+            default_rate = config.default_rate
+            rate = config.get_rate_for_path(path) if path else default_rate
+            other = config.get_rate_for_method(method) if method else default_rate
+            if other < rate:
+                rate = other
+            other = config.get_rate_for_level(level) if level else default_rate
+            if other < rate:
+                rate = other
+            return random.random() < rate
         
-        level_rate = self.config.default_rate
-        if level:
-            level_rate = self.config.get_rate_for_level(level)
+        # Clean up request counts if needed by swapping in a new dict; the old
+        # one is freed once in-flight calls drop their reference, without a lock
+        current_time = time.monotonic()
+        if current_time - self.last_cleanup > self.cleanup_interval:
+            self.last_cleanup = current_time
+            self.request_counts = {}
         
-        # Use the most restrictive rate
-        rate = min(path_rate, method_rate, level_rate)
+        # Use the most restrictive mask; a dimension that was not given
+        # contributes the default mask, as does one without an override
+        default_mask = config.default_mask
+        mask = config.get_mask_for_path(path) if path else default_mask
+        other = config.get_mask_for_method(method) if method else default_mask
+        if other > mask:
+            mask = other
+        other = config.get_mask_for_level(level) if level else default_mask
+        if other > mask:
+            mask = other
         
         # Always log if rate is 1.0
-        if rate >= 1.0:
+        if mask == 0:
             return True
         
         # Never log if rate is 0.0
-        if rate <= 0.0:
+        if mask == NEVER_MASK:
             return False
         
         # Generate a request key for counting
-        request_key = f"{path or ''}:{method or ''}:{level or ''}"
+        request_key = (path, method, level)
         
         # Increment request count
-        with self.request_counts_lock:
-            count = self.request_counts.get(request_key, 0) + 1
-            self.request_counts[request_key] = count
+        request_counts = self.request_counts
+        counter = request_counts.get(request_key)
+        if counter is None:
+            counter = request_counts.setdefault(request_key, itertools.count(1))
+        count = next(counter)
         
         # Deterministic sampling based on count
-        return (count % int(1.0 / rate)) == 0
+        return (count & mask) == 0
 
 
 class SamplingLogFilter(logging.Filter):
@@ -199,9 +392,14 @@ class SamplingLogFilter(logging.Filter):
         Returns:
             True if the record should be logged, False otherwise
         """
+        # Skip the record lookups when sampling cannot drop anything
+        if self.sampler.config.always_log:
+            return True
+        
         # Get path and method from record if available
-        path = getattr(record, 'path', None)
-        method = getattr(record, 'method', None)
+        record_dict = record.__dict__
+        path = record_dict.get('path')
+        method = record_dict.get('method')
         
         # Check if we should log this record
         return self.sampler.should_log(path, method, record.levelno)
@@ -1,8 +1,10 @@
 """
 Shared database utilities for transaction management across services.
 """
-from contextlib import contextmanager
+from sqlalchemy import insert, delete
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import ONETOMANY, MANYTOMANY
+from sqlalchemy.schema import sort_tables
 from functools import wraps
 from typing import Any, Callable, Optional, TypeVar, Dict, List, Union
 import logging
@@ -11,25 +13,69 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
-@contextmanager
-def transaction_context(session: Session):
+class _TransactionContext:
     """
     Context manager for database transactions.
     Commits the transaction if no exceptions occur, rolls back otherwise.
     
+    A plain class rather than a @contextmanager generator, which keeps the
+    per-transaction overhead down.
+    
     Args:
-        session: SQLAlchemy session object
+        session: SQLAlchemy session object, returned on entering the block
+    """
+    __slots__ = ('session',)
+    
+    def __init__(self, session: Session):
+        self.session = session
+    
+    def __enter__(self) -> Session:
+        return self.session
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            try:
+                self.session.commit()
+            except Exception as e:
+                self.session.rollback()
+                logger.error(f"Transaction error: {str(e)}")
+                raise
+        elif issubclass(exc_type, Exception):
+            self.session.rollback()
+            logger.error(f"Transaction error: {str(exc)}")
+        return False
+
+transaction_context = _TransactionContext
+
+def _needs_orm_delete(mapper) -> bool:
+    """
+    Check whether instances of a mapper must be deleted through the session.
+    
+    A bulk DELETE skips the unit of work, so it is only safe for models with
+    a single-column primary key whose relationships need no ORM cleanup.
+    """
+    if len(mapper.primary_key) != 1:
+        return True
+    for relationship in mapper.relationships:
+        if relationship.passive_deletes:
+            continue
+        if relationship.cascade.delete or relationship.direction in (ONETOMANY, MANYTOMANY):
+            return True
+    return False
+
+def _delete_order(by_model: Dict[type, List[Any]]) -> List[type]:
+    """
+    Order models so that dependent tables are deleted before the tables they reference.
+    
+    Args:
+        by_model: Objects to delete, grouped by model
         
-    Yields:
-        The session object
+    Returns:
+        The models in a safe deletion order
     """
-    try:
-        yield session
-        session.commit()
-    except Exception as e:
-        session.rollback()
-        logger.error(f"Transaction error: {str(e)}")
-        raise
+    tables = {model: model.__mapper__.local_table for model in by_model}
+    position = {table: index for index, table in enumerate(reversed(sort_tables(set(tables.values()))))}
+    return sorted(by_model, key=lambda model: position[tables[model]])
 
 def with_transaction(func):
     """
@@ -44,7 +90,7 @@ def with_transaction(func):
     """
     @wraps(func)
     def wrapper(session, *args, **kwargs):
-        with transaction_context(session) as tx_session:
+        with _TransactionContext(session) as tx_session:
             return func(tx_session, *args, **kwargs)
     return wrapper
 
@@ -90,4 +136,75 @@ class DatabaseManager:
         except Exception as e:
             self.session.rollback()
             self.logger.error(f"Database delete error: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
+            
+    def bulk_add(self, objects: List[Any], auto_commit: bool = True, model: Optional[type] = None) -> bool:
+        """
+        Safely add multiple objects to the database.
+        
+        Args:
+            objects: ORM objects, or plain row dictionaries when model is given
+            auto_commit: Whether to commit after adding
+            model: Model class to insert row dictionaries into with a single
+                executemany INSERT, bypassing the unit of work
+        """
+        try:
+            if model is not None:
+                if objects:
+                    self.session.execute(insert(model), objects)
+            else:
+                self.session.add_all(objects)
+            if auto_commit:
+                return self.commit()
+            return True
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(f"Database bulk add error: {str(e)}")
+            return False
+            
+    def bulk_delete(self, objects: List[Any], auto_commit: bool = True) -> bool:
+        """
+        Safely delete multiple objects from the database.
+        
+        Objects of the same model are removed with a single DELETE ... WHERE
+        pk IN (...). Models with a composite primary key, ORM delete cascades,
+        or collections the ORM must clean up (one-to-many or many-to-many
+        without passive_deletes) are deleted one by one instead. Models are
+        processed dependents first, so foreign keys are never left dangling.
+        """
+        try:
+            by_model: Dict[type, List[Any]] = {}
+            for obj in objects:
+                by_model.setdefault(type(obj), []).append(obj)
+            
+            bulk_deleted = False
+            for model in _delete_order(by_model):
+                instances = by_model[model]
+                mapper = model.__mapper__
+                if _needs_orm_delete(mapper):
+                    for obj in instances:
+                        if bulk_deleted:
+                            # Reload collections that may hold rows deleted above
+                            self.session.expire(obj)
+                        self.session.delete(obj)
+                    # Flush now so these rows go before the models after them
+                    self.session.flush()
+                    continue
+                
+                pk = mapper.primary_key[0]
+                ids = [mapper.primary_key_from_instance(obj)[0] for obj in instances]
+                self.session.execute(
+                    delete(model).where(pk.in_(ids)).execution_options(synchronize_session=False)
+                )
+                for obj in instances:
+                    if obj in self.session:
+                        self.session.expunge(obj)
+                bulk_deleted = True
+            
+            if auto_commit:
+                return self.commit()
+            return True
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error(f"Database bulk delete error: {str(e)}")
+            return False
@@ -8,6 +8,7 @@ import os
 import sys
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 import time
 
@@ -19,6 +20,11 @@ AUTH_URL = os.environ.get("AUTH_URL", "http://localhost:5001/api/auth")
 TEST_EMAIL = os.environ.get("TEST_EMAIL", "admin@example.com")
 TEST_PASSWORD = os.environ.get("TEST_PASSWORD", "admin123")
 
+# Shared HTTP session so every step reuses the same keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def log_response(response, operation):
     """Log API response details."""
     print(f"\n--- {operation} Response ---")
@@ -41,7 +47,7 @@ def verify_auth_flow():
     
     # 1. Get auth token
     print("\nStep 1: Authenticating...")
-    auth_response = requests.post(f"{AUTH_URL}/login", json={
+    auth_response = SESSION.post(f"{AUTH_URL}/login", json={
         "email": TEST_EMAIL,
         "password": TEST_PASSWORD
     })
@@ -61,7 +67,7 @@ def verify_auth_flow():
     
     # 2. Verify token with auth service
     print("\nStep 2: Verifying token with auth service...")
-    verify_response = requests.post(f"{AUTH_URL}/validate-token", 
+    verify_response = SESSION.post(f"{AUTH_URL}/validate-token", 
                                   json={"token": token},
                                   headers={"X-Service-Key": os.environ.get("SERVICE_KEY", "test-service-key")})
     
@@ -74,7 +80,7 @@ def verify_auth_flow():
     
     # 3. Test protected endpoint
     print("\nStep 3: Accessing protected endpoint...")
-    protected_response = requests.get(f"{BASE_URL}/meetings", headers=headers)
+    protected_response = SESSION.get(f"{BASE_URL}/meetings", headers=headers)
     
     if protected_response.status_code != 200:
         log_response(protected_response, "Protected Endpoint")
@@ -88,7 +94,7 @@ def verify_auth_flow():
     invalid_token = token + "invalid"
     invalid_headers = {"Authorization": f"Bearer {invalid_token}"}
     
-    invalid_response = requests.get(f"{BASE_URL}/meetings", headers=invalid_headers)
+    invalid_response = SESSION.get(f"{BASE_URL}/meetings", headers=invalid_headers)
     
     if invalid_response.status_code != 401:
         log_response(invalid_response, "Invalid Token")
@@ -111,7 +117,7 @@ def verify_auth_flow():
     print("\nStep 5: Testing service integration...")
     
     # Test with missing service key
-    service_response = requests.post(f"{AUTH_URL}/validate-token", 
+    service_response = SESSION.post(f"{AUTH_URL}/validate-token", 
                                    json={"token": token})
     
     if service_response.status_code != 403:
@@ -127,7 +133,7 @@ def verify_auth_flow():
     custom_headers = headers.copy()
     custom_headers["X-Request-ID"] = custom_request_id
     
-    req_id_response = requests.get(f"{BASE_URL}/meetings", headers=custom_headers)
+    req_id_response = SESSION.get(f"{BASE_URL}/meetings", headers=custom_headers)
     
     if req_id_response.status_code != 200:
         log_response(req_id_response, "Request ID Test")
@@ -147,7 +153,7 @@ def verify_auth_flow():
     custom_headers = headers.copy()
     custom_headers["X-Correlation-ID"] = custom_correlation_id
     
-    corr_id_response = requests.get(f"{BASE_URL}/meetings", headers=custom_headers)
+    corr_id_response = SESSION.get(f"{BASE_URL}/meetings", headers=custom_headers)
     
     if corr_id_response.status_code != 200:
         log_response(corr_id_response, "Correlation ID Test")
@@ -164,7 +170,7 @@ def verify_auth_flow():
     # 8. Test service discovery
     print("\nStep 8: Testing service discovery...")
     try:
-        discovery_response = requests.get(f"{BASE_URL}/services")
+        discovery_response = SESSION.get(f"{BASE_URL}/services")
         
         if discovery_response.status_code != 200:
             log_response(discovery_response, "Service Discovery")
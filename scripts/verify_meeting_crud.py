@@ -8,6 +8,7 @@ import os
 import sys
 import json
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 import time
 
@@ -19,6 +20,11 @@ AUTH_URL = os.environ.get("AUTH_URL", "http://localhost:5001/api/auth")
 TEST_EMAIL = os.environ.get("TEST_EMAIL", "admin@example.com")
 TEST_PASSWORD = os.environ.get("TEST_PASSWORD", "admin123")
 
+# Shared HTTP session so every step reuses the same keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def log_response(response, operation):
     """Log API response details."""
     print(f"\n--- {operation} Response ---")
@@ -36,7 +42,7 @@ def verify_meeting_crud():
     
     # 1. Get auth token
     print("\nStep 1: Authenticating...")
-    auth_response = requests.post(f"{AUTH_URL}/login", json={
+    auth_response = SESSION.post(f"{AUTH_URL}/login", json={
         "email": TEST_EMAIL,
         "password": TEST_PASSWORD
     })
@@ -47,7 +53,7 @@ def verify_meeting_crud():
         return False
     
     token = auth_response.json().get("access_token")
-    headers = {"Authorization": f"Bearer {token}"}
+    SESSION.headers.update({"Authorization": f"Bearer {token}"})
     print("✅ Authentication successful")
     
     # 2. Create meeting
@@ -61,9 +67,8 @@ def verify_meeting_crud():
         "meeting_type": "team"
     }
     
-    create_response = requests.post(f"{BASE_URL}/meetings", 
-                                  json=meeting_data,
-                                  headers=headers)
+    create_response = SESSION.post(f"{BASE_URL}/meetings", 
+                                  json=meeting_data)
     
     if create_response.status_code != 201:
         log_response(create_response, "Create Meeting")
@@ -75,7 +80,7 @@ def verify_meeting_crud():
     
     # 3. Read meeting
     print("\nStep 3: Reading meeting...")
-    read_response = requests.get(f"{BASE_URL}/meetings/{meeting_id}", headers=headers)
+    read_response = SESSION.get(f"{BASE_URL}/meetings/{meeting_id}")
     if read_response.status_code != 200:
         log_response(read_response, "Read Meeting")
         print("❌ Meeting read failed")
@@ -90,10 +95,9 @@ def verify_meeting_crud():
         {"user_id": 3, "role": "presenter"}
     ]
     
-    participants_response = requests.post(
+    participants_response = SESSION.post(
         f"{BASE_URL}/meetings/{meeting_id}/participants",
-        json=participants,
-        headers=headers
+        json=participants
     )
     
     if participants_response.status_code not in [200, 201]:
@@ -105,9 +109,8 @@ def verify_meeting_crud():
     # 5. Update meeting
     print("\nStep 5: Updating meeting...")
     update_data = {"title": "Updated Test Meeting"}
-    update_response = requests.put(f"{BASE_URL}/meetings/{meeting_id}", 
-                                 json=update_data,
-                                 headers=headers)
+    update_response = SESSION.put(f"{BASE_URL}/meetings/{meeting_id}", 
+                                 json=update_data)
     
     if update_response.status_code != 200:
         log_response(update_response, "Update Meeting")
@@ -118,7 +121,7 @@ def verify_meeting_crud():
     
     # 6. Delete meeting
     print("\nStep 6: Deleting meeting...")
-    delete_response = requests.delete(f"{BASE_URL}/meetings/{meeting_id}", headers=headers)
+    delete_response = SESSION.delete(f"{BASE_URL}/meetings/{meeting_id}")
     if delete_response.status_code != 204:
         log_response(delete_response, "Delete Meeting")
         print("❌ Meeting deletion failed")
@@ -128,7 +131,7 @@ def verify_meeting_crud():
     
     # 7. Verify deletion
     print("\nStep 7: Verifying deletion...")
-    verify_response = requests.get(f"{BASE_URL}/meetings/{meeting_id}", headers=headers)
+    verify_response = SESSION.get(f"{BASE_URL}/meetings/{meeting_id}")
     if verify_response.status_code != 404:
         log_response(verify_response, "Verify Deletion")
         print("❌ Deletion verification failed")